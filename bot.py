@@ -1,1216 +1,2947 @@
-import discord
-import os
-from dotenv import load_dotenv
-import random
-import mysql.connector
-from mysql.connector import Error
-from datetime import datetime, timedelta
-
-# --- Muat Variabel Lingkungan dari File .env ---
-load_dotenv()
-
-# Ambil token bot dari environment variable
-TOKEN = os.getenv('DISCORD_TOKEN')
-if not TOKEN:
-    print("Error: DISCORD_TOKEN tidak ditemukan. Pastikan sudah diatur di environment variable atau file .env.")
-    exit()
-
-# Ambil detail koneksi MySQL dari environment variable
-MYSQL_HOST = os.getenv('MYSQL_HOST')
-MYSQL_USER = os.getenv('MYSQL_USER')
-MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
-
-# Pastikan semua variabel lingkungan MySQL yang diperlukan sudah diatur
-if not all([MYSQL_HOST, MYSQL_USER, MYSQL_DATABASE]):
-    print("Error: Pastikan semua variabel lingkungan MySQL (MYSQL_HOST, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE) diatur.")
-    exit()
-
-# --- DAFTAR ID ROLE YANG DIIZINKAN UNTUK MENGGUNAKAN !setadmin, !addcash, !removecash ---
-ALLOWED_SETADMIN_ROLES = [
-    1381168735112659015 # Ini adalah Role ID yang Anda berikan
-]
-if not ALLOWED_SETADMIN_ROLES:
-    print("PERINGATAN: ALLOWED_SETADMIN_ROLES kosong. Tidak ada role yang bisa menggunakan !setadmin, !addcash, !removecash.")
-
-# --- Definisi Intents Discord ---
-intents = discord.Intents.default()
-intents.message_content = True
-intents.reactions = True
-intents.members = True
-
-
-# Membuat instance bot
-client = discord.Client(intents=intents)
-
-# --- Kelas dan Fungsi untuk Logika Permainan Blackjack ---
-class BlackjackGame:
-    def __init__(self, player_id: int, bet_amount: int):
-        self.player_id = player_id
-        self.bet_amount = bet_amount
-        self.deck = self._create_shuffled_deck()
-        self.player_hand = []
-        self.dealer_hand = []
-        self.game_active = False
-
-    def _create_shuffled_deck(self):
-        suits = ['♠️', '♥️', '♦️', '♣️']
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-        deck = [(rank, suit) for suit in suits for rank in ranks]
-        random.shuffle(deck)
-        return deck
-
-    def _get_card_value(self, card):
-        rank = card[0]
-        if rank in ['J', 'Q', 'K']:
-            return 10
-        elif rank == 'A':
-            return 11
-        else:
-            return int(rank)
-
-    def _calculate_hand_value(self, hand):
-        value = 0
-        num_aces = 0
-        for card in hand:
-            card_value = self._get_card_value(card)
-            if card_value == 11:
-                num_aces += 1
-            value += card_value
-
-        while value > 21 and num_aces > 0:
-            value -= 10
-            num_aces -= 1
-        return value
-
-    def _deal_card(self, hand):
-        card = self.deck.pop()
-        hand.append(card)
-        return card
-
-    def start_game(self):
-        self.game_active = True
-        self.player_hand = []
-        self.dealer_hand = []
-        self._deal_card(self.player_hand)
-        self._deal_card(self.dealer_hand)
-        self._deal_card(self.player_hand)
-        self._deal_card(self.dealer_hand)
-
-        player_score = self._calculate_hand_value(self.player_hand)
-        
-        if player_score == 21:
-            return "blackjack_player"
-        return "game_started"
-
-    def hit(self):
-        self._deal_card(self.player_hand)
-        player_score = self._calculate_hand_value(self.player_hand)
-        if player_score > 21:
-            return "bust"
-        return "continue"
-
-    def stand(self):
-        while self._calculate_hand_value(self.dealer_hand) < 17:
-            self._deal_card(self.dealer_hand)
-        
-        player_score = self._calculate_hand_value(self.player_hand)
-        dealer_score = self._calculate_hand_value(self.dealer_hand)
-
-        if dealer_score > 21:
-            return "dealer_bust"
-        elif player_score > dealer_score:
-            return "player_win"
-        elif dealer_score > player_score: # PERBAIKAN BUG: sebelumnya (dealer_score > dealer_score)
-            return "dealer_win"
-        else:
-            return "tie"
-            
-    def get_player_hand_str(self):
-        return ' '.join([f"{c[0]}{c[1]}" for c in self.player_hand])
-
-    def get_dealer_hand_str(self, hidden=False):
-        if hidden:
-            return f"{self.dealer_hand[0][0]}{self.dealer_hand[0][1]} [HIDDEN CARD]"
-        else:
-            return ' '.join([f"{c[0]}{c[1]}" for c in self.dealer_hand])
-
-active_blackjack_games = {} 
-blackjack_message_to_player = {}
-
-# --- Kelas dan Dictionary untuk Logika Permainan Flip Coin ---
-class FlipCoinGame:
-    def __init__(self, player_id: int, bet_amount: int):
-        self.player_id = player_id
-        self.bet_amount = bet_amount
-        self.game_active = True # Game aktif sampai pemain memilih
-        self.player_choice = None # Pilihan pemain akan disimpan di sini
-
-active_flipcoin_games = {}
-FLIPCOIN_HEAD_EMOJI = '🪙' # Koin
-FLIPCOIN_TAIL_EMOJI = '🔵' # Lingkaran Biru
-
-# --- Roulette Game Constants ---
-ROULETTE_NUMBERS = {
-    0: 'hijau',
-    1: 'merah', 2: 'hitam', 3: 'merah', 4: 'hitam', 5: 'merah', 6: 'hitam',
-    7: 'merah', 8: 'hitam', 9: 'merah', 10: 'hitam', 11: 'hitam', 12: 'merah',
-    13: 'hitam', 14: 'merah', 15: 'hitam', 16: 'merah', 17: 'hitam', 18: 'merah',
-    19: 'merah', 20: 'hitam', 21: 'merah', 22: 'hitam', 23: 'merah', 24: 'hitam',
-    25: 'merah', 26: 'hitam', 27: 'merah', 28: 'hitam', 29: 'hitam', 30: 'merah',
-    31: 'hitam', 32: 'merah', 33: 'hitam', 34: 'merah', 35: 'hitam', 36: 'merah'
-}
-
-# Mapping untuk taruhan Dozens dan Columns
-ROULETTE_DOZENS = {
-    '1st12': list(range(1, 13)),   # 1-12
-    '2nd12': list(range(13, 25)),  # 13-24
-    '3rd12': list(range(25, 37))   # 25-36
-}
-ROULETTE_COLUMNS = { # (1, 4, 7...34), (2, 5, 8...35), (3, 6, 9...36)
-    'col1': [n for n in range(1, 37) if n % 3 == 1],
-    'col2': [n for n in range(1, 37) if n % 3 == 2],
-    'col3': [n for n in range(1, 37) if n % 3 == 0]
-}
-
-# Pembayaran (Payouts)
-ROULETTE_PAYOUTS = {
-    'number': 35,  # 1 to 1 for a single number (35:1)
-    'color': 1,    # 1 to 1 (1:1)
-    'parity': 1,   # 1 to 1 (1:1) (odd/even)
-    'half': 1,     # 1 to 1 (1:1) (high/low)
-    'dozen': 2,    # 2 to 1 (2:1)
-    'column': 2    # 2 to 1 (2:1)
-}
-
-# State management untuk roulette
-current_roulette_rounds = {} # {channel_id: {"status": "betting", "round_id": str, "message_id": int, "bets": {user_id: [taruhan]}}}
-ROULETTE_RED_EMOJI = '🔴'
-ROULETTE_BLACK_EMOJI = '⚫' # Menggunakan emoji hitam untuk warna hitam
-ROULETTE_BET_MESSAGE_TO_USER = {} # {message_id: channel_id} agar on_reaction_add bisa cari round_id
-
-# --- Fungsi-fungsi untuk Interaksi Database MySQL ---
-
-def get_db_connection():
-    """Mencoba membuat koneksi ke database MySQL."""
-    try:
-        conn = mysql.connector.connect(
-            host=MYSQL_HOST,
-            user=MYSQL_USER,
-            password=MYSQL_PASSWORD,
-            database=MYSQL_DATABASE
-        )
-        if conn.is_connected():
-            return conn
-    except Error as e:
-        print(f"ERROR KONEKSI DATABASE: {e}")
-        return None
-
-async def get_user_data(user_id: int) -> dict:
-    """Mengambil data pengguna (cash dan last_daily_claim) dari database. Jika tidak ada, membuat entri baru."""
-    conn = get_db_connection()
-    if conn is None: return {"cash": 0, "last_daily_claim": None}
-    
-    cursor = conn.cursor() 
-    try:
-        cursor.execute("SELECT cash, last_daily_claim FROM users_cash WHERE user_id = %s", (user_id,))
-        result = cursor.fetchone()
-        if result:
-            return {"cash": result[0], "last_daily_claim": result[1]}
-        else:
-            cursor.execute("INSERT INTO users_cash (user_id, cash, last_daily_claim) VALUES (%s, %s, %s)", (user_id, 0, None))
-            conn.commit()
-            return {"cash": 0, "last_daily_claim": None}
-    except Error as e:
-        print(f"ERROR MENGAMBIL DATA PENGGUNA ({user_id}): {e}")
-        return {"cash": 0, "last_daily_claim": None}
-    finally:
-        if cursor: cursor.close()
-        if conn: conn.close()
-
-async def update_user_cash(user_id: int, new_amount: int) -> bool:
-    """Memperbarui jumlah uang pengguna di database."""
-    conn = get_db_connection()
-    if conn is None: return False
-    
-    cursor = conn.cursor()
-    try:
-        cursor.execute("INSERT INTO users_cash (user_id, cash) VALUES (%s, %s) "
-                       "ON DUPLICATE KEY UPDATE cash = %s", 
-                       (user_id, new_amount, new_amount))
-        conn.commit()
-        return True
-    except Error as e:
-        print(f"ERROR UPDATE UANG PENGGUNA ({user_id}): {e}")
-        return False
-    finally:
-        if cursor: cursor.close()
-        if conn: conn.close()
-
-async def update_last_daily_claim(user_id: int, timestamp: datetime) -> bool:
-    """Memperbarui timestamp klaim daily terakhir pengguna di database."""
-    conn = get_db_connection()
-    if conn is None: return False
-    
-    cursor = conn.cursor()
-    try:
-        cursor.execute("INSERT INTO users_cash (user_id, last_daily_claim) VALUES (%s, %s) "
-                       "ON DUPLICATE KEY UPDATE last_daily_claim = %s",
-                       (user_id, timestamp, timestamp))
-        conn.commit()
-        return True
-    except Error as e:
-        print(f"ERROR UPDATE DAILY CLAIM ({user_id}): {e}")
-        return False
-    finally:
-        if cursor: cursor.close()
-        if conn: conn.close()
-
-# --- Fungsi untuk Manajemen Admin Bot ---
-async def is_admin_cash_adder(user_id: int) -> bool:
-    """Memeriksa apakah user_id adalah admin penambah cash dari database."""
-    conn = get_db_connection()
-    if conn is None: return False
-    cursor = conn.cursor()
-    try:
-        cursor.execute("SELECT user_id FROM bot_admins WHERE user_id = %s", (user_id,))
-        result = cursor.fetchone()
-        return result is not None
-    except Error as e:
-        print(f"ERROR CEK ADMIN ({user_id}): {e}")
-        return False
-    finally:
-        if cursor: cursor.close()
-        if conn: conn.close()
-
-async def add_admin_cash_adder(user_id: int) -> bool:
-    conn = get_db_connection()
-    if conn is None: return False
-    cursor = conn.cursor()
-    try:
-        cursor.execute("INSERT IGNORE INTO bot_admins (user_id) VALUES (%s)", (user_id,))
-        conn.commit()
-        return cursor.rowcount > 0
-    except Error as e:
-        print(f"ERROR TAMBAH ADMIN ({user_id}): {e}")
-        return False
-    finally:
-        if cursor: cursor.close()
-        if conn: conn.close()
-
-async def remove_admin_cash_adder(user_id: int) -> bool:
-    conn = get_db_connection()
-    if conn is None: return False
-    cursor = conn.cursor()
-    try:
-        cursor.execute("DELETE FROM bot_admins WHERE user_id = %s", (user_id,))
-        conn.commit()
-        return cursor.rowcount > 0
-    except Error as e:
-        print(f"ERROR HAPUS ADMIN ({user_id}): {e}")
-        return False
-    finally:
-        if cursor: cursor.close()
-        if conn: conn.close()
-
-# --- Fungsi untuk Roulette ---
-async def add_roulette_bet(round_id: str, user_id: int, bet_type: str, bet_choice: str, amount: int) -> bool:
-    conn = get_db_connection()
-    if conn is None: return False
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "INSERT INTO roulette_bets (round_id, user_id, bet_type, bet_choice, amount) VALUES (%s, %s, %s, %s, %s)",
-            (round_id, user_id, bet_type, bet_choice, amount)
-        )
-        conn.commit()
-        return True
-    except Error as e:
-        print(f"ERROR ADD ROULETTE BET: {e}")
-        return False
-    finally:
-        if cursor: cursor.close()
-        if conn: conn.close()
-
-async def get_roulette_bets_for_round(round_id: str) -> list[dict]:
-    conn = get_db_connection()
-    if conn is None: return []
-    cursor = conn.cursor(dictionary=True)
-    try:
-        cursor.execute("SELECT user_id, bet_type, bet_choice, amount FROM roulette_bets WHERE round_id = %s", (round_id,))
-        return cursor.fetchall()
-    except Error as e:
-        print(f"ERROR GET ROULETTE BETS: {e}")
-        return []
-    finally:
-        if cursor: cursor.close()
-        if conn: conn.close()
-
-async def clear_roulette_bets(round_id: str) -> bool:
-    conn = get_db_connection()
-    if conn is None: return False
-    cursor = conn.cursor()
-    try:
-        cursor.execute("DELETE FROM roulette_bets WHERE round_id = %s", (round_id,))
-        conn.commit()
-        return True
-    except Error as e:
-        print(f"ERROR CLEAR ROULETTE BETS: {e}")
-        return False
-    finally:
-        if cursor: cursor.close()
-        if conn: conn.close()
-
-
-# --- Event Bot Siap ---
-@client.event
-async def on_ready():
-    print(f'Bot {client.user} berhasil login!')
-    print(f'ID Bot: {client.user.id}')
-    # Mengupdate status bot untuk hanya menampilkan game yang ada
-    await client.change_presence(activity=discord.Game(name="type !listgame for the list!"))
-    print("HANIIF BOT  siap melayani perintah!")
-
-# --- Event Bot Menerima Reaksi (Diperbarui untuk Flip Coin) ---
-@client.event
-async def on_reaction_add(reaction, user):
-    if user.bot:
-        return
-
-    # --- Logika untuk Blackjack ---
-    if reaction.message.id in blackjack_message_to_player:
-        player_id_in_game = blackjack_message_to_player[reaction.message.id]
-        
-        if user.id != player_id_in_game:
-            try:
-                await reaction.message.remove_reaction(reaction.emoji, user)
-            except discord.Forbidden:
-                print("Bot tidak memiliki izin untuk menghapus reaksi.")
-            return
-        
-        game = active_blackjack_games.get(user.id)
-        if not game or not game.game_active:
-            try:
-                await reaction.message.remove_reaction(reaction.emoji, user)
-            except discord.Forbidden:
-                pass
-            del blackjack_message_to_player[reaction.message.id]
-            return
-
-        try:
-            await reaction.message.remove_reaction(reaction.emoji, user)
-        except discord.Forbidden:
-            print("Bot tidak memiliki izin untuk menghapus reaksi.")
-
-        if str(reaction.emoji) == '✅': # HIT
-            result = game.hit()
-            player_hand_str = game.get_player_hand_str()
-            player_score = game._calculate_hand_value(game.player_hand)
-
-            if result == "bust":
-                dealer_hand_str_revealed = game.get_dealer_hand_str(hidden=False)
-                dealer_score = game._calculate_hand_value(game.dealer_hand)
-                await reaction.message.channel.send(
-                    f"**{user.display_name} HIT!**\n"
-                    f"Kartu Anda: {player_hand_str} (Total: {player_score})\n"
-                    f"Kartu Dealer: {dealer_hand_str_revealed} (Total: {dealer_score})\n"
-                    f"💥 **Anda Bust! Kartu Anda melebihi 21. Anda kalah {game.bet_amount} koin!** 💸"
-                )
-                del active_blackjack_games[user.id]
-                del blackjack_message_to_player[reaction.message.id]
-            else:
-                dealer_hand_str_current = game.get_dealer_hand_str(hidden=False)
-                dealer_score_current = game._calculate_hand_value(game.dealer_hand)
-                new_message = await reaction.message.channel.send(
-                    f"**{user.display_name} HIT!**\n"
-                    f"Kartu Anda: {player_hand_str} (Total: {player_score})\n"
-                    f"Kartu Dealer: {dealer_hand_str_current} (Total: {dealer_score_current})\n"
-                    "Klik ✅ untuk HIT atau 🟥 untuk STAND."
-                )
-                blackjack_message_to_player[new_message.id] = user.id
-                if reaction.message.id in blackjack_message_to_player:
-                    del blackjack_message_to_player[reaction.message.id]
-                await new_message.add_reaction('✅')
-                await new_message.add_reaction('🟥')
-
-        elif str(reaction.emoji) == '🟥': # STAND
-            result = game.stand()
-            player_hand_str = game.get_player_hand_str()
-            player_score = game._calculate_hand_value(game.player_hand)
-            dealer_hand_str_revealed = game.get_dealer_hand_str(hidden=False)
-            dealer_score = game._calculate_hand_value(game.dealer_hand)
-            
-            bet_amount = game.bet_amount
-
-            if result == "dealer_bust":
-                user_data = await get_user_data(user.id)
-                final_cash = user_data["cash"] + (bet_amount * 2)
-                await update_user_cash(user.id, final_cash)
-                response_message = (
-                    f"**{user.display_name} memutuskan untuk STAND!**\n"
-                    f"Kartu Anda: {player_hand_str} (Total: {player_score})\n"
-                    f"Kartu Dealer: {dealer_hand_str_revealed} (Total: {dealer_score})\n"
-                    f"🎉 **DEALER BUST! Anda menang {bet_amount * 2} koin!** 🎉"
-                )
-            elif result == "player_win":
-                user_data = await get_user_data(user.id)
-                final_cash = user_data["cash"] + (bet_amount * 2)
-                await update_user_cash(user.id, final_cash)
-                response_message = (
-                    f"**{user.display_name} memutuskan untuk STAND!**\n"
-                    f"Kartu Anda: {player_hand_str} (Total: {player_score})\n"
-                    f"Kartu Dealer: {dealer_hand_str_revealed} (Total: {dealer_score})\n"
-                    f"💰 **Anda menang {bet_amount * 2} koin! Selamat!** 🥳"
-                )
-            elif result == "dealer_win":
-                response_message = (
-                    f"**{user.display_name} memutuskan untuk STAND!**\n"
-                    f"Kartu Anda: {player_hand_str} (Total: {player_score})\n"
-                    f"Kartu Dealer: {dealer_hand_str_revealed} (Total: {dealer_score})\n"
-                    f"💔 **DEALER MENANG! Anda kalah {bet_amount} koin.** 😥"
-                )
-            elif result == "tie":
-                user_data = await get_user_data(user.id)
-                final_cash = user_data["cash"] + bet_amount
-                await update_user_cash(user.id, final_cash)
-                response_message = (
-                    f"**{user.display_name} memutuskan untuk STAND!**\n"
-                    f"Kartu Anda: {player_hand_str} (Total: {player_score})\n"
-                    f"Kartu Dealer: {dealer_hand_str_revealed} (Total: {dealer_score})\n"
-                    f"🤝 **Ini seri! Taruhan {bet_amount} koin Anda dikembalikan.**"
-                )
-            
-            await reaction.message.channel.send(response_message)
-            del active_blackjack_games[user.id]
-            del blackjack_message_to_player[reaction.message.id]
-
-    # --- Logika untuk Flip Coin (BARU) ---
-    elif reaction.message.id in active_flipcoin_games:
-        game = active_flipcoin_games.get(reaction.message.id)
-
-        if user.id != game.player_id:
-            try:
-                await reaction.message.remove_reaction(reaction.emoji, user)
-            except discord.Forbidden:
-                print("Bot tidak memiliki izin untuk menghapus reaksi.")
-            return
-
-        if not game.game_active:
-            try:
-                await reaction.message.remove_reaction(reaction.emoji, user)
-            except discord.Forbidden:
-                pass
-            del active_flipcoin_games[reaction.message.id] # Hapus dari pelacakan jika sudah selesai
-            return
-
-        try:
-            await reaction.message.remove_reaction(reaction.emoji, user)
-        except discord.Forbidden:
-            print("Bot tidak memiliki izin untuk menghapus reaksi.")
-        
-        user_choice_str = ""
-        if str(reaction.emoji) == FLIPCOIN_HEAD_EMOJI:
-            user_choice_str = "kepala"
-        elif str(reaction.emoji) == FLIPCOIN_TAIL_EMOJI:
-            user_choice_str = "ekor"
-        else: # Reaksi bukan emoji pilihan
-            return
-
-        game.player_choice = user_choice_str # Simpan pilihan pemain
-        game.game_active = False # Tandai game tidak lagi aktif menunggu pilihan
-
-        # Lakukan lemparan koin
-        coin_sides = ['kepala', 'ekor']
-        coin_result = random.choice(coin_sides)
-        
-        result_message = ""
-        user_data = await get_user_data(user.id)
-        current_cash = user_data["cash"]
-        
-        if user_choice_str == coin_result:
-            winning_amount = game.bet_amount * 2
-            final_cash = current_cash + winning_amount
-            await update_user_cash(user.id, final_cash)
-            result_message = (
-                f"🎉 **LEMPAR KOIN! Anda Menang!** 🎉\n"
-                f"Anda memilih **{user_choice_str.upper()}**. Koin mendarat di **{coin_result.upper()}**!\n"
-                f"Selamat, **{user.display_name}**! Anda memenangkan **{winning_amount} koin**!\n"
-                f"Uang Anda sekarang: **{final_cash} koin**."
-            )
-            print(f"{user.name} menang {winning_amount} di flipcoin.")
-        else:
-            final_cash = current_cash
-            result_message = (
-                f"💔 **LEMPAR KOIN! Anda Kalah.** 💔\n"
-                f"Anda memilih **{user_choice_str.upper()}**. Koin mendarat di **{coin_result.upper()}**!\n"
-                f"Maaf, **{user.display_name}**. Anda kalah **{game.bet_amount} koin**.\n"
-                f"Uang Anda sekarang: **{final_cash} koin**."
-            )
-            print(f"{user.name} kalah {game.bet_amount} di flipcoin.")
-        
-        await reaction.message.channel.send(result_message)
-        del active_flipcoin_games[reaction.message.id]
-        await reaction.message.clear_reactions()
-
-    # --- Logika untuk Roulette (TARUHAN VIA REAKSI) ---
-    elif reaction.message.id in ROULETTE_BET_MESSAGE_TO_USER: # Cek apakah ini pesan taruhan roulette
-        channel_id_for_roulette = ROULETTE_BET_MESSAGE_TO_USER[reaction.message.id]
-
-        if channel_id_for_roulette in current_roulette_rounds and \
-           current_roulette_rounds[channel_id_for_roulette]["status"] == "betting":
-            
-            roulette_round = current_roulette_rounds[channel_id_for_roulette]
-            round_id = roulette_round["round_id"]
-
-            if user.bot:
-                return
-            
-            # Periksa apakah pengguna sudah bertaruh warna di putaran ini
-            user_bets = roulette_round["bets"].get(user.id, [])
-            if any(b['bet_type'] == 'color' and b.get('via_emoji', False) for b in user_bets):
-                 await reaction.message.channel.send(f"**{user.display_name}**, Anda sudah memasang taruhan warna via emoji di putaran ini. Gunakan `!bet` untuk taruhan lain.", ephemeral=True) # Perbaikan: Hapus ephemeral
-                 try: await reaction.message.remove_reaction(reaction.emoji, user)
-                 except discord.Forbidden: pass
-                 return
-
-            bet_amount = 10 # Default taruhan untuk reaksi warna
-            bet_type = 'color'
-            bet_choice = None
-
-            if str(reaction.emoji) == ROULETTE_RED_EMOJI:
-                bet_choice = 'merah'
-            elif str(reaction.emoji) == ROULETTE_BLACK_EMOJI:
-                bet_choice = 'hitam'
-            
-            if not bet_choice: # Emoji bukan untuk taruhan warna roulette
-                try: await reaction.message.remove_reaction(reaction.emoji, user)
-                except discord.Forbidden: pass
-                return
-            
-            user_data = await get_user_data(user.id)
-            current_cash = user_data["cash"]
-            if current_cash < bet_amount:
-                await reaction.message.channel.send(f"**{user.display_name}**, uang Anda tidak cukup ({current_cash} koin) untuk taruhan {bet_amount} koin.") # Perbaikan: Hapus ephemeral
-                try: await reaction.message.remove_reaction(reaction.emoji, user)
-                except discord.Forbidden: pass
-                return
-            
-            new_cash = current_cash - bet_amount
-            await update_user_cash(user.id, new_cash)
-            
-            # Tambahkan taruhan ke DB
-            success_bet = await add_roulette_bet(round_id, user.id, bet_type, bet_choice, bet_amount)
-            
-            if success_bet:
-                if user.id not in roulette_round["bets"]:
-                    roulette_round["bets"][user.id] = [] # Inisialisasi daftar taruhan untuk user ini
-                roulette_round["bets"][user.id].append({"amount": bet_amount, "bet_type": bet_type, "bet_choice": bet_choice, "via_emoji": True})
-                await reaction.message.channel.send(
-                    f"**{user.display_name}** menempatkan taruhan **{bet_amount} koin** pada **{bet_choice.upper()}** (via emoji). Uang Anda sekarang: **{new_cash} koin**."
-                )
-                print(f"{user.name} menaruh {bet_amount} koin di roulette via emoji.")
-            else:
-                await reaction.message.channel.send(f"Gagal menempatkan taruhan Roulette. Terjadi kesalahan database.") # Perbaikan: Hapus ephemeral
-                await update_user_cash(user.id, current_cash) # Kembalikan uang jika gagal
-                print(f"WARNING: Taruhan Roulette via emoji {user.id} gagal DB, uang dikembalikan.")
-            
-            try: await reaction.message.remove_reaction(reaction.emoji, user)
-            except discord.Forbidden: pass
-        else: # Bukan putaran roulette aktif yang menunggu reaksi
-            try: await reaction.message.remove_reaction(reaction.emoji, user)
-            except discord.Forbidden: pass
-
-
-# --- Event Bot Menerima Pesan ---
-@client.event
-async def on_message(message):
-    if message.author == client.user:
-        return
-
-    msg_content = message.content.lower()
-    user_id = message.author.id
-    channel_id = message.channel.id # Untuk Roulette
-
-    def has_required_role(member: discord.Member, allowed_roles: list[int]) -> bool:
-        if not member.guild:
-            return False
-        if not allowed_roles:
-            return False
-        for role in member.roles:
-            if role.id in allowed_roles:
-                return True
-        return False
-
-    if msg_content.startswith('!setadmin '):
-        if not message.guild:
-            await message.channel.send("Perintah ini hanya bisa digunakan di dalam server Discord.")
-            return
-
-        if not has_required_role(message.author, ALLOWED_SETADMIN_ROLES):
-            await message.channel.send("Maaf, Anda tidak memiliki role yang diperlukan untuk menggunakan perintah ini.")
-            return
-        
-        parts = message.content.split()
-        if len(parts) >= 3:
-            action = parts[1].lower()
-            target_id_str = parts[2]
-            
-            try:
-                target_user = None
-                if message.mentions:
-                    target_user = message.mentions[0]
-                    target_user_id = target_user.id
-                else:
-                    target_user_id = int(target_id_str)
-                    try:
-                        target_user = await client.fetch_user(target_user_id)
-                    except discord.NotFound:
-                        await message.channel.send("ID pengguna tidak valid atau tidak ditemukan.")
-                        return
-
-                if action == 'add':
-                    success = await add_admin_cash_adder(target_user_id)
-                    if success:
-                        await message.channel.send(f"{target_user.display_name} ({target_user_id}) sekarang adalah admin penambah cash.")
-                        print(f"Admin {message.author.name} menambahkan {target_user.name} sebagai admin cash.")
-                    else:
-                        await message.channel.send(f"{target_user.display_name} ({target_user_id}) sudah menjadi admin penambah cash.")
-                elif action == 'remove':
-                    success = await remove_admin_cash_adder(target_user_id)
-                    if success:
-                        await message.channel.send(f"{target_user.display_name} ({target_user_id}) telah dihapus dari admin penambah cash.")
-                        print(f"Admin {message.author.name} menghapus {target_user.name} dari admin cash.")
-                    else:
-                        await message.channel.send(f"{target_user.display_name} ({target_user_id}) bukan admin penambah cash.")
-                else:
-                    await message.channel.send("Format yang benar: `!setadmin [add/remove] <Discord ID/@user>`")
-            except ValueError:
-                await message.channel.send("Format ID pengguna tidak valid. Gunakan ID angka atau mention.")
-            except Exception as e:
-                await message.channel.send(f"Terjadi kesalahan: {e}")
-        else:
-            await message.channel.send("Format yang benar: `!setadmin [add/remove] <Discord ID/@user>`")
-
-    elif msg_content == '!balance':
-        user_data = await get_user_data(user_id)
-        user_current_cash = user_data["cash"]
-        await message.channel.send(f"{message.author.mention}, uang kamu saat ini: **{user_current_cash} koin**.")
-        print(f"Merespons '!balance' dari {message.author.name}. Uang: {user_current_cash}")
-
-    elif msg_content == '!daily':
-        daily_cooldown_hours = 12
-        amount_to_give = 100
-
-        user_data = await get_user_data(user_id)
-        current_cash = user_data["cash"]
-        last_claim_time = user_data["last_daily_claim"]
-
-        if last_claim_time:
-            time_since_last_claim = datetime.now() - last_claim_time
-            if time_since_last_claim < timedelta(hours=daily_cooldown_hours):
-                remaining_time = timedelta(hours=daily_cooldown_hours) - time_since_last_claim
-                
-                total_seconds_left = int(remaining_time.total_seconds())
-                hours_left = total_seconds_left // 3600
-                minutes_left = (total_seconds_left % 3600) // 60
-                seconds_left = total_seconds_left % 60
-                
-                time_str = []
-                if hours_left > 0:
-                    time_str.append(f"{hours_left} jam")
-                if minutes_left > 0:
-                    time_str.append(f"{minutes_left} menit")
-                if seconds_left > 0:
-                    time_str.append(f"{seconds_left} detik")
-                
-                if not time_str:
-                    time_str = ["sebentar lagi"]
-
-                await message.channel.send(
-                    f"⏳ **{message.author.display_name}**, kamu sudah mengklaim daily bonus. "
-                    f"Kamu bisa mengklaim lagi dalam **{' dan '.join(time_str)}**."
-                )
-                print(f"{message.author.name} mencoba daily terlalu cepat. Sisa: {hours_left}j {minutes_left}m {seconds_left}d.")
-                return
-
-        new_cash = current_cash + amount_to_give
-        current_time = datetime.now()
-        
-        success_cash = await update_user_cash(user_id, new_cash)
-        success_daily = await update_last_daily_claim(user_id, current_time)
-
-        if success_cash and success_daily:
-            await message.channel.send(f"🎉 **{message.author.display_name}**, kamu mendapatkan **{amount_to_give} koin harian**! Uangmu sekarang: **{new_cash} koin**.")
-            print(f"{message.author.name} berhasil mengklaim daily. Memberi {amount_to_give} koin.")
-        else:
-            await message.channel.send("Maaf, terjadi kesalahan saat mengupdate uang Anda.")
-
-    elif msg_content.startswith('!givecash '):
-        parts = message.content.split()
-        if len(parts) == 3 and message.mentions:
-            target_user = message.mentions[0]
-            try:
-                amount = int(parts[2])
-                if amount <= 0:
-                    await message.channel.send("Jumlah uang yang diberikan harus positif.")
-                    return
-                if message.author.id == target_user.id:
-                    await message.channel.send("Kamu tidak bisa memberikan uang kepada diri sendiri.")
-                    return
-
-                sender_data = await get_user_data(user_id)
-                sender_current_cash = sender_data["cash"]
-                if sender_current_cash < amount:
-                    await message.channel.send(f"Uangmu tidak cukup untuk memberikan **{amount} koin**. Uangmu saat ini: {sender_current_cash} koin.")
-                    return
-                
-                new_sender_cash = sender_current_cash - amount
-                await update_user_cash(user_id, new_sender_cash)
-
-                target_user_id = target_user.id
-                target_data = await get_user_data(target_user_id)
-                current_target_cash = target_data["cash"]
-                new_target_cash = current_target_cash + amount
-                await update_user_cash(target_user_id, new_target_cash)
-
-                await message.channel.send(f"{message.author.mention} berhasil memberikan **{amount} koin** kepada {target_user.mention}! Uang {message.author.display_name}: **{new_sender_cash} koin**. Uang {target_user.display_name}: **{new_target_cash} koin**.")
-                print(f"{message.author.name} memberikan {amount} koin kepada {target_user.name}.")
-
-            except ValueError:
-                await message.channel.send("Jumlah uang harus berupa angka.")
-            except Exception as e:
-                await message.channel.send(f"Terjadi kesalahan: {e}")
-        else:
-            await message.channel.send("Format yang benar: `!givecash @nama_user <jumlah>`")
-
-    elif msg_content.startswith('!addcash '):
-        if not await is_admin_cash_adder(user_id):
-            await message.channel.send("Maaf, Anda tidak memiliki izin untuk menggunakan perintah ini.")
-            return
-
-        parts = message.content.split()
-        if len(parts) == 3 and message.mentions:
-            target_user = message.mentions[0]
-            try:
-                amount = int(parts[2])
-                if amount <= 0:
-                    await message.channel.send("Jumlah uang yang ditambahkan harus positif.")
-                    return
-                
-                target_user_id = target_user.id
-                target_data = await get_user_data(target_user_id)
-                current_target_cash = target_data["cash"]
-                new_target_cash = current_target_cash + amount
-                success = await update_user_cash(target_user_id, new_target_cash)
-
-                if success:
-                    await message.channel.send(f"Berhasil menambahkan **{amount} koin** kepada {target_user.mention}. Uangnya sekarang: **{new_target_cash} koin**.")
-                    print(f"Admin {message.author.name} menambahkan {amount} koin kepada {target_user.name}.")
-                else:
-                    await message.channel.send("Maaf, terjadi kesalahan saat menambahkan uang.")
-            except ValueError:
-                await message.channel.send("Jumlah uang harus berupa angka.")
-            except Exception as e:
-                await message.channel.send(f"Terjadi kesalahan: {e}")
-        else:
-            await message.channel.send("Format yang benar: `!addcash @nama_user <jumlah>`")
-
-    elif msg_content.startswith('!removecash '):
-        if not await is_admin_cash_adder(user_id):
-            await message.channel.send("Maaf, Anda tidak memiliki izin untuk menggunakan perintah ini.")
-            return
-
-        parts = message.content.split()
-        if len(parts) == 3 and message.mentions:
-            target_user = message.mentions[0]
-            try:
-                amount = int(parts[2])
-                if amount <= 0:
-                    await message.channel.send("Jumlah uang yang dikurangi harus positif.")
-                    return
-                
-                target_user_id = target_user.id
-                target_data = await get_user_data(target_user_id)
-                current_target_cash = target_data["cash"]
-                
-                if current_target_cash < amount:
-                    await message.channel.send(f"Uang {target_user.display_name} hanya {current_target_cash} koin. Tidak bisa dikurangi sebanyak {amount} koin.")
-                    return
-
-                new_target_cash = current_target_cash - amount
-                success = await update_user_cash(target_user_id, new_target_cash)
-
-                if success:
-                    await message.channel.send(f"Berhasil mengurangi **{amount} koin** dari {target_user.mention}. Uangnya sekarang: **{new_target_cash} koin**.")
-                    print(f"Admin {message.author.name} mengurangi {amount} koin dari {target_user.name}.")
-                else:
-                    await message.channel.send("Maaf, terjadi kesalahan saat mengurangi uang.")
-            except ValueError:
-                await message.channel.send("Jumlah uang harus berupa angka.")
-            except Exception as e:
-                await message.channel.send(f"Terjadi kesalahan: {e}")
-        else:
-            await message.channel.send("Format yang benar: `!removecash @nama_user <jumlah>`")
-
-    elif msg_content == 'ping':
-        await message.channel.send('Pong!')
-        print(f"Merespons 'ping' dari {message.author.name}")
-    elif msg_content == 'halo':
-        await message.channel.send(f'Halo juga, {message.author.mention}!')
-        print(f"Merespons 'halo' dari {message.author.name}")
-    elif msg_content == '!info':
-        await message.channel.send("Saya adalah bot sederhana yang dibuat dengan discord.py.")
-        print(f"Merespons '!info' dari {message.author.name}")
-    elif msg_content == '!listgame':
-        await message.channel.send(
-        f"{message.author.mention} List Game: \n 1. BlackJack (!bj) \n 2. Flip Coin (!fc) \n 3. Roulette (!rou start)")
-        print(f"Merespons '!listgame' dari {message.author.name}")
-    
-    # --- Perintah Permainan Blackjack ---
-    elif msg_content.startswith('!blackjack ') or msg_content.startswith('!bj '):
-        parts = msg_content.split()
-        if len(parts) < 2:
-            await message.channel.send("Format yang benar: `!blackjack <jumlah_taruhan>` atau `!bj <jumlah_taruhan>`. Taruhan harus positif.")
-            return
-        
-        try:
-            bet_amount = int(parts[1])
-            if bet_amount <= 0:
-                await message.channel.send("Jumlah taruhan harus positif.")
-                return
-        except ValueError:
-            await message.channel.send("Jumlah taruhan harus berupa angka.")
-            return
-
-        if user_id in active_blackjack_games and active_blackjack_games[user_id].game_active:
-            await message.channel.send("Kamu sudah memiliki permainan Blackjack yang sedang berjalan. Klik `✅` atau `🟥`.")
-            return
-        
-        user_data = await get_user_data(user_id)
-        current_cash = user_data["cash"]
-        if current_cash < bet_amount:
-            await message.channel.send(f"Kamu butuh setidaknya **{bet_amount} koin** untuk bermain Blackjack. Uangmu saat ini: {current_cash} koin.")
-            return
-
-        new_cash = current_cash - bet_amount
-        await update_user_cash(user_id, new_cash)
-
-        game = BlackjackGame(user_id, bet_amount) 
-        result = game.start_game()
-        active_blackjack_games[user_id] = game
-
-        player_hand_str = game.get_player_hand_str()
-        player_score = game._calculate_hand_value(game.player_hand)
-        
-        dealer_hand_str_revealed = game.get_dealer_hand_str(hidden=False)
-        dealer_score_revealed = game._calculate_hand_value(game.dealer_hand)
-
-        if result == "blackjack_player":
-            winning_amount = game.bet_amount * 2
-            final_cash = new_cash + winning_amount
-            await update_user_cash(user_id, final_cash)
-            response_message = await message.channel.send(
-                f"🎉 **BLACKJACK! Kemenangan Instan!** 🎉\n"
-                f"**{message.author.display_name}** memulai permainan Blackjack (taruhan: **{game.bet_amount} koin**).\n"
-                f"Kartu Anda: {player_hand_str} (Total: **{player_score}**)\n"
-                f"Kartu Dealer: {dealer_hand_str_revealed} (Total: **{dealer_score_revealed}**)\n"
-                f"Anda mendapatkan **{winning_amount} koin**! Saldo baru Anda: **{final_cash} koin**."
-            )
-            del active_blackjack_games[user_id]
-        else:
-            response_message = await message.channel.send(
-                f"♠️♥️♦️♣️ **BLACKJACK DIMULAI!** ♣️♦️♥️♠️\n"
-                f"**{message.author.display_name}** bertaruh **{game.bet_amount} koin**.\n"
-                f"Kartu Anda: {player_hand_str} (Total: **{player_score}**)\n"
-                f"Kartu Dealer: {dealer_hand_str_revealed} (Total: **{dealer_score_revealed}**)\n"
-                "Apa langkah Anda selanjutnya? Klik ✅ untuk **HIT** atau 🟥 untuk **STAND**!"
-            )
-            blackjack_message_to_player[response_message.id] = user_id
-            await response_message.add_reaction('✅')
-            await response_message.add_reaction('🟥')
-
-    # --- Perintah Permainan Flip Coin (!flipcoin atau !fc) ---
-    elif msg_content.startswith('!flipcoin ') or msg_content.startswith('!fc '):
-        parts = msg_content.split()
-        if len(parts) < 2:
-            await message.channel.send("Format yang benar: `!flipcoin <jumlah_taruhan>` atau `!fc <jumlah_taruhan>`. Taruhan harus positif.")
-            return
-
-        try:
-            bet_amount = int(parts[1])
-            if bet_amount <= 0:
-                await message.channel.send("Jumlah taruhan harus positif.")
-                return
-        except ValueError:
-            await message.channel.send("Jumlah taruhan harus berupa angka.")
-            return
-        
-        user_data = await get_user_data(user_id)
-        current_cash = user_data["cash"]
-        if current_cash < bet_amount:
-            await message.channel.send(f"Uangmu tidak cukup untuk bertaruh **{bet_amount} koin**. Uangmu saat ini: {current_cash} koin.")
-            return
-
-        new_cash_after_bet = current_cash - bet_amount
-        await update_user_cash(user_id, new_cash_after_bet)
-
-        game = FlipCoinGame(user_id, bet_amount)
-        
-        response_message = await message.channel.send(
-            f"**{message.author.display_name}** bertaruh **{bet_amount} koin** di Lempar Koin!\n"
-            f"Pilih sisi koin: {FLIPCOIN_HEAD_EMOJI} untuk **Kepala** atau {FLIPCOIN_TAIL_EMOJI} untuk **Ekor**."
-        )
-        active_flipcoin_games[response_message.id] = game
-        await response_message.add_reaction(FLIPCOIN_HEAD_EMOJI)
-        await response_message.add_reaction(FLIPCOIN_TAIL_EMOJI)
-
-    # --- Perintah Roulette (!roulette atau !rou) ---
-    elif msg_content.startswith('!roulette') or msg_content.startswith('!rou'):
-        parts = msg_content.split()
-        channel_id = message.channel.id
-        
-        if len(parts) == 1 or (len(parts) == 2 and parts[1].lower() == 'start'):
-            print(f"DEBUG: !roulette start command received from {message.author.name} in channel {message.channel.name}")
-            # Periksa izin admin untuk memulai roulette
-            if not has_required_role(message.author, ALLOWED_SETADMIN_ROLES):
-                await message.channel.send("Maaf, hanya admin yang bisa memulai atau mengakhiri permainan Roulette.")
-                return
-
-            if channel_id in current_roulette_rounds and current_roulette_rounds[channel_id]["status"] == "betting":
-                await message.channel.send("Permainan Roulette sudah aktif di channel ini. Silakan pasang taruhan Anda.")
-                return
-
-            round_id = datetime.now().strftime("%Y%m%d%H%M%S") + str(random.randint(0, 999)) # ID unik untuk putaran
-            current_roulette_rounds[channel_id] = {
-                "status": "betting",
-                "round_id": round_id,
-                "message_id": 0, # Akan diisi setelah pesan dikirim
-                "bets": {} # {user_id: [taruhan_obj]} -> [taruhan_obj] = {"amount": int, "bet_type": str, "bet_choice": str}
-            }
-
-            roulette_info_message = await message.channel.send(
-                f"🎰 **ROULETTE BARU DIMULAI!** 🎰\n"
-                f"**Putaran ID:** `{round_id}`\n"
-                f"**Taruhan dibuka!** Anda bisa pasang taruhan dengan `!bet <jumlah> <jenis_taruhan> <pilihan>`.\n\n"
-                f"**Jenis Taruhan (Contoh):**\n"
-                f"  `!bet 50 merah` (atau `hitam`)\n"
-                f"  `!bet 50 genap` (atau `ganjil`)\n"
-                f"  `!bet 50 tinggi` (19-36) (atau `rendah` (1-18))\n"
-                f"  `!bet 10 angka 7` (atau angka 0-36)\n"
-                f"  `!bet 20 1st12` (1-12) (atau `2nd12`, `3rd12`)\n"
-                f"  `!bet 20 col1` (kolom 1) (atau `col2`, `col3`)\n\n"
-                f"Taruhan cepat: Klik {ROULETTE_RED_EMOJI} untuk Merah atau {ROULETTE_BLACK_EMOJI} untuk Hitam (default 10 koin)."
-            )
-            current_roulette_rounds[channel_id]["message_id"] = roulette_info_message.id
-            # Tambahkan message_id ke ROULETTE_BET_MESSAGE_TO_USER untuk dilacak reaksinya
-            ROULETTE_BET_MESSAGE_TO_USER[roulette_info_message.id] = channel_id
-            await roulette_info_message.add_reaction(ROULETTE_RED_EMOJI) # Emoji untuk Merah
-            await roulette_info_message.add_reaction(ROULETTE_BLACK_EMOJI) # Emoji untuk Hitam
-            
-            print(f"Roulette putaran {round_id} dimulai di channel {message.channel.name}.")
-
-        elif len(parts) == 2 and parts[1].lower() == 'spin':
-            print(f"DEBUG: !roulette spin command received from {message.author.name} in channel {message.channel.name}")
-            # Periksa izin admin untuk mengakhiri roulette
-            if not has_required_role(message.author, ALLOWED_SETADMIN_ROLES):
-                await message.channel.send("Maaf, hanya admin yang bisa memulai atau mengakhiri permainan Roulette.")
-                return
-
-            if channel_id not in current_roulette_rounds or current_roulette_rounds[channel_id]["status"] != "betting":
-                await message.channel.send("Tidak ada permainan Roulette yang aktif untuk diputar. Mulai dengan `!roulette start`.")
-                return
-            
-            round_info = current_roulette_rounds[channel_id]
-            round_id = round_info["round_id"]
-            current_roulette_rounds[channel_id]["status"] = "spinning" # Tandai sebagai spinning
-
-            await message.channel.send("🚫 **NO MORE BETS!** 🚫 Roda berputar... 🎡")
-            
-            # Hapus reaksi dari pesan pengumuman taruhan
-            if round_info["message_id"] != 0:
-                try:
-                    roulette_msg = await message.channel.fetch_message(round_info["message_id"])
-                    await roulette_msg.clear_reactions()
-                    del ROULETTE_BET_MESSAGE_TO_USER[roulette_msg.id] # Hapus dari pelacakan pesan
-                except discord.NotFound:
-                    print(f"Pesan roulette {round_info['message_id']} tidak ditemukan saat clear reactions.")
-                except discord.Forbidden:
-                    print("Bot tidak memiliki izin untuk menghapus reaksi.")
-            
-            winning_number = random.choice(list(ROULETTE_NUMBERS.keys()))
-            winning_color = ROULETTE_NUMBERS[winning_number]
-            winning_parity = 'genap' if winning_number % 2 == 0 and winning_number != 0 else 'ganjil' if winning_number != 0 else 'none'
-            winning_half = 'tinggi' if 19 <= winning_number <= 36 else 'rendah' if 1 <= winning_number <= 18 else 'none'
-
-            await message.channel.send(f"⚪ **Angka pemenang: {winning_number} ({winning_color.upper()})!** ⚪")
-            print(f"DEBUG: Angka pemenang Roulette: {winning_number} ({winning_color.upper()}).")
-
-            # Proses taruhan
-            bets = await get_roulette_bets_for_round(round_id)
-            print(f"DEBUG: Ditemukan {len(bets)} taruhan untuk putaran {round_id}.")
-            
-            total_winnings = {} # {user_id: jumlah_kemenangan_bersih}
-            total_lost_to_house = 0 # Untuk melacak uang yang masuk ke bot
-
-            for bet in bets:
-                user_id_bet = bet['user_id']
-                bet_type = bet['bet_type']
-                bet_choice = bet['bet_choice']
-                amount = bet['amount']
-                
-                is_winner = False
-                payout_multiplier = 0
-
-                if bet_type == 'number' and str(winning_number) == bet_choice: # Perbandingan string
-                    is_winner = True
-                    payout_multiplier = ROULETTE_PAYOUTS['number']
-                elif bet_type == 'color' and winning_color == bet_choice:
-                    is_winner = True
-                    payout_multiplier = ROULETTE_PAYOUTS['color']
-                elif bet_type == 'parity' and winning_parity == bet_choice:
-                    is_winner = True
-                    payout_multiplier = ROULETTE_PAYOUTS['parity']
-                elif bet_type == 'half' and winning_half == bet_choice:
-                    is_winner = True
-                    payout_multiplier = ROULETTE_PAYOUTS['half']
-                elif bet_type == 'dozen' and winning_number in ROULETTE_DOZENS.get(bet_choice, []):
-                    is_winner = True
-                    payout_multiplier = ROULETTE_PAYOUTS['dozen']
-                elif bet_type == 'column' and winning_number in ROULETTE_COLUMNS.get(bet_choice, []):
-                    is_winner = True
-                    payout_multiplier = ROULETTE_PAYOUTS['column']
-                
-                if is_winner:
-                    winnings = amount + (amount * payout_multiplier) # Taruhan kembali + keuntungan
-                    total_winnings[user_id_bet] = total_winnings.get(user_id_bet, 0) + winnings
-                    print(f"DEBUG: Taruhan {user_id_bet} ({bet_type}/{bet_choice}) menang {winnings}.")
-                else:
-                    total_lost_to_house += amount
-                    print(f"DEBUG: Taruhan {user_id_bet} ({bet_type}/{bet_choice}) kalah {amount}.")
-            
-            # Distribusi kemenangan
-            winner_mentions = []
-            for user_id_winner, winnings_amount in total_winnings.items():
-                user_data = await get_user_data(user_id_winner)
-                current_cash = user_data["cash"]
-                new_cash = current_cash + winnings_amount
-                success_update = await update_user_cash(user_id_winner, new_cash)
-                
-                if success_update:
-                    winner_discord_user = await client.fetch_user(user_id_winner)
-                    if winner_discord_user:
-                        winner_mentions.append(f"🎉 **{winner_discord_user.display_name}** menang **{winnings_amount} koin**! Saldo baru: **{new_cash} koin**.")
-                    else:
-                        winner_mentions.append(f"🎉 **User ID {user_id_winner}** menang **{winnings_amount} koin**! Saldo baru: **{new_cash} koin**.")
-                    print(f"DEBUG: Kemenangan {user_id_winner} di Roulette berhasil diupdate.")
-                else:
-                    await message.channel.send(f"⚠️ **ERROR:** Gagal update cash untuk pemenang <@{user_id_winner}> di Roulette. Hubungi admin.")
-                    print(f"ERROR: Gagal update cash untuk pemenang {user_id_winner} di Roulette.")
-            
-            if winner_mentions:
-                await message.channel.send("--- **HASIL ROULETTE** ---\n" + "\n".join(winner_mentions))
-            else:
-                await message.channel.send(f"Tidak ada yang menang di putaran ini. Semua taruhan ({total_lost_to_house} koin) menjadi milik rumah.")
-            
-            # Hapus taruhan dari database
-            await clear_roulette_bets(round_id)
-            del current_roulette_rounds[channel_id] # Hapus putaran aktif
-
-        else:
-            await message.channel.send("Format yang benar: `!roulette start` untuk memulai atau `!roulette spin` untuk memutar roda.")
-
-    # --- Perintah !bet (untuk menempatkan taruhan di Roulette) ---
-    elif msg_content.startswith('!bet '):
-        parts = message.content.split(' ', 3) # !bet amount type choice
-        channel_id = message.channel.id
-
-        if channel_id not in current_roulette_rounds or current_roulette_rounds[channel_id]["status"] != "betting":
-            await message.channel.send("Tidak ada putaran Roulette yang aktif di channel ini. Mulai dengan `!roulette start`.")
-            return
-        
-        if len(parts) < 3: # Minimal !bet <amount> <type>
-            await message.channel.send("Format taruhan tidak benar. Contoh: `!bet 100 merah` atau `!bet 20 angka 7`.")
-            return
-        
-        try:
-            bet_amount = int(parts[1])
-            if bet_amount <= 0:
-                await message.channel.send("Jumlah taruhan harus positif.")
-                return
-        except ValueError:
-            await message.channel.send("Jumlah taruhan harus berupa angka.")
-            return
-        
-        user_data = await get_user_data(user_id)
-        current_cash = user_data["cash"]
-        if current_cash < bet_amount:
-            await message.channel.send(f"Uangmu tidak cukup untuk bertaruh **{bet_amount} koin**. Uangmu saat ini: {current_cash} koin.")
-            return
-
-        bet_type_raw = parts[2].lower()
-        bet_choice = parts[3].lower() if len(parts) > 3 else "" # Pilihan taruhan
-
-        valid_bet = False
-        parsed_bet_type = None
-        parsed_bet_choice = None
-
-        if bet_type_raw in ['merah', 'hitam']:
-            parsed_bet_type = 'color'
-            parsed_bet_choice = bet_type_raw
-            valid_bet = True
-        elif bet_type_raw in ['genap', 'ganjil']:
-            parsed_bet_type = 'parity'
-            parsed_bet_choice = bet_type_raw
-            valid_bet = True
-        elif bet_type_raw in ['tinggi', 'rendah']:
-            parsed_bet_type = 'half'
-            parsed_bet_choice = bet_type_raw
-            valid_bet = True
-        elif bet_type_raw == 'angka':
-            try:
-                num_choice = int(bet_choice)
-                if 0 <= num_choice <= 36:
-                    parsed_bet_type = 'number'
-                    parsed_bet_choice = str(num_choice)
-                    valid_bet = True
-            except ValueError:
-                pass # Tetap False
-        elif bet_type_raw in ['1st12', '2nd12', '3rd12']:
-            parsed_bet_type = 'dozen'
-            parsed_bet_choice = bet_type_raw
-            valid_bet = True
-        elif bet_type_raw in ['col1', 'col2', 'col3']:
-            parsed_bet_type = 'column'
-            parsed_bet_choice = bet_type_raw
-            valid_bet = True
-        
-        if not valid_bet:
-            await message.channel.send("Jenis taruhan tidak valid atau pilihan salah. Contoh: `!bet 100 merah`, `!bet 20 angka 7`, `!bet 50 genap`.")
-            return
-
-        # Kurangi uang dan simpan taruhan
-        new_cash = current_cash - bet_amount
-        await update_user_cash(user_id, new_cash)
-        
-        round_id = current_roulette_rounds[channel_id]["round_id"]
-        success_bet = await add_roulette_bet(round_id, user_id, parsed_bet_type, parsed_bet_choice, bet_amount)
-
-        if success_bet:
-            # Simpan juga di state lokal untuk mencegah duplikat taruhan emoji
-            if user_id not in current_roulette_rounds[channel_id]["bets"]: # Perbaikan: user_id bukan user.id
-                current_roulette_rounds[channel_id]["bets"][user_id] = [] # Perbaikan: user_id bukan user.id
-            current_roulette_rounds[channel_id]["bets"][user_id].append({"amount": bet_amount, "bet_type": parsed_bet_type, "bet_choice": parsed_bet_choice}) # Perbaikan: user_id
-
-            await message.channel.send(
-                f"**{message.author.display_name}** berhasil menempatkan taruhan **{bet_amount} koin** "
-                f"pada **{parsed_bet_type.upper()} - {parsed_bet_choice.upper()}**."
-                f" Uang Anda sekarang: **{new_cash} koin**."
-            )
-            print(f"{message.author.name} bertaruh {bet_amount} di roulette: {parsed_bet_type}/{parsed_bet_choice}.")
-        else:
-            await message.channel.send(f"Gagal menempatkan taruhan. Terjadi kesalahan database.")
-            await update_user_cash(user_id, current_cash) # Kembalikan uang jika taruhan gagal masuk DB
-            print(f"WARNING: Taruhan {user_id} {bet_amount} di roulette gagal DB, uang dikembalikan.")
-
-# --- Jalankan Bot dengan Token ---
-client.run(TOKEN)
+import discord
+import os
+import json
+import re
+import sqlite3
+from dotenv import load_dotenv
+import random
+import asyncio
+import bisect
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import mysql.connector
+from mysql.connector import Error, errorcode
+import schema
+try:
+    from sortedcontainers import SortedList # Opsional: papan peringkat dengan sisip/hapus O(log n)
+except ImportError:
+    SortedList = None
+from games import (
+    BLACKJACK_RETURN_MULTIPLIERS, BlackjackGame, BlackjackShoe,
+    FlipCoinGame,
+    ROULETTE_BET_OPTIONS, ROULETTE_NUMBERS, RouletteBook, roulette_bet_code
+)
+from datetime import datetime, timedelta
+
+# --- Muat Variabel Lingkungan dari File .env ---
+load_dotenv()
+
+# Ambil token bot dari environment variable
+TOKEN = os.getenv('DISCORD_TOKEN')
+if not TOKEN:
+    print("Error: DISCORD_TOKEN tidak ditemukan. Pastikan sudah diatur di environment variable atau file .env.")
+    exit()
+
+# Backend database: 'mysql' (default) atau 'sqlite' (file lokal, tanpa server database)
+DB_BACKEND = os.getenv('DB_BACKEND', 'mysql').lower()
+SQLITE_PATH = os.getenv('SQLITE_PATH', 'haniifbot.db')
+DB_AUTO_MIGRATE = os.getenv('DB_AUTO_MIGRATE', '1') != '0' # Jalankan migrasi skema (schema.py) saat bot start
+
+# Ambil detail koneksi MySQL dari environment variable
+MYSQL_HOST = os.getenv('MYSQL_HOST')
+MYSQL_USER = os.getenv('MYSQL_USER')
+MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
+MYSQL_DATABASE = os.getenv('MYSQL_DATABASE')
+
+# Pastikan semua variabel lingkungan MySQL yang diperlukan sudah diatur
+if DB_BACKEND == 'mysql' and not all([MYSQL_HOST, MYSQL_USER, MYSQL_DATABASE]):
+    print("Error: Pastikan semua variabel lingkungan MySQL (MYSQL_HOST, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE) diatur.")
+    exit()
+
+# Pengaturan pool koneksi database (opsional, ada nilai default)
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', '2'))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+DB_POOL_ACQUIRE_TIMEOUT = float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT', '5')) # detik menunggu koneksi kosong
+DB_POOL_HEALTH_CHECK_INTERVAL = float(os.getenv('DB_POOL_HEALTH_CHECK_INTERVAL', '30')) # koneksi menganggur lebih lama dari ini di-ping dulu
+
+# Pengaturan cache saldo (write-behind) untuk tabel users_cash
+BALANCE_CACHE_MAX_SIZE = int(os.getenv('BALANCE_CACHE_MAX_SIZE', '10000')) # jumlah pengguna maksimum di memori
+BALANCE_FLUSH_INTERVAL = float(os.getenv('BALANCE_FLUSH_INTERVAL', '2')) # detik antar flush saldo ke database
+BALANCE_FLUSH_BATCH_SIZE = 500 # baris per statement INSERT multi-baris
+
+# Jumlah kunci asyncio bergaris untuk menyerialkan perintah per pengguna (lihat UserLocks)
+USER_LOCK_STRIPES = int(os.getenv('USER_LOCK_STRIPES', '1024'))
+
+# Papan peringkat (!top): jumlah baris bawaan dan maksimum
+LEADERBOARD_DEFAULT_SIZE = 10
+LEADERBOARD_MAX_SIZE = 25
+
+# Batas eksposur meja roulette per putaran (0 = tanpa batas)
+ROULETTE_MAX_NUMBER_EXPOSURE = int(os.getenv('ROULETTE_MAX_NUMBER_EXPOSURE', '0')) # total bayaran maksimum jika satu angka keluar
+ROULETTE_MAX_ROUND_EXPOSURE = int(os.getenv('ROULETTE_MAX_ROUND_EXPOSURE', '0')) # kerugian bersih maksimum rumah dalam satu putaran
+
+# Konfirmasi taruhan yang masuk dalam jendela waktu ini digabung menjadi satu pesan per channel
+OUTBOX_FLUSH_WINDOW = float(os.getenv('OUTBOX_FLUSH_WINDOW', '0.5')) # detik
+OUTBOX_MAX_RETRIES = 5
+OUTBOX_MAX_BACKOFF = 30 # detik
+
+# Cache pengguna hasil fetch_user untuk nama di pengumuman (member guild sudah di-cache oleh discord.py)
+USER_CACHE_MAX_SIZE = int(os.getenv('USER_CACHE_MAX_SIZE', '5000'))
+USER_CACHE_TTL = float(os.getenv('USER_CACHE_TTL', '600')) # detik
+
+# Perekaman lalu lintas untuk replay.py (kosong = tidak merekam). Berisi isi perintah dengan ID pengguna dianonimkan.
+TRAFFIC_RECORD_PATH = os.getenv('TRAFFIC_RECORD_PATH', '')
+
+# Shoe blackjack bersama (0 dek = setiap game memakai dek 52 kartu baru sendiri)
+BLACKJACK_SHOE_DECKS = int(os.getenv('BLACKJACK_SHOE_DECKS', '0'))
+BLACKJACK_SHOE_PENETRATION = float(os.getenv('BLACKJACK_SHOE_PENETRATION', '0.75')) # bagian shoe yang dibagikan sebelum dikocok ulang
+BLACKJACK_SHOE_SCOPE = os.getenv('BLACKJACK_SHOE_SCOPE', 'channel').lower() # 'channel' (satu shoe per channel) atau 'global'
+
+# Cara pemain memainkan Blackjack dan Flip Coin: 'buttons' (tombol, pesan game diedit di tempat) atau 'reactions'
+GAME_INTERACTION_MODE = os.getenv('GAME_INTERACTION_MODE', 'buttons').lower()
+
+# Pesan game interaktif (menunggu reaksi) yang ditinggalkan: batas waktu dalam detik dan aturan saat kedaluwarsa
+# Aturan: 'refund' (taruhan dikembalikan) atau 'forfeit' (taruhan hangus menjadi milik rumah)
+INTERACTIVE_MAX_ENTRIES = int(os.getenv('INTERACTIVE_MAX_ENTRIES', '10000')) # jumlah pesan interaktif maksimum di memori
+BLACKJACK_TIMEOUT = float(os.getenv('BLACKJACK_TIMEOUT', '300'))
+BLACKJACK_EXPIRY_ACTION = os.getenv('BLACKJACK_EXPIRY_ACTION', 'refund').lower()
+FLIPCOIN_TIMEOUT = float(os.getenv('FLIPCOIN_TIMEOUT', '120'))
+FLIPCOIN_EXPIRY_ACTION = os.getenv('FLIPCOIN_EXPIRY_ACTION', 'refund').lower()
+ROULETTE_TIMEOUT = float(os.getenv('ROULETTE_TIMEOUT', '3600')) # putaran yang tidak diputar selama ini dibatalkan
+ROULETTE_EXPIRY_ACTION = os.getenv('ROULETTE_EXPIRY_ACTION', 'refund').lower()
+
+# Penyimpanan state game: '' (hanya di memori proses ini), 'memory' (state di-serialize di memori, untuk pengujian)
+# atau 'database' (tabel game_state bersama, sehingga game bisa dilanjutkan proses lain atau setelah restart)
+GAME_STATE_STORE = os.getenv('GAME_STATE_STORE', '').lower()
+GAME_STATE_FLUSH_INTERVAL = float(os.getenv('GAME_STATE_FLUSH_INTERVAL', '0.5')) # detik antar penulisan state
+GAME_STATE_ORPHAN_GRACE = 60 # detik setelah kedaluwarsa sebelum game tanpa pemilik diselesaikan proses lain
+GAME_STATE_ORPHAN_CHECK_INTERVAL = 30 # detik antar pencarian game tanpa pemilik
+# Dengan state game bersama beberapa proses bot memakai database yang sama, jadi saldo tidak di-cache per proses
+# (BalanceCache) tetapi diubah langsung dan relatif di database, lihat _change_user_cash
+BALANCE_WRITE_THROUGH = GAME_STATE_STORE == 'database'
+# Dalam mode yang sama, daftar admin dimuat ulang berkala agar !setadmin di proses lain ikut terlihat
+PERMISSIONS_RELOAD_INTERVAL = float(os.getenv('PERMISSIONS_RELOAD_INTERVAL', '60')) # detik
+
+# Pembatas laju perintah per pengguna dan per perintah (token bucket). Format 'N/S': maksimal N perintah
+# beruntun, terisi kembali N perintah per S detik. '0' = tanpa batas. Alias memakai batas nama yang diatur.
+RATE_LIMIT_DEFAULT = os.getenv('RATE_LIMIT_DEFAULT', '5/10') # untuk perintah yang tidak ada di RATE_LIMITS
+RATE_LIMITS = {'!balance': '3/10', '!daily': '2/60', '!bet': '20/10'}
+# Diatur lewat RATE_LIMITS, misalnya "!balance=3/10,!top=2/30,ping=0"
+RATE_LIMITS.update(
+    (name.strip().lower(), spec) for name, _, spec in
+    (item.partition('=') for item in os.getenv('RATE_LIMITS', '').split(',') if item.strip())
+)
+RATE_LIMIT_MAX_BUCKETS = int(os.getenv('RATE_LIMIT_MAX_BUCKETS', '100000')) # bucket dan cooldown maksimum di memori
+RATE_LIMIT_EVICT_BATCH = 8 # bucket/cooldown menganggur maksimum yang dibuang per perintah
+
+# --- DAFTAR ID ROLE YANG DIIZINKAN UNTUK MENGGUNAKAN !setadmin, !addcash, !removecash ---
+ALLOWED_SETADMIN_ROLES = [
+    1381168735112659015 # Ini adalah Role ID yang Anda berikan
+]
+# Role tambahan bisa diatur lewat ADMIN_ROLE_IDS (dipisah koma) atau tabel bot_admin_roles di database
+ALLOWED_SETADMIN_ROLES += [int(role_id) for role_id in os.getenv('ADMIN_ROLE_IDS', '').split(',') if role_id.strip()]
+if not ALLOWED_SETADMIN_ROLES:
+    print("PERINGATAN: ALLOWED_SETADMIN_ROLES kosong. Tidak ada role yang bisa menggunakan !setadmin, !addcash, !removecash.")
+
+# --- Definisi Intents Discord ---
+intents = discord.Intents.default()
+intents.message_content = True
+intents.reactions = True
+intents.members = True
+
+
+# Membuat instance bot
+client = discord.Client(intents=intents)
+
+# --- Shoe Blackjack (kelas permainan ada di games.py) ---
+blackjack_shoes = {} # {channel_id (atau None untuk shoe global): BlackjackShoe}
+
+def get_blackjack_shoe(channel_id: int) -> BlackjackShoe | None:
+    """Mengambil shoe untuk channel ini, atau None jika mode shoe tidak aktif (dek baru per game)."""
+    if BLACKJACK_SHOE_DECKS <= 0:
+        return None
+    key = None if BLACKJACK_SHOE_SCOPE == 'global' else channel_id
+    shoe = blackjack_shoes.get(key)
+    if shoe is None:
+        shoe = blackjack_shoes[key] = BlackjackShoe(BLACKJACK_SHOE_DECKS, BLACKJACK_SHOE_PENETRATION)
+    return shoe
+
+FLIPCOIN_HEAD_EMOJI = '🪙' # Koin
+FLIPCOIN_TAIL_EMOJI = '🔵' # Lingkaran Biru
+
+# State management untuk roulette
+current_roulette_rounds = {} # {channel_id: {"status": "betting", "round_id": str, "message_id": int, "bets": {user_id: [taruhan]}, "book": RouletteBook}}
+ROULETTE_RED_EMOJI = '🔴'
+ROULETTE_BLACK_EMOJI = '⚫' # Menggunakan emoji hitam untuk warna hitam
+
+# Semua emoji yang dipakai pesan game berbasis reaksi (reaksi lain tidak perlu dicari di penyimpanan state)
+GAME_REACTION_EMOJIS = frozenset(('✅', '🟥', FLIPCOIN_HEAD_EMOJI, FLIPCOIN_TAIL_EMOJI, ROULETTE_RED_EMOJI, ROULETTE_BLACK_EMOJI))
+
+# --- Backend Database ---
+# Helper database ditulis dengan SQL dialek MySQL dan antarmuka mysql.connector (conn.cursor(), %s,
+# conn.start_transaction(), Error). Backend SQLite membungkus sqlite3 agar helper yang sama berjalan
+# tanpa perubahan: placeholder dan sintaks khusus MySQL diterjemahkan sekali per statement, dan
+# error sqlite3 dibungkus menjadi SQLiteError (turunan Error) sehingga penanganan error tetap sama.
+
+def connect_mysql():
+    conn = mysql.connector.connect(
+        host=MYSQL_HOST,
+        user=MYSQL_USER,
+        password=MYSQL_PASSWORD,
+        database=MYSQL_DATABASE
+    )
+    # Autocommit agar koneksi yang dipakai ulang tidak menahan snapshot transaksi lama.
+    # Operasi multi-statement memakai conn.start_transaction() secara eksplisit.
+    conn.autocommit = True
+    return conn
+
+class SQLiteError(Error):
+    """Error sqlite3 yang dibungkus sebagai mysql.connector.Error."""
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode = WAL", # Pembaca tidak memblokir penulis (dan sebaliknya)
+    "PRAGMA synchronous = NORMAL", # Aman di mode WAL; fsync hanya saat checkpoint
+    "PRAGMA busy_timeout = 5000", # ms menunggu lock tulis sebelum gagal
+    "PRAGMA cache_size = -16000", # ~16 MB cache halaman per koneksi
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456", # 256 MB dibaca lewat memory-map
+    "PRAGMA foreign_keys = ON"
+)
+
+# Kolom DATETIME disimpan sebagai teks ISO dan dibaca kembali sebagai datetime, seperti di MySQL
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_converter("DATETIME", lambda value: datetime.fromisoformat(value.decode()))
+
+_MYSQL_UPSERT = re.compile(r"ON DUPLICATE KEY UPDATE (.+)$", re.S)
+_MYSQL_VALUES_REF = re.compile(r"VALUES\((\w+)\)")
+
+@lru_cache(maxsize=256)
+def translate_mysql_to_sqlite(sql: str) -> str:
+    """Menerjemahkan SQL dialek MySQL yang dipakai helper bot ke SQLite."""
+    sql = sql.replace("%s", "?").replace("INSERT IGNORE INTO", "INSERT OR IGNORE INTO")
+    return _MYSQL_UPSERT.sub(
+        lambda match: "ON CONFLICT DO UPDATE SET " + _MYSQL_VALUES_REF.sub(r"excluded.\1", match.group(1)),
+        sql
+    )
+
+def _sqlite_error(e: sqlite3.Error) -> SQLiteError:
+    errno = errorcode.ER_NO_SUCH_TABLE if str(e).startswith("no such table") else None
+    return SQLiteError(msg=str(e), errno=errno)
+
+class SQLiteCursor:
+    __slots__ = ('_cursor',)
+
+    def __init__(self, cursor: sqlite3.Cursor):
+        self._cursor = cursor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._cursor.close()
+
+    def execute(self, sql: str, params=()):
+        try:
+            self._cursor.execute(translate_mysql_to_sqlite(sql), params)
+        except sqlite3.Error as e:
+            raise _sqlite_error(e) from e
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+class SQLiteConnection:
+    """Koneksi sqlite3 dengan antarmuka mysql.connector yang dipakai DatabasePool dan helper database."""
+
+    def __init__(self, path: str):
+        try:
+            # Autocommit (isolation_level=None) seperti koneksi MySQL; transaksi dibuka lewat start_transaction().
+            # Satu koneksi hanya dipakai satu thread pada satu waktu (dijamin DatabasePool).
+            self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False,
+                                         detect_types=sqlite3.PARSE_DECLTYPES)
+            for pragma in SQLITE_PRAGMAS:
+                self._conn.execute(pragma)
+        except sqlite3.Error as e:
+            raise _sqlite_error(e) from e
+        self._open = True
+
+    def cursor(self) -> SQLiteCursor:
+        return SQLiteCursor(self._conn.cursor())
+
+    def _run(self, action, *args):
+        try:
+            return action(*args)
+        except sqlite3.Error as e:
+            raise _sqlite_error(e) from e
+
+    def start_transaction(self):
+        self._run(self._conn.execute, "BEGIN IMMEDIATE") # Ambil lock tulis di awal agar tidak gagal di tengah transaksi
+
+    def commit(self):
+        self._run(self._conn.commit)
+
+    def rollback(self):
+        self._run(self._conn.rollback)
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._conn.in_transaction
+
+    def is_connected(self) -> bool:
+        return self._open
+
+    def ping(self, reconnect: bool = False, attempts: int = 1, delay: int = 0):
+        pass # File lokal, tidak ada koneksi jaringan yang bisa putus
+
+    def close(self):
+        self._open = False
+        self._conn.close()
+
+def connect_sqlite():
+    return SQLiteConnection(SQLITE_PATH)
+
+# --- Pool Koneksi Database ---
+class DatabasePoolTimeout(Error):
+    """Dilempar jika tidak ada slot koneksi yang kosong dalam batas DB_POOL_ACQUIRE_TIMEOUT."""
+
+class DatabasePool:
+    """Pool koneksi database (MySQL atau SQLite) yang dijalankan di thread executor terbatas.
+
+    Query mysql.connector dan sqlite3 bersifat blocking, jadi setiap helper database menyerahkan
+    pekerjaannya ke executor lewat `run()` agar event loop discord.py tidak ikut macet.
+    Koneksi dipakai ulang, di-ping jika sudah lama menganggur, dan dibuang jika rusak.
+    """
+
+    def __init__(self, connect, min_size: int, max_size: int, acquire_timeout: float, health_check_interval: float):
+        self._connect = connect # Fungsi tanpa argumen yang membuka satu koneksi baru
+        self.max_size = max(1, max_size)
+        self.min_size = max(0, min(min_size, self.max_size))
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+        self._idle = deque() # [(koneksi, waktu_terakhir_dipakai)]
+        self._idle_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_size, thread_name_prefix="haniifbot-db")
+        self._slots = None # asyncio.Semaphore, dibuat saat pertama kali dipakai di dalam event loop
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Error:
+            pass
+
+    def _checkout(self):
+        while True:
+            with self._idle_lock:
+                if not self._idle:
+                    break
+                conn, last_used = self._idle.pop()
+            if time.monotonic() - last_used < self.health_check_interval:
+                return conn
+            try:
+                conn.ping(reconnect=True, attempts=1, delay=0)
+                return conn
+            except Error:
+                self._discard(conn)
+        try:
+            return self._connect()
+        except Error as e:
+            print(f"ERROR KONEKSI DATABASE: {e}")
+            raise
+
+    def _checkin(self, conn):
+        with self._idle_lock:
+            self._idle.append((conn, time.monotonic()))
+
+    def _call(self, fn, args):
+        conn = self._checkout()
+        healthy = True
+        try:
+            return fn(conn, *args)
+        except Exception:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+                healthy = conn.is_connected()
+            except Error:
+                healthy = False
+            raise
+        finally:
+            if healthy:
+                self._checkin(conn)
+            else:
+                self._discard(conn)
+
+    async def run(self, fn, *args):
+        """Menjalankan fn(conn, *args) di thread database dan mengembalikan hasilnya."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_size)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise DatabasePoolTimeout(msg=f"Tidak ada koneksi database yang tersedia dalam {self.acquire_timeout} detik.")
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self._call, fn, args)
+        finally:
+            self._slots.release()
+
+    async def start(self):
+        """Membuka koneksi awal sebanyak min_size supaya perintah pertama tidak menunggu handshake."""
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(self._executor, self._connect) for _ in range(self.min_size)),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"ERROR KONEKSI DATABASE: {result}")
+            else:
+                self._checkin(result)
+
+    def close(self):
+        with self._idle_lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for conn, _ in idle:
+            self._discard(conn)
+        self._executor.shutdown(wait=False)
+
+db_pool = DatabasePool(connect_sqlite if DB_BACKEND == 'sqlite' else connect_mysql, DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_ACQUIRE_TIMEOUT, DB_POOL_HEALTH_CHECK_INTERVAL)
+
+async def migrate_schema():
+    """Membuat atau memperbarui tabel dan indeks lewat migrasi berversi di schema.py, lalu memeriksanya."""
+    try:
+        applied = await db_pool.run(schema.migrate, DB_BACKEND)
+        problems = await db_pool.run(schema.verify, DB_BACKEND)
+    except Error as e:
+        print(f"ERROR MIGRASI SKEMA DATABASE: {e}")
+        return
+    for version, description in applied:
+        print(f"Migrasi skema {version} diterapkan: {description}")
+    for problem in problems:
+        print(f"WARNING: Skema database: {problem}")
+
+# --- Fungsi-fungsi untuk Interaksi Database MySQL ---
+
+def _select_user_cash(conn, user_id: int):
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT cash, last_daily_claim FROM users_cash WHERE user_id = %s", (user_id,))
+        result = cursor.fetchone()
+    if result:
+        return result[0], result[1]
+    return 0, None # Entri baru akan dibuat saat flush berikutnya
+
+def _select_many_user_cash(conn, user_ids: list[int]) -> dict:
+    placeholders = ", ".join(["%s"] * len(user_ids))
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT user_id, cash, last_daily_claim FROM users_cash WHERE user_id IN ({placeholders})", user_ids)
+        return {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+def _select_all_user_cash(conn) -> list[tuple[int, int]]:
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT user_id, cash FROM users_cash")
+        return cursor.fetchall()
+
+def _write_user_cash(conn, rows: list[tuple], ledger_rows: list[tuple]):
+    """Menulis banyak saldo dan baris buku besarnya sekaligus dengan INSERT multi-baris dalam satu transaksi."""
+    with conn.cursor() as cursor:
+        conn.start_transaction()
+        for i in range(0, len(rows), BALANCE_FLUSH_BATCH_SIZE):
+            chunk = rows[i:i + BALANCE_FLUSH_BATCH_SIZE]
+            placeholders = ", ".join(["(%s, %s, %s)"] * len(chunk))
+            params = [value for row in chunk for value in row]
+            cursor.execute(
+                f"INSERT INTO users_cash (user_id, cash, last_daily_claim) VALUES {placeholders} "
+                "ON DUPLICATE KEY UPDATE cash = VALUES(cash), last_daily_claim = VALUES(last_daily_claim)",
+                params
+            )
+        _insert_cash_ledger(cursor, ledger_rows)
+        conn.commit()
+
+def _insert_cash_ledger(cursor, ledger_rows: list[tuple]):
+    """Menulis baris buku besar (user_id, jumlah, saldo_setelahnya, alasan, ref, waktu) di transaksi pemanggil."""
+    try:
+        for i in range(0, len(ledger_rows), BALANCE_FLUSH_BATCH_SIZE):
+            chunk = ledger_rows[i:i + BALANCE_FLUSH_BATCH_SIZE]
+            placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(chunk))
+            params = [value for row in chunk for value in row]
+            cursor.execute(
+                f"INSERT INTO cash_ledger (user_id, amount, balance_after, reason, ref, created_at) VALUES {placeholders}",
+                params
+            )
+    except Error as e:
+        if e.errno != errorcode.ER_NO_SUCH_TABLE:
+            raise
+        # Saldo lebih penting dari riwayat: tetap simpan saldo walaupun tabel buku besar belum dibuat
+        print(f"WARNING: Tabel cash_ledger belum ada, {len(ledger_rows)} baris riwayat saldo tidak disimpan.")
+
+def _change_user_cash(conn, changes: list[tuple]) -> dict[int, int] | None:
+    """Menerapkan perubahan saldo (user_id, jumlah, alasan, ref) langsung di database dalam satu transaksi.
+
+    Dipakai jika beberapa proses bot berbagi database (BALANCE_WRITE_THROUGH): saldo diubah relatif
+    (cash = cash + jumlah) dan pengurangan hanya berhasil jika saldo di database cukup, jadi perubahan
+    proses lain tidak pernah tertimpa.
+    Mengembalikan {user_id: saldo_baru}, atau None tanpa perubahan apa pun jika saldo seseorang tidak cukup.
+    """
+    now = datetime.now()
+    balances = {}
+    ledger_rows = []
+    with conn.cursor() as cursor:
+        conn.start_transaction()
+        # Urut user_id agar dua proses yang mengubah pengguna yang sama mengunci barisnya dengan urutan sama (tanpa deadlock)
+        for user_id, amount, reason, ref in sorted(changes, key=lambda change: change[0]):
+            if amount < 0:
+                cursor.execute(
+                    "UPDATE users_cash SET cash = cash + %s WHERE user_id = %s AND cash >= %s",
+                    (amount, user_id, -amount)
+                )
+                if cursor.rowcount != 1:
+                    conn.rollback()
+                    return None
+            else:
+                cursor.execute(
+                    "INSERT INTO users_cash (user_id, cash) VALUES (%s, %s) ON DUPLICATE KEY UPDATE cash = cash + VALUES(cash)",
+                    (user_id, amount)
+                )
+            cursor.execute("SELECT cash FROM users_cash WHERE user_id = %s", (user_id,))
+            balances[user_id] = cursor.fetchone()[0]
+            ledger_rows.append((user_id, amount, balances[user_id], reason, None if ref is None else str(ref), now))
+        _insert_cash_ledger(cursor, ledger_rows)
+        conn.commit()
+    return balances
+
+def _claim_daily_user_cash(conn, user_id: int, amount: int, cooldown: timedelta) -> tuple[bool, int, datetime | None]:
+    """Klaim daily langsung di database: hanya berhasil jika klaim terakhir (oleh proses mana pun) sudah lewat cooldown."""
+    now = datetime.now()
+    with conn.cursor() as cursor:
+        conn.start_transaction()
+        cursor.execute("INSERT IGNORE INTO users_cash (user_id, cash) VALUES (%s, 0)", (user_id,))
+        cursor.execute(
+            "UPDATE users_cash SET cash = cash + %s, last_daily_claim = %s "
+            "WHERE user_id = %s AND (last_daily_claim IS NULL OR last_daily_claim <= %s)",
+            (amount, now, user_id, now - cooldown)
+        )
+        claimed = cursor.rowcount == 1
+        cursor.execute("SELECT cash, last_daily_claim FROM users_cash WHERE user_id = %s", (user_id,))
+        cash, last_daily_claim = cursor.fetchone()
+        if claimed:
+            _insert_cash_ledger(cursor, [(user_id, amount, cash, 'daily', None, now)])
+        conn.commit()
+    return claimed, cash, last_daily_claim
+
+GAME_STATE_COLUMNS = "message_id, kind, owner_id, channel_id, expires_at, state"
+
+def _write_game_state(conn, records: list[tuple], deleted_ids: list[int]):
+    """Menyimpan dan menghapus banyak state game sekaligus dalam satu transaksi."""
+    with conn.cursor() as cursor:
+        conn.start_transaction()
+        for i in range(0, len(records), BALANCE_FLUSH_BATCH_SIZE):
+            chunk = records[i:i + BALANCE_FLUSH_BATCH_SIZE]
+            placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(chunk))
+            params = [value for record in chunk for value in record]
+            cursor.execute(
+                f"INSERT INTO game_state ({GAME_STATE_COLUMNS}) VALUES {placeholders} "
+                "ON DUPLICATE KEY UPDATE kind = VALUES(kind), owner_id = VALUES(owner_id), channel_id = VALUES(channel_id), "
+                "expires_at = VALUES(expires_at), state = VALUES(state)",
+                params
+            )
+        for i in range(0, len(deleted_ids), BALANCE_FLUSH_BATCH_SIZE):
+            chunk = deleted_ids[i:i + BALANCE_FLUSH_BATCH_SIZE]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cursor.execute(f"DELETE FROM game_state WHERE message_id IN ({placeholders})", chunk)
+        conn.commit()
+
+def _select_game_state(conn, message_id: int) -> tuple | None:
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT {GAME_STATE_COLUMNS} FROM game_state WHERE message_id = %s", (message_id,))
+        return cursor.fetchone()
+
+def _find_game_state(conn, kind: str, column: str, value: int, now: float) -> tuple | None:
+    """Mencari state game yang belum kedaluwarsa berdasarkan channel_id atau owner_id."""
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {GAME_STATE_COLUMNS} FROM game_state WHERE kind = %s AND {column} = %s AND expires_at > %s "
+            "ORDER BY expires_at DESC LIMIT 1",
+            (kind, value, now)
+        )
+        return cursor.fetchone()
+
+def _take_expired_game_state(conn, before: float, limit: int) -> list[tuple]:
+    """Mengambil dan menghapus state yang kedaluwarsa sebelum `before`.
+
+    Setiap baris dihapus satu per satu dan hanya dikembalikan jika penghapusan ini yang berhasil,
+    sehingga dua proses yang mencari bersamaan tidak menyelesaikan game yang sama dua kali.
+    """
+    claimed = []
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {GAME_STATE_COLUMNS} FROM game_state WHERE expires_at <= %s ORDER BY expires_at LIMIT %s",
+            (before, limit)
+        )
+        for record in cursor.fetchall():
+            cursor.execute("DELETE FROM game_state WHERE message_id = %s AND expires_at = %s", (record[0], record[4]))
+            if cursor.rowcount == 1:
+                claimed.append(record)
+    return claimed
+
+# --- Papan Peringkat (urutan saldo di memori) ---
+class _SortedKeyList:
+    """Pengganti minimal sortedcontainers.SortedList berbasis bisect (sisip/hapus O(n), tetap cepat untuk list kecil)."""
+    __slots__ = ('_keys',)
+
+    def __init__(self):
+        self._keys = []
+
+    def add(self, key):
+        bisect.insort(self._keys, key)
+
+    def remove(self, key):
+        del self._keys[bisect.bisect_left(self._keys, key)]
+
+    def bisect_left(self, key) -> int:
+        return bisect.bisect_left(self._keys, key)
+
+    def __getitem__(self, index):
+        return self._keys[index]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+class Leaderboard:
+    """Semua saldo pengguna terurut di memori, untuk !top dan !rank tanpa query database.
+
+    Dimuat sekali saat startup, lalu diperbarui oleh BalanceCache setiap kali saldo berubah. Kunci
+    urutannya (-cash, user_id), jadi top-N adalah potongan awal list dan peringkat adalah posisi
+    hasil bisect (O(log n) dengan sortedcontainers).
+    """
+
+    def __init__(self):
+        self._cash = {} # {user_id: cash}
+        self._order = SortedList() if SortedList is not None else _SortedKeyList()
+        self.loaded = False
+
+    def update(self, user_id: int, cash: int):
+        old_cash = self._cash.get(user_id)
+        if old_cash == cash:
+            return
+        if old_cash is not None:
+            self._order.remove((-old_cash, user_id))
+        self._cash[user_id] = cash
+        self._order.add((-cash, user_id))
+
+    async def load(self) -> bool:
+        """Memuat semua saldo dari database. Pengguna yang saldonya sudah berubah sejak startup tidak ditimpa."""
+        try:
+            rows = await db_pool.run(_select_all_user_cash)
+        except Error as e:
+            print(f"ERROR MEMUAT PAPAN PERINGKAT: {e}")
+            return False
+        for user_id, cash in rows:
+            if user_id not in self._cash:
+                self.update(user_id, cash)
+        self.loaded = True
+        return True
+
+    def top(self, n: int) -> list[tuple[int, int]]:
+        """Mengembalikan [(user_id, cash)] untuk n pengguna dengan saldo terbesar."""
+        return [(user_id, -negative_cash) for negative_cash, user_id in self._order[:n]]
+
+    def rank(self, user_id: int) -> tuple[int, int] | None:
+        """Mengembalikan (peringkat, cash) pengguna; pengguna dengan saldo sama mendapat peringkat sama."""
+        cash = self._cash.get(user_id)
+        if cash is None:
+            return None
+        return self._order.bisect_left((-cash, 0)) + 1, cash
+
+    def __len__(self) -> int:
+        return len(self._cash)
+
+leaderboard = Leaderboard()
+
+class BalanceCache:
+    """Cache saldo `users_cash` di memori dengan eviksi LRU dan penulisan tertunda (write-behind).
+
+    Semua pembacaan dan perubahan saldo dilayani dari memori. Karena bot berjalan di satu event loop,
+    pengecekan dan perubahan saldo di sini tidak bisa disela perintah lain, jadi tidak ada saldo yang
+    saling menimpa. Entri yang berubah (dirty) ditulis ke database secara berkala dalam satu batch,
+    dan sekali lagi saat bot dimatikan. Catatan: bot harus menjadi satu-satunya penulis `users_cash`,
+    perubahan manual di database untuk pengguna yang sedang di-cache akan tertimpa. Karena itu cache ini
+    tidak dipakai jika BALANCE_WRITE_THROUGH aktif (beberapa proses berbagi database).
+    """
+
+    def __init__(self, max_size: int, flush_interval: float, on_change=None):
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self.on_change = on_change # on_change(user_id, cash) dipanggil setiap saldo berubah
+        self._entries = OrderedDict() # {user_id: [cash, last_daily_claim]}
+        self._dirty = set()
+        self._ledger = [] # Baris cash_ledger yang belum ditulis, ikut transaksi flush berikutnya
+        self._flushing = set() # user_id yang sedang ditulis, tidak boleh di-evict sebelum commit
+        self._loading = {} # {user_id: asyncio.Future} agar satu pengguna hanya dimuat sekali
+        self._flush_lock = None
+        self._flush_task = None
+
+    async def entry(self, user_id: int) -> list:
+        """Mengambil entri [cash, last_daily_claim] pengguna, memuatnya dari database jika belum ada."""
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            self._entries.move_to_end(user_id)
+            return entry
+
+        future = self._loading.get(user_id)
+        if future is None:
+            future = asyncio.ensure_future(db_pool.run(_select_user_cash, user_id))
+            self._loading[user_id] = future
+            future.add_done_callback(lambda _: self._loading.pop(user_id, None))
+        cash, last_daily_claim = await asyncio.shield(future)
+
+        # Pemanggil lain yang menunggu future yang sama mungkin sudah memasukkan (dan mengubah) entrinya
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self._evict(reserve=1) # Evict sebelum memasukkan supaya entri baru tidak langsung terbuang
+            entry = [cash, last_daily_claim]
+            self._entries[user_id] = entry
+        return entry
+
+    async def entries(self, *user_ids: int) -> list[list]:
+        """Seperti entry(), untuk beberapa pengguna sekaligus. Dijamin tidak ada yang ter-evict selama dimuat."""
+        while True:
+            result = [await self.entry(user_id) for user_id in user_ids]
+            if all(self._entries.get(user_id) is entry for user_id, entry in zip(user_ids, result)):
+                return result
+
+    def record(self, user_id: int, amount: int, reason: str, ref=None):
+        """Menandai saldo pengguna berubah sebesar amount dan mencatat perubahan itu di buku besar."""
+        self._ledger.append((user_id, amount, self._entries[user_id][0], reason, None if ref is None else str(ref), datetime.now()))
+        self.mark_dirty(user_id)
+
+    def mark_dirty(self, user_id: int):
+        self._dirty.add(user_id)
+        if self.on_change is not None:
+            self.on_change(user_id, self._entries[user_id][0])
+
+    def _evict(self, reserve: int = 0):
+        excess = len(self._entries) + reserve - self.max_size
+        if excess <= 0:
+            return
+        victims = []
+        for user_id in self._entries:
+            if excess <= 0:
+                break
+            if user_id in self._dirty or user_id in self._flushing:
+                continue
+            victims.append(user_id)
+            excess -= 1
+        for user_id in victims:
+            del self._entries[user_id]
+
+    async def prefetch(self, user_ids):
+        """Memuat semua pengguna yang belum ada di cache dengan satu query."""
+        missing = [user_id for user_id in set(user_ids) if user_id not in self._entries and user_id not in self._loading]
+        if not missing:
+            return
+        rows = await db_pool.run(_select_many_user_cash, missing)
+        for user_id in missing:
+            if user_id not in self._entries:
+                self._evict(reserve=1)
+                self._entries[user_id] = list(rows.get(user_id, (0, None)))
+
+    async def flush(self) -> bool:
+        """Menulis semua entri dirty ke database dalam satu transaksi. Mengembalikan False jika gagal."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._dirty and not self._ledger:
+                return True
+            user_ids = list(self._dirty)
+            rows = [(user_id, *self._entries[user_id]) for user_id in user_ids]
+            ledger_rows, self._ledger = self._ledger, []
+            self._dirty.clear()
+            self._flushing.update(user_ids)
+            try:
+                await db_pool.run(_write_user_cash, rows, ledger_rows)
+            except Error as e:
+                print(f"ERROR FLUSH SALDO ({len(rows)} pengguna): {e}")
+                self._dirty.update(user_ids) # Coba lagi di flush berikutnya
+                self._ledger[:0] = ledger_rows
+                return False
+            finally:
+                self._flushing.difference_update(user_ids)
+            self._evict()
+            return True
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self):
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+balance_cache = BalanceCache(BALANCE_CACHE_MAX_SIZE, BALANCE_FLUSH_INTERVAL, on_change=leaderboard.update)
+
+async def get_user_data(user_id: int) -> dict:
+    """Mengambil data pengguna (cash dan last_daily_claim) dari cache saldo, memuat dari database jika perlu."""
+    try:
+        if BALANCE_WRITE_THROUGH:
+            cash, last_daily_claim = await db_pool.run(_select_user_cash, user_id)
+        else:
+            cash, last_daily_claim = await balance_cache.entry(user_id)
+    except Error as e:
+        print(f"ERROR MENGAMBIL DATA PENGGUNA ({user_id}): {e}")
+        return {"cash": 0, "last_daily_claim": None}
+    return {"cash": cash, "last_daily_claim": last_daily_claim}
+
+# --- Kunci per Pengguna ---
+class UserLocks:
+    """Kunci asyncio bergaris (striped): setiap pengguna dipetakan ke salah satu dari `stripes` kunci.
+
+    Perintah, reaksi dan tombol yang mengubah saldo memegang kunci pengirimnya, sehingga alur satu pengguna
+    (cek game berjalan, debit, simpan state game, bayar) tidak saling menyela antar `await`, sementara pengguna
+    lain tetap berjalan paralel. Jumlah kunci tetap, jadi tidak ada dict per pengguna yang perlu dibersihkan;
+    dua pengguna yang kebetulan berbagi kunci hanya saling menunggu sebentar.
+    """
+    def __init__(self, stripes: int):
+        self._locks = [asyncio.Lock() for _ in range(max(1, stripes))]
+
+    def lock_for(self, user_id: int) -> asyncio.Lock:
+        return self._locks[user_id % len(self._locks)]
+
+    @asynccontextmanager
+    async def hold(self, *user_ids: int):
+        """Memegang kunci semua pengguna yang diberikan, diambil berurutan indeks agar tidak terjadi deadlock."""
+        indexes = sorted({user_id % len(self._locks) for user_id in user_ids})
+        acquired = []
+        try:
+            for index in indexes:
+                await self._locks[index].acquire()
+                acquired.append(self._locks[index])
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+
+user_locks = UserLocks(USER_LOCK_STRIPES)
+
+# --- Fungsi Dompet (Wallet) Atomik ---
+# Setiap perubahan saldo dicek dan diterapkan di cache saldo tanpa `await` di antaranya,
+# sehingga perintah yang bersamaan dari pengguna yang sama tidak saling menimpa saldo.
+# `reason` dan `ref` (misalnya ID putaran roulette atau ID admin) dicatat di buku besar `cash_ledger`.
+# Dengan BALANCE_WRITE_THROUGH perubahan yang sama diterapkan langsung di database lewat change_cash_shared.
+
+async def change_cash_shared(changes: list[tuple]) -> dict[int, int] | None:
+    """Menjalankan _change_user_cash dan memperbarui papan peringkat proses ini dengan saldo barunya."""
+    balances = await db_pool.run(_change_user_cash, changes)
+    for user_id, cash in (balances or {}).items():
+        leaderboard.update(user_id, cash)
+    return balances
+
+class PendingCredits:
+    """Kredit yang gagal ditulis dalam mode BALANCE_WRITE_THROUGH, dicoba ulang sampai berhasil.
+
+    Di mode cache, saldo yang gagal ditulis tetap ada di BalanceCache dan ikut flush berikutnya. Di mode
+    tulis langsung tidak ada cache, jadi setiap batch kredit (misalnya semua pembayaran satu putaran
+    roulette) disimpan utuh di sini dan dicoba lagi setiap retry_interval detik serta saat bot dimatikan.
+    Batch hanya berisi kredit, sehingga _change_user_cash tidak pernah menolaknya karena saldo kurang.
+    """
+
+    def __init__(self, retry_interval: float):
+        self.retry_interval = retry_interval
+        self._batches = deque() # [[(user_id, jumlah, alasan, ref)]]
+        self._flush_lock = None
+        self._flush_task = None
+
+    def add(self, changes: list[tuple]):
+        self._batches.append(changes)
+
+    async def flush(self) -> bool:
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            while self._batches:
+                try:
+                    await change_cash_shared(self._batches[0])
+                except Error as e:
+                    print(f"ERROR MENULIS ULANG KREDIT TERTUNDA ({len(self._batches)} batch): {e}")
+                    return False
+                self._batches.popleft()
+            return True
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.retry_interval)
+            await self.flush()
+
+    def start(self):
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if not await self.flush():
+            print(f"ERROR: {len(self._batches)} batch kredit tidak tersimpan saat bot berhenti: {list(self._batches)}")
+
+pending_credits = PendingCredits(BALANCE_FLUSH_INTERVAL)
+
+async def debit_if_sufficient(user_id: int, amount: int, reason: str, ref=None) -> tuple[bool, int] | None:
+    """Mengurangi uang pengguna hanya jika saldonya cukup.
+
+    Mengembalikan (berhasil, saldo): saldo baru jika berhasil, saldo saat ini jika uang tidak cukup.
+    Mengembalikan None jika terjadi kesalahan database.
+    """
+    try:
+        if BALANCE_WRITE_THROUGH:
+            balances = await change_cash_shared([(user_id, -amount, reason, ref)])
+            if balances is None:
+                return False, (await db_pool.run(_select_user_cash, user_id))[0]
+            return True, balances[user_id]
+        entry = await balance_cache.entry(user_id)
+    except Error as e:
+        print(f"ERROR DEBIT UANG PENGGUNA ({user_id}): {e}")
+        return None
+    if entry[0] < amount:
+        return False, entry[0]
+    entry[0] -= amount
+    balance_cache.record(user_id, -amount, reason, ref)
+    return True, entry[0]
+
+async def credit_cash(user_id: int, amount: int, reason: str, ref=None) -> int | None:
+    """Menambah uang pengguna (membuat entri baru jika belum ada). Mengembalikan saldo baru, atau None jika gagal."""
+    try:
+        if BALANCE_WRITE_THROUGH:
+            return (await change_cash_shared([(user_id, amount, reason, ref)]))[user_id]
+        entry = await balance_cache.entry(user_id)
+    except Error as e:
+        print(f"ERROR KREDIT UANG PENGGUNA ({user_id}): {e}")
+        return None
+    entry[0] += amount
+    balance_cache.record(user_id, amount, reason, ref)
+    return entry[0]
+
+async def transfer_cash(src_user_id: int, dst_user_id: int, amount: int) -> tuple[bool, int, int] | None:
+    """Memindahkan uang antar pengguna sekaligus.
+
+    Mengembalikan (berhasil, saldo_pengirim, saldo_penerima). Jika uang pengirim tidak cukup,
+    tidak ada yang berubah dan saldo yang dikembalikan adalah saldo saat ini.
+    Mengembalikan None jika terjadi kesalahan database.
+    """
+    try:
+        if BALANCE_WRITE_THROUGH:
+            balances = await change_cash_shared([(src_user_id, -amount, 'give', dst_user_id), (dst_user_id, amount, 'give', src_user_id)])
+            if balances is None:
+                src_cash = (await db_pool.run(_select_user_cash, src_user_id))[0]
+                dst_cash = (await db_pool.run(_select_user_cash, dst_user_id))[0]
+                return False, src_cash, dst_cash
+            return True, balances[src_user_id], balances[dst_user_id]
+        src_entry, dst_entry = await balance_cache.entries(src_user_id, dst_user_id)
+    except Error as e:
+        print(f"ERROR TRANSFER UANG ({src_user_id} -> {dst_user_id}): {e}")
+        return None
+    if src_entry[0] < amount:
+        return False, src_entry[0], dst_entry[0]
+    src_entry[0] -= amount
+    dst_entry[0] += amount
+    balance_cache.record(src_user_id, -amount, 'give', dst_user_id)
+    balance_cache.record(dst_user_id, amount, 'give', src_user_id)
+    return True, src_entry[0], dst_entry[0]
+
+async def claim_daily(user_id: int, amount: int, cooldown: timedelta) -> tuple[bool, int, datetime | None] | None:
+    """Memberi bonus harian hanya jika cooldown sudah lewat.
+
+    Mengembalikan (berhasil, saldo, waktu_klaim_terakhir). Jika masih cooldown, saldo dan
+    waktu klaim terakhir yang dikembalikan adalah nilai saat ini. None jika terjadi kesalahan database.
+    """
+    try:
+        if BALANCE_WRITE_THROUGH:
+            claimed, cash, last_daily_claim = await db_pool.run(_claim_daily_user_cash, user_id, amount, cooldown)
+            if claimed:
+                leaderboard.update(user_id, cash)
+            return claimed, cash, last_daily_claim
+        entry = await balance_cache.entry(user_id)
+    except Error as e:
+        print(f"ERROR KLAIM DAILY ({user_id}): {e}")
+        return None
+    now = datetime.now()
+    if entry[1] is not None and now - entry[1] < cooldown:
+        return False, entry[0], entry[1]
+    entry[0] += amount
+    entry[1] = now
+    balance_cache.record(user_id, amount, 'daily')
+    return True, entry[0], entry[1]
+
+# --- Fungsi untuk Manajemen Admin Bot ---
+class PermissionService:
+    """Daftar admin penambah cash (`bot_admins`) dan role admin yang disimpan di memori.
+
+    Keduanya dimuat sekali saat startup, lalu dijaga tetap sinkron oleh add_admin_cash_adder dan
+    remove_admin_cash_adder, sehingga pengecekan izin di setiap perintah tidak menyentuh database.
+    Role admin adalah gabungan ALLOWED_SETADMIN_ROLES dan tabel opsional `bot_admin_roles`.
+    Jika beberapa proses berbagi database, start() memuat ulang keduanya setiap reload_interval detik
+    dan shared=True membuat is_admin_cash_adder selalu membaca database.
+    """
+
+    def __init__(self, config_role_ids: list[int], reload_interval: float):
+        self._config_role_ids = frozenset(config_role_ids)
+        self.admin_role_ids = self._config_role_ids
+        self.cash_admins = set()
+        self.loaded = False
+        self.shared = False
+        self.reload_interval = reload_interval
+        self._reload_task = None
+
+    async def load(self) -> bool:
+        """Memuat ulang admin dan role admin dari database. Mengembalikan False jika gagal."""
+        def query(conn):
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT user_id FROM bot_admins")
+                admins = {row[0] for row in cursor.fetchall()}
+                try:
+                    cursor.execute("SELECT role_id FROM bot_admin_roles")
+                    role_ids = {row[0] for row in cursor.fetchall()}
+                except Error as e:
+                    if e.errno != errorcode.ER_NO_SUCH_TABLE:
+                        raise
+                    role_ids = set() # Tabel opsional, cukup pakai role dari konfigurasi
+            return admins, role_ids
+
+        try:
+            admins, role_ids = await db_pool.run(query)
+        except Error as e:
+            print(f"ERROR MEMUAT DAFTAR ADMIN: {e}")
+            return False
+        self.cash_admins = admins
+        self.admin_role_ids = self._config_role_ids | role_ids
+        self.loaded = True
+        return True
+
+    def is_cash_admin(self, user_id: int) -> bool:
+        return user_id in self.cash_admins
+
+    def has_admin_role(self, member: discord.Member) -> bool:
+        return has_required_role(member, self.admin_role_ids)
+
+    async def _reload_loop(self):
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            await self.load()
+
+    def start(self):
+        """Dipanggil jika proses lain bisa mengubah daftar admin di database yang sama."""
+        self.shared = True
+        if self._reload_task is None:
+            self._reload_task = asyncio.create_task(self._reload_loop())
+
+    def close(self):
+        if self._reload_task is not None:
+            self._reload_task.cancel()
+            self._reload_task = None
+
+permissions = PermissionService(ALLOWED_SETADMIN_ROLES, PERMISSIONS_RELOAD_INTERVAL)
+
+async def is_admin_cash_adder(user_id: int) -> bool:
+    """Memeriksa apakah user_id adalah admin penambah cash (dari memori, dimuat dari database saat startup).
+
+    Jika database dipakai bersama proses lain, daftar dimuat ulang dulu agar pencabutan langsung berlaku.
+    """
+    if (permissions.shared or not permissions.loaded) and not await permissions.load():
+        return False
+    return permissions.is_cash_admin(user_id)
+
+async def add_admin_cash_adder(user_id: int) -> bool:
+    def query(conn):
+        with conn.cursor() as cursor:
+            cursor.execute("INSERT IGNORE INTO bot_admins (user_id) VALUES (%s)", (user_id,))
+            conn.commit()
+            return cursor.rowcount > 0
+
+    try:
+        added = await db_pool.run(query)
+    except Error as e:
+        print(f"ERROR TAMBAH ADMIN ({user_id}): {e}")
+        return False
+    permissions.cash_admins.add(user_id)
+    return added
+
+async def remove_admin_cash_adder(user_id: int) -> bool:
+    def query(conn):
+        with conn.cursor() as cursor:
+            cursor.execute("DELETE FROM bot_admins WHERE user_id = %s", (user_id,))
+            conn.commit()
+            return cursor.rowcount > 0
+
+    try:
+        removed = await db_pool.run(query)
+    except Error as e:
+        print(f"ERROR HAPUS ADMIN ({user_id}): {e}")
+        return False
+    permissions.cash_admins.discard(user_id)
+    return removed
+
+# --- Fungsi untuk Roulette ---
+async def settle_roulette_round(round_id: str, winnings: dict[int, int], reason: str = 'roulette_payout') -> dict[int, int]:
+    """Mengkreditkan semua kemenangan satu putaran lalu langsung menyimpannya.
+
+    Saldo semua pemenang ditulis dalam satu transaksi (upsert multi-baris). Taruhan putaran hanya ada di
+    state putaran (dan tabel game_state jika dipakai), jadi tidak ada baris taruhan yang perlu dihapus.
+    Mengembalikan {user_id: saldo_baru} untuk pemenang yang berhasil dikreditkan.
+    """
+    if BALANCE_WRITE_THROUGH:
+        changes = [(user_id, amount, reason, round_id) for user_id, amount in winnings.items()]
+        try:
+            return await change_cash_shared(changes)
+        except Error as e:
+            # Putaran sudah ditutup, jadi pembayarannya disimpan dan ditulis ulang oleh pending_credits
+            print(f"ERROR PENYELESAIAN PUTARAN ROULETTE {round_id} ({len(winnings)} pemenang), akan dicoba lagi: {e}")
+            pending_credits.add(changes)
+            return {}
+
+    try:
+        await balance_cache.prefetch(winnings)
+    except Error as e:
+        print(f"ERROR MEMUAT SALDO PEMENANG ROULETTE: {e}")
+
+    new_balances = {}
+    for user_id, amount in winnings.items():
+        new_cash = await credit_cash(user_id, amount, reason, round_id)
+        if new_cash is not None:
+            new_balances[user_id] = new_cash
+
+    if not await balance_cache.flush():
+        # Saldo tetap tersimpan di cache dan akan ditulis ulang pada flush berikutnya
+        print(f"WARNING: Penyelesaian putaran roulette {round_id} belum tersimpan ke database.")
+    return new_balances
+
+def split_message(header: str, lines: list[str], limit: int = 2000) -> list[str]:
+    """Menggabungkan baris-baris menjadi sesedikit mungkin pesan yang masing-masing tidak melebihi batas Discord."""
+    messages = []
+    current = header
+    for line in lines:
+        if current and len(current) + 1 + len(line) > limit:
+            messages.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        messages.append(current)
+    return messages
+
+# --- Antrean Pesan Keluar per Channel ---
+class ChannelOutbox:
+    """Menggabungkan pesan pendek (misalnya konfirmasi taruhan) menjadi sesedikit mungkin pesan Discord.
+
+    Baris yang di-post ke satu channel dikumpulkan selama `window` detik, lalu dikirim berurutan
+    dengan split_message (maksimal 2000 karakter per pesan). Satu task per channel menjaga urutan.
+    Selama pengiriman tertahan rate limit, baris baru terus menumpuk dan ikut batch berikutnya, jadi
+    jumlah pesan tetap kecil berapa pun banyaknya taruhan. Kegagalan sementara (429/5xx) diulang
+    dengan backoff eksponensial.
+    """
+
+    def __init__(self, window: float, max_retries: int, max_backoff: float):
+        self.window = window
+        self.max_retries = max_retries
+        self.max_backoff = max_backoff
+        self._pending = {} # {channel_id: [baris]}
+        self._channels = {} # {channel_id: channel}
+        self._tasks = {} # {channel_id: asyncio.Task}
+        self._wake = {} # {channel_id: asyncio.Event}, di-set oleh flush() agar tidak menunggu jendela
+
+    def post(self, channel, line: str):
+        """Menjadwalkan satu baris untuk dikirim ke channel (tanpa menunggu)."""
+        self._pending.setdefault(channel.id, []).append(line)
+        self._channels[channel.id] = channel
+        if channel.id not in self._tasks:
+            self._wake[channel.id] = asyncio.Event()
+            self._tasks[channel.id] = asyncio.create_task(self._drain(channel.id))
+
+    async def flush(self, channel):
+        """Mengirim semua baris yang masih antre untuk channel ini sekarang dan menunggu sampai selesai."""
+        task = self._tasks.get(channel.id)
+        if task is not None:
+            self._wake[channel.id].set()
+            await asyncio.shield(task)
+
+    async def _drain(self, channel_id: int):
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._wake[channel_id].wait(), timeout=self.window)
+                except asyncio.TimeoutError:
+                    pass
+                lines = self._pending.pop(channel_id, None)
+                if not lines:
+                    break
+                for text in split_message("", lines):
+                    await self._send(self._channels[channel_id], text)
+        finally:
+            del self._tasks[channel_id]
+            del self._wake[channel_id]
+            self._channels.pop(channel_id, None)
+
+    async def _send(self, channel, text: str):
+        for attempt in range(self.max_retries + 1):
+            try:
+                await channel.send(text)
+                return
+            except (discord.Forbidden, discord.NotFound) as e:
+                print(f"ERROR KIRIM PESAN ({channel.id}): {e}")
+                return
+            except discord.HTTPException as e:
+                if (e.status != 429 and e.status < 500) or attempt == self.max_retries:
+                    print(f"ERROR KIRIM PESAN ({channel.id}): {e}")
+                    return
+                await asyncio.sleep(min(self.max_backoff, 2 ** attempt))
+
+channel_outbox = ChannelOutbox(OUTBOX_FLUSH_WINDOW, OUTBOX_MAX_RETRIES, OUTBOX_MAX_BACKOFF)
+
+# --- Resolver Nama Pengguna ---
+class UserResolver:
+    """Mencari objek pengguna (untuk display_name/name) dengan panggilan REST sesedikit mungkin.
+
+    Urutan pencarian: cache member guild, cache user milik client, lalu LRU dengan TTL berisi hasil
+    fetch_user sebelumnya. Hanya jika semuanya meleset barulah client.fetch_user dipanggil, dan
+    permintaan yang sedang berjalan untuk user yang sama ditunggui bersama, bukan diulang.
+    """
+
+    def __init__(self, client: discord.Client, max_size: int, ttl: float):
+        self.client = client
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict() # {user_id: (user, waktu_kedaluwarsa)}, urut dari yang paling lama dipakai
+        self._inflight = {} # {user_id: asyncio.Task} untuk fetch_user yang sedang berjalan
+
+    def get_cached(self, guild: discord.Guild | None, user_id: int):
+        """Mengembalikan pengguna dari cache tanpa REST, atau None jika tidak ada."""
+        member = guild.get_member(user_id) if guild is not None else None
+        if member is not None:
+            return member
+        user = self.client.get_user(user_id)
+        if user is not None:
+            return user
+        cached = self._entries.get(user_id)
+        if cached is None:
+            return None
+        if cached[1] <= time.monotonic():
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return cached[0]
+
+    async def resolve(self, guild: discord.Guild | None, user_id: int):
+        """Mengembalikan pengguna untuk user_id, atau None jika Discord tidak mengenalnya."""
+        user = self.get_cached(guild, user_id)
+        if user is not None:
+            return user
+        task = self._inflight.get(user_id)
+        if task is None:
+            task = asyncio.create_task(self._fetch(user_id))
+            self._inflight[user_id] = task
+        return await asyncio.shield(task)
+
+    async def resolve_many(self, guild: discord.Guild | None, user_ids) -> dict:
+        """Mencari banyak pengguna sekaligus; setiap id hanya dicari sekali. Mengembalikan {user_id: pengguna atau None}."""
+        users = {}
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            users[user_id] = self.get_cached(guild, user_id)
+            if users[user_id] is None:
+                missing.append(user_id)
+        if missing:
+            fetched = await asyncio.gather(*(self.resolve(guild, user_id) for user_id in missing))
+            users.update(zip(missing, fetched))
+        return users
+
+    async def _fetch(self, user_id: int):
+        try:
+            user = await self.client.fetch_user(user_id)
+        except discord.NotFound:
+            return None
+        except discord.HTTPException as e:
+            print(f"ERROR FETCH USER ({user_id}): {e}")
+            return None
+        finally:
+            del self._inflight[user_id]
+        self._entries[user_id] = (user, time.monotonic() + self.ttl)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return user
+
+user_resolver = UserResolver(client, USER_CACHE_MAX_SIZE, USER_CACHE_TTL)
+
+# --- Penyimpanan State Game ---
+# State game di-serialize menjadi JSON ringkas (list tanpa nama field dan tanpa spasi). Kartu disimpan sebagai
+# indeks 0-51 dan taruhan roulette sebagai [user_id, jumlah, kode_taruhan, via_emoji].
+
+def encode_game_state(kind: str, state) -> str:
+    if kind == 'roulette':
+        bets = [
+            [user_id, bet["amount"], roulette_bet_code(bet["bet_type"], bet["bet_choice"]), int(bet.get("via_emoji", False))]
+            for user_id, user_bets in state["bets"].items() for bet in user_bets
+        ]
+        data = [state["round_id"], state["status"], bets]
+    else:
+        data = state.to_state()
+    return json.dumps(data, separators=(',', ':'))
+
+def decode_game_state(kind: str, data: str, message_id: int, channel_id: int):
+    state = json.loads(data)
+    if kind == 'blackjack':
+        return BlackjackGame.from_state(state, get_blackjack_shoe(channel_id))
+    if kind == 'flipcoin':
+        return FlipCoinGame.from_state(state)
+    round_id, status, bets = state
+    roulette_round = {"status": status, "round_id": round_id, "message_id": message_id, "bets": {},
+                      "book": RouletteBook(ROULETTE_MAX_NUMBER_EXPOSURE, ROULETTE_MAX_ROUND_EXPOSURE)}
+    for user_id, amount, code, via_emoji in bets:
+        bet_type, bet_choice = ROULETTE_BET_OPTIONS[code]
+        bet = {"amount": amount, "bet_type": bet_type, "bet_choice": bet_choice}
+        if via_emoji:
+            bet["via_emoji"] = True
+        roulette_round["bets"].setdefault(user_id, []).append(bet)
+        roulette_round["book"].record(user_id, code, amount) # Taruhan sudah diterima, batas meja tidak dicek ulang
+    return roulette_round
+
+class GameStateStore:
+    """Antarmuka penyimpanan state game yang menunggu pemain, di luar registri pesan interaktif.
+
+    Satu record adalah (message_id, kind, owner_id, channel_id, expires_at, state) dengan expires_at berupa
+    waktu Unix dan state hasil encode_game_state(). save() dan discard() dipanggil registri tanpa await:
+    perubahan dikumpulkan (perubahan terakhir per pesan yang dipakai) lalu ditulis dalam satu batch setiap
+    flush_interval detik. Subclass hanya mengimplementasikan operasi _write/_load/_find/_take_expired.
+    """
+    shared = False # True jika proses lain bisa membaca state yang sama
+
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self._pending = {} # {message_id: record, atau None jika dihapus}
+        self._flush_lock = None
+        self._flush_task = None
+
+    def save(self, record: tuple):
+        self._pending[record[0]] = record
+
+    def discard(self, message_id: int):
+        self._pending[message_id] = None
+
+    async def load(self, message_id: int) -> tuple | None:
+        if message_id in self._pending:
+            return self._pending[message_id]
+        return await self._load(message_id)
+
+    async def find(self, kind: str, column: str, value: int) -> tuple | None:
+        """Mencari game yang belum kedaluwarsa berdasarkan 'channel_id' atau 'owner_id'."""
+        record = await self._find(kind, column, value, time.time())
+        if record is not None and record[0] in self._pending:
+            return self._pending[record[0]] # Perubahan proses ini yang belum ditulis lebih baru
+        return record
+
+    async def take_expired(self, before: float, limit: int = 100) -> list[tuple]:
+        await self.flush()
+        return await self._take_expired(before, limit)
+
+    async def flush(self) -> bool:
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._pending:
+                return True
+            batch, self._pending = self._pending, {}
+            records = [record for record in batch.values() if record is not None]
+            deleted_ids = [message_id for message_id, record in batch.items() if record is None]
+            try:
+                await self._write(records, deleted_ids)
+            except Error as e:
+                print(f"ERROR MENYIMPAN STATE GAME ({len(batch)} pesan): {e}")
+                for message_id, record in batch.items():
+                    self._pending.setdefault(message_id, record) # Perubahan yang lebih baru tetap menang
+                return False
+            return True
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self):
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+class MemoryStateStore(GameStateStore):
+    """State yang sudah di-serialize disimpan di dict proses ini (satu proses, misalnya untuk pengujian)."""
+
+    def __init__(self, flush_interval: float):
+        super().__init__(flush_interval)
+        self._records = {}
+
+    async def _write(self, records: list[tuple], deleted_ids: list[int]):
+        for record in records:
+            self._records[record[0]] = record
+        for message_id in deleted_ids:
+            self._records.pop(message_id, None)
+
+    async def _load(self, message_id: int) -> tuple | None:
+        return self._records.get(message_id)
+
+    async def _find(self, kind: str, column: str, value: int, now: float) -> tuple | None:
+        index = 2 if column == 'owner_id' else 3
+        matches = [record for record in self._records.values() if record[1] == kind and record[index] == value and record[4] > now]
+        return max(matches, key=lambda record: record[4], default=None)
+
+    async def _take_expired(self, before: float, limit: int) -> list[tuple]:
+        expired = sorted((record for record in self._records.values() if record[4] <= before), key=lambda record: record[4])[:limit]
+        for record in expired:
+            del self._records[record[0]]
+        return expired
+
+class DatabaseStateStore(GameStateStore):
+    """State di tabel `game_state` lewat pool database, dibaca bersama oleh semua proses bot.
+
+    Dengan MySQL tabel ini bisa dipakai proses di host lain; dengan SQLite cukup untuk beberapa
+    proses di host yang sama yang memakai file SQLITE_PATH yang sama.
+    """
+    shared = True
+
+    async def _write(self, records: list[tuple], deleted_ids: list[int]):
+        await db_pool.run(_write_game_state, records, deleted_ids)
+
+    async def _load(self, message_id: int) -> tuple | None:
+        return await db_pool.run(_select_game_state, message_id)
+
+    async def _find(self, kind: str, column: str, value: int, now: float) -> tuple | None:
+        return await db_pool.run(_find_game_state, kind, column, value, now)
+
+    async def _take_expired(self, before: float, limit: int) -> list[tuple]:
+        return await db_pool.run(_take_expired_game_state, before, limit)
+
+if GAME_STATE_STORE == 'database':
+    game_state_store = DatabaseStateStore(GAME_STATE_FLUSH_INTERVAL)
+elif GAME_STATE_STORE == 'memory':
+    game_state_store = MemoryStateStore(GAME_STATE_FLUSH_INTERVAL)
+else:
+    game_state_store = None
+
+# --- Registri Pesan Interaktif (game yang menunggu reaksi) ---
+class InteractiveEntry:
+    """Satu pesan yang menunggu reaksi: game Blackjack/Flip Coin yang berjalan atau putaran roulette."""
+    __slots__ = ('message_id', 'kind', 'owner_id', 'channel_id', 'state', 'view', 'expires_tick')
+
+    def __init__(self, message_id: int, kind: str, owner_id: int | None, channel_id: int, state):
+        self.message_id = message_id
+        self.kind = kind # 'blackjack', 'flipcoin' atau 'roulette'
+        self.owner_id = owner_id # None jika siapa saja boleh bereaksi (roulette)
+        self.channel_id = channel_id
+        self.state = state # Objek game atau dict putaran roulette
+        self.view = None # GameView jika game dimainkan dengan tombol
+        self.expires_tick = 0
+
+class InteractiveRegistry:
+    """Registri {message_id: InteractiveEntry} untuk semua pesan game yang menunggu reaksi.
+
+    on_reaction_add cukup satu lookup di sini lalu memanggil handler sesuai jenis game. Batas waktu
+    setiap entri dijadwalkan di timer wheel (satu slot per tick), jadi reaper hanya memeriksa slot yang
+    jatuh tempo, bukan seluruh registri. Entri yang kedaluwarsa, atau entri tertua saat registri
+    melewati max_entries, diselesaikan oleh handler kedaluwarsa (refund atau hangus) sehingga game
+    yang ditinggalkan tidak menumpuk di memori dan taruhannya tidak hilang begitu saja.
+
+    Jika ada GameStateStore, setiap entri yang didaftarkan atau diubah juga disimpan di sana, dan game
+    yang tidak ada di proses ini (dibuat proses lain atau sebelum restart) dipulihkan lewat restore().
+    """
+
+    def __init__(self, max_entries: int, timeouts: dict[str, float], tick: float = 1.0, wheel_size: int = 512,
+                 store: GameStateStore | None = None):
+        self.max_entries = max(1, max_entries)
+        self.timeouts = timeouts # {kind: detik sampai kedaluwarsa}
+        self.tick = tick
+        self.store = store
+        self._restoring = {} # {kunci: asyncio.Future} agar satu game hanya dipulihkan sekali
+        self._next_orphan_check = 0.0
+        self._entries = OrderedDict() # Urut dari yang paling lama didaftarkan
+        self._by_owner = {} # {(kind, owner_id): entry}
+        self._wheel = [set() for _ in range(wheel_size)] # slot -> {message_id}
+        self._last_tick = self._now_tick()
+        self._expired = deque() # Entri yang sudah dikeluarkan dan menunggu diselesaikan reaper
+        self._reap_task = None
+        self._reaping = None # Satu putaran reaper yang sedang berjalan, ditunggu close() sampai selesai
+
+    def _now_tick(self) -> int:
+        return int(time.monotonic() / self.tick)
+
+    def add(self, entry: InteractiveEntry):
+        """Mendaftarkan entri dengan batas waktu baru sesuai jenisnya (juga dipakai saat game pindah ke pesan baru)."""
+        if entry.message_id in self._entries:
+            self.pop(entry.message_id) # Dijadwalkan ulang: keluarkan dulu dari slot wheel yang lama
+        entry.expires_tick = self._now_tick() + int(self.timeouts.get(entry.kind, 0) / self.tick) + 1
+        self._entries[entry.message_id] = entry
+        self._wheel[entry.expires_tick % len(self._wheel)].add(entry.message_id)
+        if entry.owner_id is not None:
+            self._by_owner[(entry.kind, entry.owner_id)] = entry
+        if self.store is not None:
+            self.store.save(self._record(entry))
+        while len(self._entries) > self.max_entries:
+            oldest = self.pop(next(iter(self._entries)))
+            print(f"WARNING: Registri pesan interaktif penuh, {oldest.kind} {oldest.message_id} diselesaikan lebih awal.")
+            self._expired.append(oldest)
+
+    def _record(self, entry: InteractiveEntry) -> tuple:
+        expires_at = time.time() + (entry.expires_tick - self._now_tick()) * self.tick
+        return (entry.message_id, entry.kind, entry.owner_id, entry.channel_id, expires_at, encode_game_state(entry.kind, entry.state))
+
+    def save(self, message_id: int):
+        """Menyimpan ulang state entri yang diubah di tempat (misalnya taruhan roulette baru) tanpa memperpanjang batas waktunya."""
+        entry = self._entries.get(message_id)
+        if self.store is not None and entry is not None:
+            self.store.save(self._record(entry))
+
+    def get(self, message_id: int) -> InteractiveEntry | None:
+        return self._entries.get(message_id)
+
+    async def restore(self, message_id: int) -> InteractiveEntry | None:
+        """Seperti get(), tetapi memulihkan game dari penyimpanan state jika proses ini belum memilikinya."""
+        entry = self._entries.get(message_id)
+        if entry is not None or self.store is None:
+            return entry
+        return await self._restore(message_id, self.store.load, message_id)
+
+    async def restore_by_channel(self, kind: str, channel_id: int) -> InteractiveEntry | None:
+        """Memulihkan game yang berjalan di sebuah channel (putaran roulette) dari penyimpanan state."""
+        if self.store is None:
+            return None
+        return await self._restore((kind, channel_id), self.store.find, kind, 'channel_id', channel_id)
+
+    async def _restore(self, key, loader, *args) -> InteractiveEntry | None:
+        future = self._restoring.get(key)
+        if future is None:
+            future = asyncio.ensure_future(loader(*args))
+            self._restoring[key] = future
+            future.add_done_callback(lambda _: self._restoring.pop(key, None))
+        try:
+            record = await asyncio.shield(future)
+        except Error as e:
+            print(f"ERROR MEMULIHKAN STATE GAME ({key}): {e}")
+            return None
+        if record is None:
+            return None
+        message_id, kind, owner_id, channel_id, expires_at, data = record
+        # Pemanggil lain yang menunggu future yang sama mungkin sudah mendaftarkannya
+        entry = self._entries.get(message_id)
+        if entry is None:
+            if expires_at <= time.time():
+                return None # Diselesaikan pencarian game tanpa pemilik (_reap_orphans)
+            entry = InteractiveEntry(message_id, kind, owner_id, channel_id, decode_game_state(kind, data, message_id, channel_id))
+            self.add(entry)
+        return entry
+
+    async def has_game(self, kind: str, owner_id: int) -> bool:
+        """Apakah pemain sedang memainkan game jenis ini, di proses ini atau (jika penyimpanan bersama) proses lain."""
+        if (kind, owner_id) in self._by_owner:
+            return True
+        if self.store is None or not self.store.shared:
+            return False
+        try:
+            return await self.store.find(kind, 'owner_id', owner_id) is not None
+        except Error as e:
+            print(f"ERROR MENCARI STATE GAME ({kind} {owner_id}): {e}")
+            return False
+
+    def find(self, kind: str, owner_id: int) -> InteractiveEntry | None:
+        """Mencari game yang sedang berjalan milik seorang pemain."""
+        return self._by_owner.get((kind, owner_id))
+
+    def pop(self, message_id: int) -> InteractiveEntry | None:
+        """Mengeluarkan entri. Handler memanggil ini sebelum await pertama agar reaksi ganda tidak diproses dua kali."""
+        entry = self._entries.pop(message_id, None)
+        if entry is None:
+            return None
+        self._wheel[entry.expires_tick % len(self._wheel)].discard(message_id)
+        if entry.owner_id is not None and self._by_owner.get((entry.kind, entry.owner_id)) is entry:
+            del self._by_owner[(entry.kind, entry.owner_id)]
+        if self.store is not None:
+            self.store.discard(message_id)
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _advance(self):
+        now_tick = self._now_tick()
+        # Jika reaper tertinggal lebih dari satu putaran wheel, cukup periksa setiap slot sekali
+        for tick in range(max(self._last_tick + 1, now_tick - len(self._wheel) + 1), now_tick + 1):
+            slot = self._wheel[tick % len(self._wheel)]
+            due = [message_id for message_id in slot if self._entries[message_id].expires_tick <= tick]
+            for message_id in due:
+                self._expired.append(self.pop(message_id))
+        self._last_tick = max(self._last_tick, now_tick)
+
+    async def _expire(self, entry: InteractiveEntry, notify: bool):
+        if entry.view is not None:
+            entry.view.stop()
+            if notify and entry.view.message is not None:
+                try:
+                    await entry.view.message.edit(view=None) # Hilangkan tombol yang sudah tidak berlaku
+                except discord.HTTPException:
+                    pass
+        handler = EXPIRY_HANDLERS.get(entry.kind)
+        if handler is None:
+            return
+        try:
+            notice = await handler(entry)
+        except Exception as e:
+            print(f"ERROR MENYELESAIKAN GAME KEDALUWARSA ({entry.kind} {entry.message_id}): {e}")
+            return
+        if notice and notify:
+            channel = client.get_channel(entry.channel_id)
+            if channel is not None:
+                try:
+                    await channel.send(notice)
+                except discord.HTTPException:
+                    pass
+
+    async def _reap_orphans(self):
+        """Menyelesaikan game di penyimpanan state yang sudah lama kedaluwarsa tanpa ada proses yang menanganinya."""
+        try:
+            records = await self.store.take_expired(time.time() - GAME_STATE_ORPHAN_GRACE)
+        except Error as e:
+            print(f"ERROR MENCARI STATE GAME KEDALUWARSA: {e}")
+            return
+        for message_id, kind, owner_id, channel_id, _, data in records:
+            if message_id in self._entries:
+                continue # Masih berjalan di proses ini
+            entry = InteractiveEntry(message_id, kind, owner_id, channel_id, decode_game_state(kind, data, message_id, channel_id))
+            await self._expire(entry, notify=True)
+
+    async def _reap_once(self):
+        self._advance()
+        while self._expired:
+            await self._expire(self._expired.popleft(), notify=True)
+        if self.store is not None and time.monotonic() >= self._next_orphan_check:
+            self._next_orphan_check = time.monotonic() + GAME_STATE_ORPHAN_CHECK_INTERVAL
+            await self._reap_orphans()
+
+    async def _reap_loop(self):
+        while True:
+            await asyncio.sleep(self.tick)
+            # Di-shield: game yang sudah dikeluarkan (dan state-nya dihapus) tidak boleh berhenti setengah
+            # diselesaikan saat reaper dibatalkan close(); close() menunggu putaran ini selesai
+            self._reaping = asyncio.ensure_future(self._reap_once())
+            await asyncio.shield(self._reaping)
+
+    def start(self):
+        if self.store is not None:
+            self.store.start()
+        if self._reap_task is None:
+            self._reap_task = asyncio.create_task(self._reap_loop())
+
+    async def close(self):
+        """Menyelesaikan semua game yang masih berjalan sesuai aturan kedaluwarsa (tanpa pesan) sebelum bot mati.
+
+        Dengan penyimpanan state bersama, game dibiarkan tersimpan agar bisa dilanjutkan setelah restart
+        atau oleh proses lain.
+        """
+        if self._reap_task is not None:
+            self._reap_task.cancel()
+            self._reap_task = None
+        if self._reaping is not None:
+            await self._reaping
+            self._reaping = None
+        if self.store is None or not self.store.shared:
+            for message_id in list(self._entries):
+                self._expired.append(self.pop(message_id))
+        # Entri yang sudah dikeluarkan (batas jumlah entri atau kedaluwarsa) state-nya sudah dihapus dari
+        # penyimpanan, jadi tetap diselesaikan di sini walaupun penyimpanannya bersama
+        while self._expired:
+            await self._expire(self._expired.popleft(), notify=False)
+        if self.store is not None:
+            await self.store.close()
+
+REACTION_HANDLERS = {} # {kind: handler(reaction, user, entry)}
+EXPIRY_HANDLERS = {} # {kind: handler(entry) -> teks pemberitahuan atau None}
+
+def reaction_handler(kind: str):
+    """Dekorator untuk mendaftarkan handler reaksi satu jenis game."""
+    def decorator(handler):
+        REACTION_HANDLERS[kind] = handler
+        return handler
+    return decorator
+
+def expiry_handler(kind: str):
+    """Dekorator untuk mendaftarkan handler yang menyelesaikan game kedaluwarsa (refund atau hangus)."""
+    def decorator(handler):
+        EXPIRY_HANDLERS[kind] = handler
+        return handler
+    return decorator
+
+interactive_messages = InteractiveRegistry(INTERACTIVE_MAX_ENTRIES, {
+    'blackjack': BLACKJACK_TIMEOUT,
+    'flipcoin': FLIPCOIN_TIMEOUT,
+    'roulette': ROULETTE_TIMEOUT
+}, store=game_state_store)
+
+
+# --- Perekam Lalu Lintas (opsional, untuk replay.py) ---
+class TrafficRecorder:
+    """Menulis setiap perintah, reaksi dan klik tombol yang ditangani bot ke file JSONL.
+
+    Setiap baris berisi waktu relatif sejak perekaman dimulai (detik) dan jenis kejadiannya. ID pengguna
+    dan channel diganti nomor urut yang tidak bisa ditelusuri balik (pemetaannya hanya ada di memori),
+    termasuk mention dan ID mentah di isi pesan. Baris ditulis ke buffer file biasa dan di-flush
+    berkala oleh sistem operasi; close() dipanggil saat bot berhenti.
+    """
+
+    _RAW_ID = re.compile(r'<@!?(\d+)>|\b(\d{15,20})\b')
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+        self._started = time.monotonic()
+        self._users = {} # {id_asli: id_anonim}
+        self._channels = {}
+
+    def _anon(self, mapping: dict, real_id: int | None) -> int | None:
+        if real_id is None:
+            return None
+        return mapping.setdefault(real_id, len(mapping) + 1)
+
+    def _anon_content(self, content: str) -> str:
+        def replace(match):
+            if match.group(1):
+                return f"<@{self._anon(self._users, int(match.group(1)))}>"
+            return str(self._anon(self._users, int(match.group(2))))
+        return self._RAW_ID.sub(replace, content)
+
+    def _write(self, event: dict):
+        event["t"] = round(time.monotonic() - self._started, 3)
+        self._file.write(json.dumps(event, ensure_ascii=False, separators=(',', ':')) + "\n")
+
+    def message(self, message: discord.Message):
+        self._write({
+            "e": "message",
+            "c": self._anon(self._channels, message.channel.id),
+            "u": self._anon(self._users, message.author.id),
+            "admin": permissions.has_admin_role(message.author),
+            "text": self._anon_content(message.content),
+            "mentions": [self._anon(self._users, user.id) for user in message.mentions]
+        })
+
+    def reaction(self, entry: InteractiveEntry, user, emoji: str):
+        self._write({
+            "e": "reaction",
+            "kind": entry.kind,
+            "owner": self._anon(self._users, entry.owner_id),
+            "c": self._anon(self._channels, entry.channel_id),
+            "u": self._anon(self._users, user.id),
+            "emoji": emoji
+        })
+
+    def button(self, entry: InteractiveEntry, user, emoji: str | None):
+        self._write({
+            "e": "button",
+            "kind": entry.kind,
+            "owner": self._anon(self._users, entry.owner_id),
+            "c": self._anon(self._channels, entry.channel_id),
+            "u": self._anon(self._users, user.id),
+            "emoji": emoji
+        })
+
+    def close(self):
+        self._file.close()
+
+traffic_recorder = TrafficRecorder(TRAFFIC_RECORD_PATH) if TRAFFIC_RECORD_PATH else None
+
+# --- Event Bot Siap ---
+@client.event
+async def setup_hook():
+    await db_pool.start()
+    if DB_AUTO_MIGRATE:
+        await migrate_schema()
+    await permissions.load()
+    if game_state_store is not None and game_state_store.shared:
+        permissions.start() # Proses lain bisa menjalankan !setadmin di database yang sama
+    await leaderboard.load()
+    balance_cache.start()
+    if BALANCE_WRITE_THROUGH:
+        pending_credits.start()
+    interactive_messages.start()
+
+@client.event
+async def on_ready():
+    print(f'Bot {client.user} berhasil login!')
+    print(f'ID Bot: {client.user.id}')
+    # Mengupdate status bot untuk hanya menampilkan game yang ada
+    await client.change_presence(activity=discord.Game(name="type !listgame for the list!"))
+    print("HANIIF BOT  siap melayani perintah!")
+
+# --- Event Bot Menerima Reaksi ---
+@client.event
+async def on_reaction_add(reaction, user):
+    if user.bot:
+        return
+
+    entry = interactive_messages.get(reaction.message.id)
+    if entry is None and interactive_messages.store is not None and reaction.message.author == client.user \
+            and str(reaction.emoji) in GAME_REACTION_EMOJIS:
+        entry = await interactive_messages.restore(reaction.message.id) # Game dari proses lain atau sebelum restart
+    if entry is not None:
+        await dispatch_game_reaction(reaction, user, entry)
+
+@client.event
+async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
+    # on_reaction_add hanya dipanggil untuk pesan yang ada di cache. Pesan game yang dikirim proses lain atau
+    # sebelum restart tidak ada di sana, jadi pesannya diambil dulu lalu ditangani dengan handler yang sama.
+    if (interactive_messages.store is None or payload.user_id == client.user.id
+            or str(payload.emoji) not in GAME_REACTION_EMOJIS
+            or discord.utils.get(client.cached_messages, id=payload.message_id) is not None):
+        return
+    entry = await interactive_messages.restore(payload.message_id)
+    channel = client.get_channel(payload.channel_id)
+    if entry is None or channel is None:
+        return
+    try:
+        message = await channel.fetch_message(payload.message_id)
+    except discord.HTTPException:
+        return
+    reaction = discord.utils.find(lambda r: str(r.emoji) == str(payload.emoji), message.reactions)
+    user = payload.member or await user_resolver.resolve(message.guild, payload.user_id)
+    if reaction is None or user is None or user.bot:
+        return
+    await dispatch_game_reaction(reaction, user, entry)
+
+async def dispatch_game_reaction(reaction, user, entry: InteractiveEntry):
+    if traffic_recorder is not None:
+        traffic_recorder.reaction(entry, user, str(reaction.emoji))
+    async with user_locks.hold(user.id):
+        # Selama menunggu kunci, reaksi atau klik lain pengguna ini (atau reaper) mungkin sudah menyelesaikan game
+        if interactive_messages.get(reaction.message.id) is not entry:
+            return
+        await REACTION_HANDLERS[entry.kind](reaction, user, entry)
+
+async def remove_user_reaction(reaction, user):
+    try:
+        await reaction.message.remove_reaction(reaction.emoji, user)
+    except discord.Forbidden:
+        print("Bot tidak memiliki izin untuk menghapus reaksi.")
+
+# --- Logika untuk Blackjack ---
+# Dipakai bersama oleh mode reaksi dan mode tombol: keduanya hanya berbeda cara menampilkan hasilnya.
+BLACKJACK_STAND_OUTCOMES = {
+    "dealer_bust": "🎉 **DEALER BUST! Anda menang {payout} koin!** 🎉",
+    "player_win": "💰 **Anda menang {payout} koin! Selamat!** 🥳",
+    "dealer_win": "💔 **DEALER MENANG! Anda kalah {bet_amount} koin.** 😥",
+    "tie": "🤝 **Ini seri! Taruhan {bet_amount} koin Anda dikembalikan.**"
+}
+
+def blackjack_hands_text(game: BlackjackGame) -> str:
+    return (
+        f"Kartu Anda: {game.get_player_hand_str()} (Total: {game.player_hand.total})\n"
+        f"Kartu Dealer: {game.get_dealer_hand_str(hidden=False)} (Total: {game.dealer_hand.total})\n"
+    )
+
+def play_blackjack_hit(game: BlackjackGame, user) -> tuple[bool, str] | None:
+    """Menjalankan HIT. Mengembalikan (permainan_selesai, teks_pesan), atau None jika game sudah selesai."""
+    result = game.hit()
+    if result is None:
+        return None
+    text = f"**{user.display_name} HIT!**\n" + blackjack_hands_text(game)
+    if result == "bust":
+        return True, text + f"💥 **Anda Bust! Kartu Anda melebihi 21. Anda kalah {game.bet_amount} koin!** 💸"
+    return False, text + "Klik ✅ untuk HIT atau 🟥 untuk STAND."
+
+async def play_blackjack_stand(game: BlackjackGame, user) -> str | None:
+    """Menjalankan STAND, membayar pemain sesuai hasilnya dan mengembalikan teks pesan hasil.
+
+    None jika game sudah selesai, sehingga STAND ganda tidak membayar dua kali.
+    """
+    result = game.stand()
+    if result is None:
+        return None
+    payout = game.bet_amount * BLACKJACK_RETURN_MULTIPLIERS[result] # Total yang dibayarkan kembali ke pemain
+    if payout:
+        await credit_cash(user.id, payout, 'blackjack_payout')
+    return (
+        f"**{user.display_name} memutuskan untuk STAND!**\n"
+        + blackjack_hands_text(game)
+        + BLACKJACK_STAND_OUTCOMES[result].format(payout=payout, bet_amount=game.bet_amount)
+    )
+
+@reaction_handler('blackjack')
+async def on_blackjack_reaction(reaction, user, entry: InteractiveEntry):
+    if user.id != entry.owner_id or str(reaction.emoji) not in ('✅', '🟥'):
+        await remove_user_reaction(reaction, user)
+        return
+
+    interactive_messages.pop(reaction.message.id) # Klaim game ini sebelum await apa pun
+    game = entry.state
+    await remove_user_reaction(reaction, user)
+
+    if str(reaction.emoji) == '✅': # HIT
+        played = play_blackjack_hit(game, user)
+        if played is None:
+            return
+        finished, text = played
+        if finished:
+            await reaction.message.channel.send(text)
+            return
+        try:
+            new_message = await reaction.message.channel.send(text)
+        except discord.HTTPException:
+            interactive_messages.add(entry) # Tetap di pesan lama agar bisa dilanjutkan atau di-refund saat kedaluwarsa
+            raise
+        entry.message_id = new_message.id # Game pindah ke pesan baru dengan batas waktu baru
+        interactive_messages.add(entry)
+        await new_message.add_reaction('✅')
+        await new_message.add_reaction('🟥')
+
+    else: # STAND
+        text = await play_blackjack_stand(game, user)
+        if text is not None:
+            await reaction.message.channel.send(text)
+
+@expiry_handler('blackjack')
+async def expire_blackjack(entry: InteractiveEntry) -> str | None:
+    bet_amount = entry.state.bet_amount
+    if BLACKJACK_EXPIRY_ACTION == 'forfeit':
+        print(f"Blackjack {entry.owner_id} kedaluwarsa, taruhan {bet_amount} hangus.")
+        return f"⌛ Permainan Blackjack <@{entry.owner_id}> kedaluwarsa. Taruhan **{bet_amount} koin** hangus."
+    if await credit_cash(entry.owner_id, bet_amount, 'blackjack_refund') is None:
+        print(f"ERROR: Gagal mengembalikan taruhan Blackjack {entry.owner_id} yang kedaluwarsa.")
+        return None
+    print(f"Blackjack {entry.owner_id} kedaluwarsa, taruhan {bet_amount} dikembalikan.")
+    return f"⌛ Permainan Blackjack <@{entry.owner_id}> kedaluwarsa. Taruhan **{bet_amount} koin** dikembalikan."
+
+# --- Logika untuk Flip Coin ---
+async def play_flipcoin(game: FlipCoinGame, user, user_choice_str: str) -> str:
+    """Melempar koin untuk pilihan pemain, membayar jika menang dan mengembalikan teks pesan hasil."""
+    coin_result, winning_amount = game.flip(user_choice_str) # Lakukan lemparan koin
+    if winning_amount:
+        final_cash = await credit_cash(user.id, winning_amount, 'flipcoin_payout')
+        print(f"{user.name} menang {winning_amount} di flipcoin.")
+        return (
+            f"🎉 **LEMPAR KOIN! Anda Menang!** 🎉\n"
+            f"Anda memilih **{user_choice_str.upper()}**. Koin mendarat di **{coin_result.upper()}**!\n"
+            f"Selamat, **{user.display_name}**! Anda memenangkan **{winning_amount} koin**!\n"
+            f"Uang Anda sekarang: **{final_cash} koin**."
+        )
+    user_data = await get_user_data(user.id)
+    final_cash = user_data["cash"]
+    print(f"{user.name} kalah {game.bet_amount} di flipcoin.")
+    return (
+        f"💔 **LEMPAR KOIN! Anda Kalah.** 💔\n"
+        f"Anda memilih **{user_choice_str.upper()}**. Koin mendarat di **{coin_result.upper()}**!\n"
+        f"Maaf, **{user.display_name}**. Anda kalah **{game.bet_amount} koin**.\n"
+        f"Uang Anda sekarang: **{final_cash} koin**."
+    )
+
+@reaction_handler('flipcoin')
+async def on_flipcoin_reaction(reaction, user, entry: InteractiveEntry):
+    user_choice_str = ""
+    if str(reaction.emoji) == FLIPCOIN_HEAD_EMOJI:
+        user_choice_str = "kepala"
+    elif str(reaction.emoji) == FLIPCOIN_TAIL_EMOJI:
+        user_choice_str = "ekor"
+
+    if user.id != entry.owner_id or not user_choice_str: # Bukan pemilik game atau bukan emoji pilihan
+        await remove_user_reaction(reaction, user)
+        return
+
+    interactive_messages.pop(reaction.message.id) # Klaim game ini sebelum await apa pun
+    await remove_user_reaction(reaction, user)
+    await reaction.message.channel.send(await play_flipcoin(entry.state, user, user_choice_str))
+    await reaction.message.clear_reactions()
+
+@expiry_handler('flipcoin')
+async def expire_flipcoin(entry: InteractiveEntry) -> str | None:
+    bet_amount = entry.state.bet_amount
+    if FLIPCOIN_EXPIRY_ACTION == 'forfeit':
+        print(f"Flip coin {entry.owner_id} kedaluwarsa, taruhan {bet_amount} hangus.")
+        return f"⌛ Lempar Koin <@{entry.owner_id}> kedaluwarsa tanpa pilihan. Taruhan **{bet_amount} koin** hangus."
+    if await credit_cash(entry.owner_id, bet_amount, 'flipcoin_refund') is None:
+        print(f"ERROR: Gagal mengembalikan taruhan flip coin {entry.owner_id} yang kedaluwarsa.")
+        return None
+    print(f"Flip coin {entry.owner_id} kedaluwarsa, taruhan {bet_amount} dikembalikan.")
+    return f"⌛ Lempar Koin <@{entry.owner_id}> kedaluwarsa tanpa pilihan. Taruhan **{bet_amount} koin** dikembalikan."
+
+# --- Mode Tombol (discord.ui) untuk Blackjack dan Flip Coin ---
+# Setiap klik dijawab dengan satu edit pesan game yang sama (interaction.response.edit_message),
+# tanpa pesan baru atau tambah/hapus reaksi. State game dibawa oleh view; registri hanya dipakai
+# untuk batas waktu, refund dan pengecekan game yang sedang berjalan.
+class GameView(discord.ui.View):
+    def __init__(self, entry: InteractiveEntry):
+        super().__init__(timeout=None) # Batas waktu diurus InteractiveRegistry
+        self.entry = entry
+        self.message = None # Pesan game, diisi setelah dikirim
+        entry.view = self
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if traffic_recorder is not None:
+            custom_id = (interaction.data or {}).get('custom_id')
+            emojis = [str(item.emoji) for item in self.children if getattr(item, 'custom_id', None) == custom_id]
+            traffic_recorder.button(self.entry, interaction.user, emojis[0] if emojis else None)
+        if interaction.user.id != self.entry.owner_id:
+            await interaction.response.send_message("Ini bukan permainan Anda.", ephemeral=True)
+            return False
+        if interactive_messages.get(self.entry.message_id) is not self.entry: # Sudah selesai atau kedaluwarsa
+            await interaction.response.edit_message(view=None)
+            return False
+        return True
+
+    async def still_running(self, interaction: discord.Interaction) -> bool:
+        """Dicek lagi setelah kunci pengguna didapat: klik lain atau reaper mungkin sudah menyelesaikan game ini."""
+        if interactive_messages.get(self.entry.message_id) is self.entry:
+            return True
+        await interaction.response.edit_message(view=None)
+        return False
+
+    async def finish(self, interaction: discord.Interaction, text: str):
+        self.stop()
+        await interaction.response.edit_message(content=text, view=None)
+
+class BlackjackView(GameView):
+    @discord.ui.button(label="HIT", emoji='✅', style=discord.ButtonStyle.success, custom_id='blackjack:hit')
+    async def hit_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        async with user_locks.hold(interaction.user.id):
+            if not await self.still_running(interaction):
+                return
+            finished, text = play_blackjack_hit(self.entry.state, interaction.user)
+            if finished:
+                interactive_messages.pop(self.entry.message_id)
+                await self.finish(interaction, text)
+            else:
+                interactive_messages.add(self.entry) # Perpanjang batas waktu
+                await interaction.response.edit_message(content=text, view=self)
+
+    @discord.ui.button(label="STAND", emoji='🟥', style=discord.ButtonStyle.danger, custom_id='blackjack:stand')
+    async def stand_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        async with user_locks.hold(interaction.user.id):
+            if not await self.still_running(interaction):
+                return
+            interactive_messages.pop(self.entry.message_id) # Klaim game ini sebelum await berikutnya
+            await self.finish(interaction, await play_blackjack_stand(self.entry.state, interaction.user))
+
+class FlipCoinView(GameView):
+    async def choose(self, interaction: discord.Interaction, user_choice_str: str):
+        async with user_locks.hold(interaction.user.id):
+            if not await self.still_running(interaction):
+                return
+            interactive_messages.pop(self.entry.message_id) # Klaim game ini sebelum await berikutnya
+            await self.finish(interaction, await play_flipcoin(self.entry.state, interaction.user, user_choice_str))
+
+    @discord.ui.button(label="Kepala", emoji=FLIPCOIN_HEAD_EMOJI, style=discord.ButtonStyle.primary, custom_id='flipcoin:kepala')
+    async def head_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.choose(interaction, "kepala")
+
+    @discord.ui.button(label="Ekor", emoji=FLIPCOIN_TAIL_EMOJI, style=discord.ButtonStyle.primary, custom_id='flipcoin:ekor')
+    async def tail_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.choose(interaction, "ekor")
+
+GAME_VIEWS = {'blackjack': BlackjackView, 'flipcoin': FlipCoinView} # custom_id tombol diawali '<kind>:'
+
+@client.event
+async def on_interaction(interaction: discord.Interaction):
+    # Tombol game yang view-nya tidak ada di proses ini (pesan dari proses lain atau sebelum restart):
+    # pulihkan game-nya, pasang view baru untuk klik berikutnya, lalu jalankan tombol yang diklik.
+    if interaction.type != discord.InteractionType.component or interaction.message is None:
+        return
+    custom_id = (interaction.data or {}).get('custom_id', '')
+    kind = custom_id.split(':', 1)[0]
+    view_class = GAME_VIEWS.get(kind)
+    if view_class is None or interactive_messages.store is None or interactive_messages.get(interaction.message.id) is not None:
+        return # Bukan tombol game, atau sudah ditangani view di proses ini
+    entry = await interactive_messages.restore(interaction.message.id)
+    if entry is None or entry.kind != kind:
+        return
+    view = view_class(entry)
+    view.message = interaction.message
+    client.add_view(view, message_id=interaction.message.id)
+    item = discord.utils.get(view.children, custom_id=custom_id)
+    if item is not None and await view.interaction_check(interaction):
+        await item.callback(interaction)
+
+async def send_game_message(channel, entry: InteractiveEntry, text: str, view_class: type[GameView], emojis: tuple[str, ...]):
+    """Mengirim pesan game dan mendaftarkannya, memakai tombol atau reaksi sesuai GAME_INTERACTION_MODE."""
+    if GAME_INTERACTION_MODE == 'buttons':
+        view = view_class(entry)
+        view.message = await channel.send(text, view=view)
+        entry.message_id = view.message.id
+        interactive_messages.add(entry)
+        return
+    response_message = await channel.send(text)
+    entry.message_id = response_message.id
+    interactive_messages.add(entry)
+    for emoji in emojis:
+        await response_message.add_reaction(emoji)
+
+# --- Logika untuk Roulette (TARUHAN VIA REAKSI) ---
+@reaction_handler('roulette')
+async def on_roulette_reaction(reaction, user, entry: InteractiveEntry):
+    roulette_round = entry.state
+    if roulette_round["status"] != "betting": # Bukan putaran roulette aktif yang menunggu reaksi
+        await remove_user_reaction(reaction, user)
+        return
+    round_id = roulette_round["round_id"]
+
+    # Periksa apakah pengguna sudah bertaruh warna di putaran ini
+    user_bets = roulette_round["bets"].get(user.id, [])
+    if any(b['bet_type'] == 'color' and b.get('via_emoji', False) for b in user_bets):
+         channel_outbox.post(reaction.message.channel, f"**{user.display_name}**, Anda sudah memasang taruhan warna via emoji di putaran ini. Gunakan `!bet` untuk taruhan lain.")
+         await remove_user_reaction(reaction, user)
+         return
+
+    bet_amount = 10 # Default taruhan untuk reaksi warna
+    bet_type = 'color'
+    bet_choice = None
+
+    if str(reaction.emoji) == ROULETTE_RED_EMOJI:
+        bet_choice = 'merah'
+    elif str(reaction.emoji) == ROULETTE_BLACK_EMOJI:
+        bet_choice = 'hitam'
+    
+    if not bet_choice: # Emoji bukan untuk taruhan warna roulette
+        await remove_user_reaction(reaction, user)
+        return
+    
+    debit = await debit_if_sufficient(user.id, bet_amount, 'roulette_bet', round_id)
+    if debit is None:
+        channel_outbox.post(reaction.message.channel, f"**{user.display_name}**, gagal menempatkan taruhan Roulette. Terjadi kesalahan database.")
+        await remove_user_reaction(reaction, user)
+        return
+    debited, new_cash = debit
+    if not debited:
+        channel_outbox.post(reaction.message.channel, f"**{user.display_name}**, uang Anda tidak cukup ({new_cash} koin) untuk taruhan {bet_amount} koin.")
+        await remove_user_reaction(reaction, user)
+        return
+
+    # Catat di buku eksposur putaran (sekaligus cek batas meja). Putaran bisa saja sudah diputar selama menunggu debit.
+    bet_code = roulette_bet_code(bet_type, bet_choice)
+    if roulette_round["status"] != "betting":
+        reject_reason = "putaran sudah ditutup"
+    else:
+        reject_reason = roulette_round["book"].reserve(user.id, bet_code, bet_amount)
+    if reject_reason:
+        await credit_cash(user.id, bet_amount, 'roulette_refund', round_id)
+        channel_outbox.post(reaction.message.channel, f"**{user.display_name}**, taruhan ditolak: {reject_reason}. Uang Anda dikembalikan.")
+        await remove_user_reaction(reaction, user)
+        return
+    
+    if user.id not in roulette_round["bets"]:
+        roulette_round["bets"][user.id] = [] # Inisialisasi daftar taruhan untuk user ini
+    roulette_round["bets"][user.id].append({"amount": bet_amount, "bet_type": bet_type, "bet_choice": bet_choice, "via_emoji": True})
+    interactive_messages.save(entry.message_id)
+    channel_outbox.post(
+        reaction.message.channel,
+        f"**{user.display_name}** menempatkan taruhan **{bet_amount} koin** pada **{bet_choice.upper()}** (via emoji). Uang Anda sekarang: **{new_cash} koin**."
+    )
+    print(f"{user.name} menaruh {bet_amount} koin di roulette via emoji.")
+    
+    await remove_user_reaction(reaction, user)
+
+
+@expiry_handler('roulette')
+async def expire_roulette(entry: InteractiveEntry) -> str | None:
+    roulette_round = entry.state
+    if roulette_round["status"] != "betting":
+        return None
+    roulette_round["status"] = "expired" # Taruhan yang sedang diproses akan ditolak
+    if current_roulette_rounds.get(entry.channel_id) is roulette_round:
+        del current_roulette_rounds[entry.channel_id]
+
+    round_id = roulette_round["round_id"]
+    stakes = roulette_round["book"].user_stakes
+    if ROULETTE_EXPIRY_ACTION == 'forfeit':
+        await settle_roulette_round(round_id, {})
+        print(f"Roulette putaran {round_id} kedaluwarsa, {sum(stakes.values())} koin taruhan hangus.")
+        return f"⌛ Putaran Roulette `{round_id}` dibatalkan karena tidak diputar. Semua taruhan hangus."
+    # Pengembalian semua taruhan ditulis dalam satu transaksi, sama seperti pembayaran
+    await settle_roulette_round(round_id, {user_id: amount for user_id, amount in stakes.items() if amount > 0}, 'roulette_refund')
+    print(f"Roulette putaran {round_id} kedaluwarsa, {sum(stakes.values())} koin taruhan dikembalikan.")
+    return f"⌛ Putaran Roulette `{round_id}` dibatalkan karena tidak diputar. Semua taruhan dikembalikan."
+
+# --- Registri Perintah ---
+# on_message hanya memeriksa prefix lalu mencari token pertama di dictionary, jadi menambah perintah
+# baru tidak menambah biaya untuk setiap pesan. Handler mendaftarkan dirinya lewat dekorator di bawah.
+COMMAND_PREFIX = '!'
+COMMANDS = {} # {"!nama_perintah": handler}
+PLAIN_COMMANDS = {} # Perintah tanpa prefix yang harus sama persis, misalnya 'ping'
+PLAIN_COMMAND_MAX_LENGTH = 0 # Pesan tanpa prefix yang lebih panjang dari ini pasti bukan perintah
+
+def command(*names: str):
+    """Dekorator untuk mendaftarkan handler ke COMMANDS dengan satu atau beberapa nama (alias)."""
+    def decorator(handler):
+        for name in names:
+            COMMANDS[name] = handler
+        return handler
+    return decorator
+
+def plain_command(*names: str):
+    """Dekorator untuk perintah tanpa prefix yang isinya harus sama persis dengan salah satu nama."""
+    def decorator(handler):
+        global PLAIN_COMMAND_MAX_LENGTH
+        for name in names:
+            PLAIN_COMMANDS[name] = handler
+            PLAIN_COMMAND_MAX_LENGTH = max(PLAIN_COMMAND_MAX_LENGTH, len(name))
+        return handler
+    return decorator
+
+def has_required_role(member: discord.Member, allowed_roles: frozenset[int]) -> bool:
+    if not getattr(member, 'guild', None): # discord.User (pesan DM) tidak punya guild
+        return False
+    # Daftar role yang diizinkan biasanya jauh lebih kecil dari role member, dan member.get_role()
+    # mencari di ID role member yang sudah terurut (binary search) tanpa membuat objek Role satu per satu
+    return any(member.get_role(role_id) is not None for role_id in allowed_roles)
+
+# --- Pembatas Laju Perintah ---
+def parse_rate_limit(spec: str) -> tuple[int, float] | None:
+    """Mengubah 'N/S' menjadi (N, S). None berarti tanpa batas ('0' atau kosong)."""
+    count, _, period = spec.strip().partition('/')
+    if not count or int(count) <= 0:
+        return None
+    return int(count), float(period or 1)
+
+class RateLimiter:
+    """Token bucket per (pengguna, perintah) di memori, dicek di on_message sebelum kunci pengguna dan handler.
+
+    Bucket berisi paling banyak N token dan terisi kembali N token per S detik; setiap perintah memakai satu
+    token. Perintah tanpa token dibuang diam-diam tanpa database, API Discord maupun perekaman. Bucket yang
+    sudah penuh lagi sama dengan bucket baru, jadi dibuang sedikit demi sedikit dari depan (yang paling lama
+    tidak dipakai) setiap kali perintah masuk, tanpa memindai semua bucket; jumlah bucket juga dibatasi
+    max_buckets.
+
+    Cooldown perintah (misalnya !daily) ikut di-cache di sini, supaya perintah yang pasti ditolak dijawab
+    tanpa memuat data pengguna dari database. Cache ini boleh hilang: database tetap sumber kebenarannya.
+    """
+
+    def __init__(self, default: str, limits: dict[str, str], max_buckets: int):
+        self.default = parse_rate_limit(default)
+        self.limits = {name: parse_rate_limit(spec) for name, spec in limits.items()}
+        self.max_buckets = max_buckets
+        self.enabled = True
+        self.dropped = 0 # Jumlah perintah yang dibuang sejak bot start
+        self._handler_limits = None # {handler: (N, S) atau None}, dibangun saat pertama dipakai
+        self._buckets = OrderedDict() # {(user_id, handler): [token, waktu_isi_terakhir]}, urut dari yang terlama dipakai
+        self._cooldowns = {} # {(user_id, nama_perintah): datetime cooldown berakhir}, urut dari yang terlama disimpan
+
+    def _limit_for(self, handler) -> tuple[int, float] | None:
+        if self._handler_limits is None:
+            # Semua perintah sudah terdaftar di sini; alias berbagi bucket dan batas yang sama
+            self._handler_limits = {}
+            for name, registered in (*COMMANDS.items(), *PLAIN_COMMANDS.items()):
+                if name in self.limits or registered not in self._handler_limits:
+                    self._handler_limits[registered] = self.limits.get(name, self.default)
+            for name in self.limits.keys() - COMMANDS.keys() - PLAIN_COMMANDS.keys():
+                print(f"WARNING: RATE_LIMITS berisi perintah yang tidak dikenal: {name}")
+        return self._handler_limits.get(handler, self.default)
+
+    def allow(self, user_id: int, handler) -> bool:
+        """Memakai satu token pengguna untuk perintah ini. False jika perintah harus dibuang."""
+        if not self.enabled:
+            return True
+        limit = self._limit_for(handler)
+        if limit is None:
+            return True
+        capacity, period = limit
+        now = time.monotonic()
+        self._evict_idle(now)
+
+        key = (user_id, handler)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_buckets:
+                self._buckets.popitem(last=False)
+            bucket = self._buckets[key] = [capacity, now]
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * capacity / period)
+            bucket[1] = now
+
+        if bucket[0] < 1:
+            self.dropped += 1
+            return False
+        bucket[0] -= 1
+        return True
+
+    def cooldown_until(self, user_id: int, name: str) -> datetime | None:
+        """Waktu cooldown perintah pengguna berakhir menurut cache, atau None jika tidak diketahui/sudah lewat."""
+        until = self._cooldowns.get((user_id, name))
+        if until is not None and until <= datetime.now():
+            del self._cooldowns[(user_id, name)]
+            return None
+        return until
+
+    def set_cooldown(self, user_id: int, name: str, until: datetime):
+        key = (user_id, name)
+        self._cooldowns.pop(key, None)
+        current_time = datetime.now()
+        for _ in range(RATE_LIMIT_EVICT_BATCH):
+            oldest = next(iter(self._cooldowns), None)
+            if oldest is None or self._cooldowns[oldest] > current_time:
+                break
+            del self._cooldowns[oldest]
+        if len(self._cooldowns) >= self.max_buckets:
+            del self._cooldowns[next(iter(self._cooldowns))] # Yang paling lama disimpan
+        self._cooldowns[key] = until
+
+    def _evict_idle(self, now: float):
+        """Membuang paling banyak RATE_LIMIT_EVICT_BATCH bucket terdepan yang sudah penuh lagi."""
+        for _ in range(RATE_LIMIT_EVICT_BATCH):
+            if not self._buckets:
+                return
+            key = next(iter(self._buckets))
+            tokens, refilled_at = self._buckets[key]
+            limit = self._limit_for(key[1])
+            if limit is not None and tokens + (now - refilled_at) * limit[0] / limit[1] < limit[0]:
+                return
+            del self._buckets[key]
+
+rate_limiter = RateLimiter(RATE_LIMIT_DEFAULT, RATE_LIMITS, RATE_LIMIT_MAX_BUCKETS)
+
+# --- Event Bot Menerima Pesan ---
+@client.event
+async def on_message(message):
+    content = message.content
+    if content.startswith(COMMAND_PREFIX):
+        if message.author == client.user:
+            return
+        handler = COMMANDS.get(content.split(maxsplit=1)[0].lower())
+    elif len(content) <= PLAIN_COMMAND_MAX_LENGTH and message.author != client.user:
+        handler = PLAIN_COMMANDS.get(content.lower())
+    else:
+        return # Obrolan biasa, bukan perintah
+
+    if handler is not None:
+        if not rate_limiter.allow(message.author.id, handler):
+            return # Terlalu cepat: dibuang tanpa database, API Discord atau perekaman
+        if traffic_recorder is not None:
+            traffic_recorder.message(message)
+        # Perintah satu pengguna dijalankan berurutan; pengguna yang di-mention (!givecash, !addcash) ikut dikunci
+        async with user_locks.hold(message.author.id, *(user.id for user in message.mentions)):
+            await handler(message)
+
+# --- Perintah Admin dan Ekonomi ---
+@command('!setadmin')
+async def handle_setadmin(message: discord.Message):
+    if not message.guild:
+        await message.channel.send("Perintah ini hanya bisa digunakan di dalam server Discord.")
+        return
+
+    if not permissions.has_admin_role(message.author):
+        await message.channel.send("Maaf, Anda tidak memiliki role yang diperlukan untuk menggunakan perintah ini.")
+        return
+    
+    parts = message.content.split()
+    if len(parts) >= 3:
+        action = parts[1].lower()
+        target_id_str = parts[2]
+        
+        try:
+            target_user = None
+            if message.mentions:
+                target_user = message.mentions[0]
+                target_user_id = target_user.id
+            else:
+                target_user_id = int(target_id_str)
+                target_user = await user_resolver.resolve(message.guild, target_user_id)
+                if target_user is None:
+                    await message.channel.send("ID pengguna tidak valid atau tidak ditemukan.")
+                    return
+
+            if action == 'add':
+                success = await add_admin_cash_adder(target_user_id)
+                if success:
+                    await message.channel.send(f"{target_user.display_name} ({target_user_id}) sekarang adalah admin penambah cash.")
+                    print(f"Admin {message.author.name} menambahkan {target_user.name} sebagai admin cash.")
+                else:
+                    await message.channel.send(f"{target_user.display_name} ({target_user_id}) sudah menjadi admin penambah cash.")
+            elif action == 'remove':
+                success = await remove_admin_cash_adder(target_user_id)
+                if success:
+                    await message.channel.send(f"{target_user.display_name} ({target_user_id}) telah dihapus dari admin penambah cash.")
+                    print(f"Admin {message.author.name} menghapus {target_user.name} dari admin cash.")
+                else:
+                    await message.channel.send(f"{target_user.display_name} ({target_user_id}) bukan admin penambah cash.")
+            else:
+                await message.channel.send("Format yang benar: `!setadmin [add/remove] <Discord ID/@user>`")
+        except ValueError:
+            await message.channel.send("Format ID pengguna tidak valid. Gunakan ID angka atau mention.")
+        except Exception as e:
+            await message.channel.send(f"Terjadi kesalahan: {e}")
+    else:
+        await message.channel.send("Format yang benar: `!setadmin [add/remove] <Discord ID/@user>`")
+
+@command('!balance')
+async def handle_balance(message: discord.Message):
+    user_id = message.author.id
+    user_data = await get_user_data(user_id)
+    user_current_cash = user_data["cash"]
+    await message.channel.send(f"{message.author.mention}, uang kamu saat ini: **{user_current_cash} koin**.")
+    print(f"Merespons '!balance' dari {message.author.name}. Uang: {user_current_cash}")
+
+@command('!leaderboard', '!top')
+async def handle_leaderboard(message: discord.Message):
+    parts = message.content.split()
+    limit = LEADERBOARD_DEFAULT_SIZE
+    if len(parts) > 1:
+        try:
+            limit = int(parts[1])
+        except ValueError:
+            await message.channel.send("Format yang benar: `!top [jumlah]`, contoh: `!top 10`.")
+            return
+    limit = max(1, min(limit, LEADERBOARD_MAX_SIZE))
+
+    top = leaderboard.top(limit)
+    if not top:
+        await message.channel.send("Belum ada pemain di papan peringkat.")
+        return
+    players = await user_resolver.resolve_many(message.guild, [user_id for user_id, _ in top])
+    lines = []
+    for position, (user_id, cash) in enumerate(top, start=1):
+        player = players[user_id]
+        name = f"**{player.display_name}**" if player else f"<@{user_id}>"
+        lines.append(f"**#{position}** {name} — **{cash} koin**")
+    for text in split_message(f"🏆 **PAPAN PERINGKAT (TOP {len(top)})** 🏆", lines):
+        await message.channel.send(text)
+    print(f"Merespons '!top {limit}' dari {message.author.name}")
+
+@command('!rank')
+async def handle_rank(message: discord.Message):
+    target_user = message.mentions[0] if message.mentions else message.author
+    rank = leaderboard.rank(target_user.id)
+    if rank is None:
+        await message.channel.send(f"**{target_user.display_name}** belum masuk papan peringkat.")
+        return
+    position, cash = rank
+    await message.channel.send(
+        f"🏅 Peringkat **{target_user.display_name}**: **#{position}** dari {len(leaderboard)} pemain "
+        f"dengan **{cash} koin**."
+    )
+    print(f"Merespons '!rank' dari {message.author.name}")
+
+@command('!daily')
+async def handle_daily(message: discord.Message):
+    user_id = message.author.id
+    daily_cooldown_hours = 12
+    amount_to_give = 100
+
+    cooldown = timedelta(hours=daily_cooldown_hours)
+    cooldown_until = rate_limiter.cooldown_until(user_id, '!daily')
+    if cooldown_until is not None:
+        # Masih cooldown menurut cache, jawab tanpa memuat data pengguna dari database
+        claimed, new_cash, last_claim_time = False, None, cooldown_until - cooldown
+    else:
+        claim = await claim_daily(user_id, amount_to_give, cooldown)
+        if claim is None:
+            await message.channel.send("Maaf, terjadi kesalahan saat mengupdate uang Anda.")
+            return
+        claimed, new_cash, last_claim_time = claim
+        rate_limiter.set_cooldown(user_id, '!daily', last_claim_time + cooldown)
+
+    if not claimed:
+        time_since_last_claim = datetime.now() - last_claim_time
+        if time_since_last_claim < timedelta(hours=daily_cooldown_hours):
+            remaining_time = timedelta(hours=daily_cooldown_hours) - time_since_last_claim
+            
+            total_seconds_left = int(remaining_time.total_seconds())
+            hours_left = total_seconds_left // 3600
+            minutes_left = (total_seconds_left % 3600) // 60
+            seconds_left = total_seconds_left % 60
+            
+            time_str = []
+            if hours_left > 0:
+                time_str.append(f"{hours_left} jam")
+            if minutes_left > 0:
+                time_str.append(f"{minutes_left} menit")
+            if seconds_left > 0:
+                time_str.append(f"{seconds_left} detik")
+            
+            if not time_str:
+                time_str = ["sebentar lagi"]
+
+            await message.channel.send(
+                f"⏳ **{message.author.display_name}**, kamu sudah mengklaim daily bonus. "
+                f"Kamu bisa mengklaim lagi dalam **{' dan '.join(time_str)}**."
+            )
+            print(f"{message.author.name} mencoba daily terlalu cepat. Sisa: {hours_left}j {minutes_left}m {seconds_left}d.")
+            return
+
+    await message.channel.send(f"🎉 **{message.author.display_name}**, kamu mendapatkan **{amount_to_give} koin harian**! Uangmu sekarang: **{new_cash} koin**.")
+    print(f"{message.author.name} berhasil mengklaim daily. Memberi {amount_to_give} koin.")
+
+@command('!givecash')
+async def handle_givecash(message: discord.Message):
+    user_id = message.author.id
+    parts = message.content.split()
+    if len(parts) == 3 and message.mentions:
+        target_user = message.mentions[0]
+        try:
+            amount = int(parts[2])
+            if amount <= 0:
+                await message.channel.send("Jumlah uang yang diberikan harus positif.")
+                return
+            if message.author.id == target_user.id:
+                await message.channel.send("Kamu tidak bisa memberikan uang kepada diri sendiri.")
+                return
+
+            transfer = await transfer_cash(user_id, target_user.id, amount)
+            if transfer is None:
+                await message.channel.send("Maaf, terjadi kesalahan saat memberikan uang.")
+                return
+            success, new_sender_cash, new_target_cash = transfer
+            if not success:
+                await message.channel.send(f"Uangmu tidak cukup untuk memberikan **{amount} koin**. Uangmu saat ini: {new_sender_cash} koin.")
+                return
+
+            await message.channel.send(f"{message.author.mention} berhasil memberikan **{amount} koin** kepada {target_user.mention}! Uang {message.author.display_name}: **{new_sender_cash} koin**. Uang {target_user.display_name}: **{new_target_cash} koin**.")
+            print(f"{message.author.name} memberikan {amount} koin kepada {target_user.name}.")
+
+        except ValueError:
+            await message.channel.send("Jumlah uang harus berupa angka.")
+        except Exception as e:
+            await message.channel.send(f"Terjadi kesalahan: {e}")
+    else:
+        await message.channel.send("Format yang benar: `!givecash @nama_user <jumlah>`")
+
+@command('!addcash')
+async def handle_addcash(message: discord.Message):
+    user_id = message.author.id
+    if not await is_admin_cash_adder(user_id):
+        await message.channel.send("Maaf, Anda tidak memiliki izin untuk menggunakan perintah ini.")
+        return
+
+    parts = message.content.split()
+    if len(parts) == 3 and message.mentions:
+        target_user = message.mentions[0]
+        try:
+            amount = int(parts[2])
+            if amount <= 0:
+                await message.channel.send("Jumlah uang yang ditambahkan harus positif.")
+                return
+            
+            new_target_cash = await credit_cash(target_user.id, amount, 'admin_addcash', message.author.id)
+
+            if new_target_cash is not None:
+                await message.channel.send(f"Berhasil menambahkan **{amount} koin** kepada {target_user.mention}. Uangnya sekarang: **{new_target_cash} koin**.")
+                print(f"Admin {message.author.name} menambahkan {amount} koin kepada {target_user.name}.")
+            else:
+                await message.channel.send("Maaf, terjadi kesalahan saat menambahkan uang.")
+        except ValueError:
+            await message.channel.send("Jumlah uang harus berupa angka.")
+        except Exception as e:
+            await message.channel.send(f"Terjadi kesalahan: {e}")
+    else:
+        await message.channel.send("Format yang benar: `!addcash @nama_user <jumlah>`")
+
+@command('!removecash')
+async def handle_removecash(message: discord.Message):
+    user_id = message.author.id
+    if not await is_admin_cash_adder(user_id):
+        await message.channel.send("Maaf, Anda tidak memiliki izin untuk menggunakan perintah ini.")
+        return
+
+    parts = message.content.split()
+    if len(parts) == 3 and message.mentions:
+        target_user = message.mentions[0]
+        try:
+            amount = int(parts[2])
+            if amount <= 0:
+                await message.channel.send("Jumlah uang yang dikurangi harus positif.")
+                return
+            
+            debit = await debit_if_sufficient(target_user.id, amount, 'admin_removecash', message.author.id)
+            if debit is None:
+                await message.channel.send("Maaf, terjadi kesalahan saat mengurangi uang.")
+                return
+            success, new_target_cash = debit
+            if not success:
+                await message.channel.send(f"Uang {target_user.display_name} hanya {new_target_cash} koin. Tidak bisa dikurangi sebanyak {amount} koin.")
+                return
+
+            await message.channel.send(f"Berhasil mengurangi **{amount} koin** dari {target_user.mention}. Uangnya sekarang: **{new_target_cash} koin**.")
+            print(f"Admin {message.author.name} mengurangi {amount} koin dari {target_user.name}.")
+        except ValueError:
+            await message.channel.send("Jumlah uang harus berupa angka.")
+        except Exception as e:
+            await message.channel.send(f"Terjadi kesalahan: {e}")
+    else:
+        await message.channel.send("Format yang benar: `!removecash @nama_user <jumlah>`")
+
+@plain_command('ping')
+async def handle_ping(message: discord.Message):
+    await message.channel.send('Pong!')
+    print(f"Merespons 'ping' dari {message.author.name}")
+
+@plain_command('halo')
+async def handle_halo(message: discord.Message):
+    await message.channel.send(f'Halo juga, {message.author.mention}!')
+    print(f"Merespons 'halo' dari {message.author.name}")
+
+@command('!info')
+async def handle_info(message: discord.Message):
+    await message.channel.send("Saya adalah bot sederhana yang dibuat dengan discord.py.")
+    print(f"Merespons '!info' dari {message.author.name}")
+
+@command('!listgame')
+async def handle_listgame(message: discord.Message):
+    await message.channel.send(
+    f"{message.author.mention} List Game: \n 1. BlackJack (!bj) \n 2. Flip Coin (!fc) \n 3. Roulette (!rou start)")
+    print(f"Merespons '!listgame' dari {message.author.name}")
+
+# --- Perintah Permainan Blackjack ---
+@command('!blackjack', '!bj')
+async def handle_blackjack(message: discord.Message):
+    msg_content = message.content.lower()
+    user_id = message.author.id
+    parts = msg_content.split()
+    if len(parts) < 2:
+        await message.channel.send("Format yang benar: `!blackjack <jumlah_taruhan>` atau `!bj <jumlah_taruhan>`. Taruhan harus positif.")
+        return
+    
+    try:
+        bet_amount = int(parts[1])
+        if bet_amount <= 0:
+            await message.channel.send("Jumlah taruhan harus positif.")
+            return
+    except ValueError:
+        await message.channel.send("Jumlah taruhan harus berupa angka.")
+        return
+
+    if await interactive_messages.has_game('blackjack', user_id):
+        await message.channel.send("Kamu sudah memiliki permainan Blackjack yang sedang berjalan. Klik `✅` atau `🟥`.")
+        return
+    
+    debit = await debit_if_sufficient(user_id, bet_amount, 'blackjack_bet')
+    if debit is None:
+        await message.channel.send("Maaf, terjadi kesalahan database. Coba lagi nanti.")
+        return
+    debited, new_cash = debit
+    if not debited:
+        await message.channel.send(f"Kamu butuh setidaknya **{bet_amount} koin** untuk bermain Blackjack. Uangmu saat ini: {new_cash} koin.")
+        return
+
+    game = BlackjackGame(user_id, bet_amount, get_blackjack_shoe(message.channel.id))
+    result = game.start_game()
+
+    player_hand_str = game.get_player_hand_str()
+    player_score = game.player_hand.total
+    
+    dealer_hand_str_revealed = game.get_dealer_hand_str(hidden=False)
+    dealer_score_revealed = game.dealer_hand.total
+
+    if result == "blackjack_player":
+        winning_amount = game.bet_amount * BLACKJACK_RETURN_MULTIPLIERS[result]
+        final_cash = await credit_cash(user_id, winning_amount, 'blackjack_payout')
+        await message.channel.send(
+            f"🎉 **BLACKJACK! Kemenangan Instan!** 🎉\n"
+            f"**{message.author.display_name}** memulai permainan Blackjack (taruhan: **{game.bet_amount} koin**).\n"
+            f"Kartu Anda: {player_hand_str} (Total: **{player_score}**)\n"
+            f"Kartu Dealer: {dealer_hand_str_revealed} (Total: **{dealer_score_revealed}**)\n"
+            f"Anda mendapatkan **{winning_amount} koin**! Saldo baru Anda: **{final_cash} koin**."
+        )
+    else:
+        await send_game_message(
+            message.channel, InteractiveEntry(0, 'blackjack', user_id, message.channel.id, game),
+            f"♠️♥️♦️♣️ **BLACKJACK DIMULAI!** ♣️♦️♥️♠️\n"
+            f"**{message.author.display_name}** bertaruh **{game.bet_amount} koin**.\n"
+            f"Kartu Anda: {player_hand_str} (Total: **{player_score}**)\n"
+            f"Kartu Dealer: {dealer_hand_str_revealed} (Total: **{dealer_score_revealed}**)\n"
+            "Apa langkah Anda selanjutnya? Klik ✅ untuk **HIT** atau 🟥 untuk **STAND**!",
+            BlackjackView, ('✅', '🟥')
+        )
+
+# --- Perintah Permainan Flip Coin (!flipcoin atau !fc) ---
+@command('!flipcoin', '!fc')
+async def handle_flipcoin(message: discord.Message):
+    msg_content = message.content.lower()
+    user_id = message.author.id
+    parts = msg_content.split()
+    if len(parts) < 2:
+        await message.channel.send("Format yang benar: `!flipcoin <jumlah_taruhan>` atau `!fc <jumlah_taruhan>`. Taruhan harus positif.")
+        return
+
+    try:
+        bet_amount = int(parts[1])
+        if bet_amount <= 0:
+            await message.channel.send("Jumlah taruhan harus positif.")
+            return
+    except ValueError:
+        await message.channel.send("Jumlah taruhan harus berupa angka.")
+        return
+    
+    debit = await debit_if_sufficient(user_id, bet_amount, 'flipcoin_bet')
+    if debit is None:
+        await message.channel.send("Maaf, terjadi kesalahan database. Coba lagi nanti.")
+        return
+    debited, current_cash = debit
+    if not debited:
+        await message.channel.send(f"Uangmu tidak cukup untuk bertaruh **{bet_amount} koin**. Uangmu saat ini: {current_cash} koin.")
+        return
+
+    game = FlipCoinGame(user_id, bet_amount)
+    
+    await send_game_message(
+        message.channel, InteractiveEntry(0, 'flipcoin', user_id, message.channel.id, game),
+        f"**{message.author.display_name}** bertaruh **{bet_amount} koin** di Lempar Koin!\n"
+        f"Pilih sisi koin: {FLIPCOIN_HEAD_EMOJI} untuk **Kepala** atau {FLIPCOIN_TAIL_EMOJI} untuk **Ekor**.",
+        FlipCoinView, (FLIPCOIN_HEAD_EMOJI, FLIPCOIN_TAIL_EMOJI)
+    )
+
+# --- Perintah Roulette (!roulette atau !rou) ---
+async def get_roulette_round(channel_id: int) -> dict | None:
+    """Putaran roulette di channel ini, dipulihkan dari penyimpanan state jika proses ini belum memilikinya."""
+    roulette_round = current_roulette_rounds.get(channel_id)
+    if roulette_round is None:
+        entry = await interactive_messages.restore_by_channel('roulette', channel_id)
+        if entry is not None:
+            roulette_round = current_roulette_rounds.setdefault(channel_id, entry.state)
+    return roulette_round
+
+@command('!roulette', '!rou')
+async def handle_roulette(message: discord.Message):
+    msg_content = message.content.lower()
+    parts = msg_content.split()
+    channel_id = message.channel.id
+    
+    if len(parts) == 1 or (len(parts) == 2 and parts[1].lower() == 'start'):
+        print(f"DEBUG: !roulette start command received from {message.author.name} in channel {message.channel.name}")
+        # Periksa izin admin untuk memulai roulette
+        if not permissions.has_admin_role(message.author):
+            await message.channel.send("Maaf, hanya admin yang bisa memulai atau mengakhiri permainan Roulette.")
+            return
+
+        active_round = await get_roulette_round(channel_id)
+        if active_round is not None and active_round["status"] == "betting":
+            await message.channel.send("Permainan Roulette sudah aktif di channel ini. Silakan pasang taruhan Anda.")
+            return
+
+        round_id = datetime.now().strftime("%Y%m%d%H%M%S") + str(random.randint(0, 999)) # ID unik untuk putaran
+        current_roulette_rounds[channel_id] = {
+            "status": "betting",
+            "round_id": round_id,
+            "message_id": 0, # Akan diisi setelah pesan dikirim
+            "bets": {}, # {user_id: [taruhan_obj]} -> [taruhan_obj] = {"amount": int, "bet_type": str, "bet_choice": str}
+            "book": RouletteBook(ROULETTE_MAX_NUMBER_EXPOSURE, ROULETTE_MAX_ROUND_EXPOSURE)
+        }
+
+        roulette_info_message = await message.channel.send(
+            f"🎰 **ROULETTE BARU DIMULAI!** 🎰\n"
+            f"**Putaran ID:** `{round_id}`\n"
+            f"**Taruhan dibuka!** Anda bisa pasang taruhan dengan `!bet <jumlah> <jenis_taruhan> <pilihan>`.\n\n"
+            f"**Jenis Taruhan (Contoh):**\n"
+            f"  `!bet 50 merah` (atau `hitam`)\n"
+            f"  `!bet 50 genap` (atau `ganjil`)\n"
+            f"  `!bet 50 tinggi` (19-36) (atau `rendah` (1-18))\n"
+            f"  `!bet 10 angka 7` (atau angka 0-36)\n"
+            f"  `!bet 20 1st12` (1-12) (atau `2nd12`, `3rd12`)\n"
+            f"  `!bet 20 col1` (kolom 1) (atau `col2`, `col3`)\n\n"
+            f"Taruhan cepat: Klik {ROULETTE_RED_EMOJI} untuk Merah atau {ROULETTE_BLACK_EMOJI} untuk Hitam (default 10 koin)."
+        )
+        current_roulette_rounds[channel_id]["message_id"] = roulette_info_message.id
+        # Daftarkan pesan putaran agar reaksinya dilacak (dan putaran dibatalkan jika tidak pernah diputar)
+        interactive_messages.add(InteractiveEntry(roulette_info_message.id, 'roulette', None, channel_id, current_roulette_rounds[channel_id]))
+        await roulette_info_message.add_reaction(ROULETTE_RED_EMOJI) # Emoji untuk Merah
+        await roulette_info_message.add_reaction(ROULETTE_BLACK_EMOJI) # Emoji untuk Hitam
+        
+        print(f"Roulette putaran {round_id} dimulai di channel {message.channel.name}.")
+
+    elif len(parts) == 2 and parts[1].lower() == 'spin':
+        print(f"DEBUG: !roulette spin command received from {message.author.name} in channel {message.channel.name}")
+        # Periksa izin admin untuk mengakhiri roulette
+        if not permissions.has_admin_role(message.author):
+            await message.channel.send("Maaf, hanya admin yang bisa memulai atau mengakhiri permainan Roulette.")
+            return
+
+        round_info = await get_roulette_round(channel_id)
+        if round_info is None or round_info["status"] != "betting":
+            await message.channel.send("Tidak ada permainan Roulette yang aktif untuk diputar. Mulai dengan `!roulette start`.")
+            return
+        
+        round_id = round_info["round_id"]
+        round_info["status"] = "spinning" # Tandai sebagai spinning
+
+        await channel_outbox.flush(message.channel) # Konfirmasi taruhan yang masih antre tampil sebelum roda diputar
+        await message.channel.send("🚫 **NO MORE BETS!** 🚫 Roda berputar... 🎡")
+        
+        # Hapus reaksi dari pesan pengumuman taruhan
+        if round_info["message_id"] != 0:
+            interactive_messages.pop(round_info["message_id"]) # Hapus dari pelacakan pesan
+            try:
+                roulette_msg = await message.channel.fetch_message(round_info["message_id"])
+                await roulette_msg.clear_reactions()
+            except discord.NotFound:
+                print(f"Pesan roulette {round_info['message_id']} tidak ditemukan saat clear reactions.")
+            except discord.Forbidden:
+                print("Bot tidak memiliki izin untuk menghapus reaksi.")
+        
+        winning_number = random.choice(list(ROULETTE_NUMBERS.keys()))
+        winning_color = ROULETTE_NUMBERS[winning_number]
+
+        await message.channel.send(f"⚪ **Angka pemenang: {winning_number} ({winning_color.upper()})!** ⚪")
+        print(f"DEBUG: Angka pemenang Roulette: {winning_number} ({winning_color.upper()}).")
+
+        # Proses taruhan: cukup satu lookup per pemain di buku eksposur putaran
+        total_winnings, total_lost_to_house = round_info["book"].settle(winning_number) # {user_id: kemenangan}, uang yang masuk ke bot
+        print(f"DEBUG: {len(total_winnings)} pemenang, {total_lost_to_house} koin masuk ke rumah.")
+        
+        # Distribusi kemenangan: semua saldo pemenang disimpan dalam satu transaksi
+        new_balances = await settle_roulette_round(round_id, total_winnings)
+        # Nama semua pemenang dicari sekaligus: biasanya dari cache member guild, tanpa panggilan REST
+        winners = await user_resolver.resolve_many(message.guild, total_winnings)
+        winner_mentions = []
+        for user_id_winner, winnings_amount in total_winnings.items():
+            new_cash = new_balances.get(user_id_winner)
+            if new_cash is not None:
+                winner = winners[user_id_winner]
+                winner_name = f"**{winner.display_name}**" if winner else f"<@{user_id_winner}>"
+                winner_mentions.append(f"🎉 {winner_name} menang **{winnings_amount} koin**! Saldo baru: **{new_cash} koin**.")
+            elif BALANCE_WRITE_THROUGH: # Seluruh pembayaran putaran tertunda di pending_credits
+                winner_mentions.append(f"⏳ <@{user_id_winner}> menang **{winnings_amount} koin**. Pembayaran tertunda karena gangguan database dan akan dicoba lagi otomatis.")
+            else:
+                winner_mentions.append(f"⚠️ **ERROR:** Gagal update cash untuk pemenang <@{user_id_winner}> di Roulette. Hubungi admin.")
+                print(f"ERROR: Gagal update cash untuk pemenang {user_id_winner} di Roulette.")
+        
+        if winner_mentions:
+            for result_message in split_message("--- **HASIL ROULETTE** ---", winner_mentions):
+                await message.channel.send(result_message)
+        else:
+            await message.channel.send(f"Tidak ada yang menang di putaran ini. Semua taruhan ({total_lost_to_house} koin) menjadi milik rumah.")
+        
+        del current_roulette_rounds[channel_id] # Hapus putaran aktif
+
+    else:
+        await message.channel.send("Format yang benar: `!roulette start` untuk memulai atau `!roulette spin` untuk memutar roda.")
+
+# --- Perintah !bet (untuk menempatkan taruhan di Roulette) ---
+@command('!bet')
+async def handle_bet(message: discord.Message):
+    user_id = message.author.id
+    parts = message.content.split(' ', 3) # !bet amount type choice
+    channel_id = message.channel.id
+
+    roulette_round = await get_roulette_round(channel_id)
+    if roulette_round is None or roulette_round["status"] != "betting":
+        await message.channel.send("Tidak ada putaran Roulette yang aktif di channel ini. Mulai dengan `!roulette start`.")
+        return
+    
+    if len(parts) < 3: # Minimal !bet <amount> <type>
+        await message.channel.send("Format taruhan tidak benar. Contoh: `!bet 100 merah` atau `!bet 20 angka 7`.")
+        return
+    
+    try:
+        bet_amount = int(parts[1])
+        if bet_amount <= 0:
+            await message.channel.send("Jumlah taruhan harus positif.")
+            return
+    except ValueError:
+        await message.channel.send("Jumlah taruhan harus berupa angka.")
+        return
+
+    bet_type_raw = parts[2].lower()
+    bet_choice = parts[3].lower() if len(parts) > 3 else "" # Pilihan taruhan
+
+    valid_bet = False
+    parsed_bet_type = None
+    parsed_bet_choice = None
+
+    if bet_type_raw in ['merah', 'hitam']:
+        parsed_bet_type = 'color'
+        parsed_bet_choice = bet_type_raw
+        valid_bet = True
+    elif bet_type_raw in ['genap', 'ganjil']:
+        parsed_bet_type = 'parity'
+        parsed_bet_choice = bet_type_raw
+        valid_bet = True
+    elif bet_type_raw in ['tinggi', 'rendah']:
+        parsed_bet_type = 'half'
+        parsed_bet_choice = bet_type_raw
+        valid_bet = True
+    elif bet_type_raw == 'angka':
+        try:
+            num_choice = int(bet_choice)
+            if 0 <= num_choice <= 36:
+                parsed_bet_type = 'number'
+                parsed_bet_choice = str(num_choice)
+                valid_bet = True
+        except ValueError:
+            pass # Tetap False
+    elif bet_type_raw in ['1st12', '2nd12', '3rd12']:
+        parsed_bet_type = 'dozen'
+        parsed_bet_choice = bet_type_raw
+        valid_bet = True
+    elif bet_type_raw in ['col1', 'col2', 'col3']:
+        parsed_bet_type = 'column'
+        parsed_bet_choice = bet_type_raw
+        valid_bet = True
+    
+    if not valid_bet:
+        await message.channel.send("Jenis taruhan tidak valid atau pilihan salah. Contoh: `!bet 100 merah`, `!bet 20 angka 7`, `!bet 50 genap`.")
+        return
+
+    # Kurangi uang (hanya jika cukup) dan simpan taruhan. Balasan dari sini digabung per channel oleh channel_outbox.
+    display_name = message.author.display_name
+    round_id = roulette_round["round_id"]
+    debit = await debit_if_sufficient(user_id, bet_amount, 'roulette_bet', round_id)
+    if debit is None:
+        channel_outbox.post(message.channel, f"**{display_name}**, gagal menempatkan taruhan. Terjadi kesalahan database.")
+        return
+    debited, new_cash = debit
+    if not debited:
+        channel_outbox.post(message.channel, f"**{display_name}**, uangmu tidak cukup untuk bertaruh **{bet_amount} koin**. Uangmu saat ini: {new_cash} koin.")
+        return
+
+    # Catat di buku eksposur putaran (sekaligus cek batas meja). Putaran bisa saja sudah diputar selama menunggu debit.
+    roulette_round = current_roulette_rounds.get(channel_id)
+    bet_code = roulette_bet_code(parsed_bet_type, parsed_bet_choice)
+    if roulette_round is None or roulette_round["round_id"] != round_id or roulette_round["status"] != "betting":
+        reject_reason = "putaran sudah ditutup"
+    else:
+        reject_reason = roulette_round["book"].reserve(user_id, bet_code, bet_amount)
+    if reject_reason:
+        await credit_cash(user_id, bet_amount, 'roulette_refund', round_id)
+        channel_outbox.post(message.channel, f"**{display_name}**, taruhan ditolak: {reject_reason}. Uangmu dikembalikan.")
+        return
+    
+    # Simpan juga di state lokal untuk mencegah duplikat taruhan emoji
+    if user_id not in roulette_round["bets"]: # Perbaikan: user_id bukan user.id
+        roulette_round["bets"][user_id] = [] # Perbaikan: user_id bukan user.id
+    roulette_round["bets"][user_id].append({"amount": bet_amount, "bet_type": parsed_bet_type, "bet_choice": parsed_bet_choice}) # Perbaikan: user_id
+    interactive_messages.save(roulette_round["message_id"])
+
+    channel_outbox.post(
+        message.channel,
+        f"**{display_name}** berhasil menempatkan taruhan **{bet_amount} koin** "
+        f"pada **{parsed_bet_type.upper()} - {parsed_bet_choice.upper()}**."
+        f" Uang Anda sekarang: **{new_cash} koin**."
+    )
+    print(f"{message.author.name} bertaruh {bet_amount} di roulette: {parsed_bet_type}/{parsed_bet_choice}.")
+
+# --- Jalankan Bot dengan Token ---
+async def main():
+    async with client:
+        try:
+            await client.start(TOKEN)
+        finally:
+            permissions.close()
+            await interactive_messages.close() # Game yang belum selesai di-refund/hangus dulu
+            await balance_cache.close() # Pastikan saldo yang belum tersimpan ditulis sebelum keluar
+            await pending_credits.close()
+            if traffic_recorder is not None:
+                traffic_recorder.close()
+
+if __name__ == '__main__':
+    discord.utils.setup_logging()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        db_pool.close()
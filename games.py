@@ -0,0 +1,323 @@
+# Logika permainan (Blackjack, Flip Coin, Roulette) tanpa ketergantungan ke Discord atau database,
+# supaya bisa dipakai bot.py sekaligus dijalankan offline oleh simulate.py.
+import random
+try:
+    import numpy as np # Opsional: mempercepat simulate.py (flip coin dan roulette)
+except ImportError:
+    np = None
+
+# --- Kelas dan Fungsi untuk Logika Permainan Blackjack ---
+# Kartu disimpan sebagai bilangan bulat 0-51 (suit * 13 + rank). Nilai dan teks setiap kartu dihitung
+# sekali di tabel di bawah, jadi menghitung total atau menampilkan kartu cukup satu indeks tuple.
+CARD_SUITS = ['♠️', '♥️', '♦️', '♣️']
+CARD_RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+CARD_COUNT = len(CARD_SUITS) * len(CARD_RANKS)
+CARD_VALUES = tuple(11 if rank == 'A' else 10 if rank in ('J', 'Q', 'K') else int(rank) for suit in CARD_SUITS for rank in CARD_RANKS)
+CARD_LABELS = tuple(f"{rank}{suit}" for suit in CARD_SUITS for rank in CARD_RANKS)
+ACE_VALUE = 11
+
+class BlackjackHand:
+    """Kartu di satu tangan beserta total yang diperbarui setiap kartu masuk (tanpa menghitung ulang)."""
+    __slots__ = ('cards', 'total', 'soft_aces')
+
+    def __init__(self):
+        self.cards = []
+        self.total = 0
+        self.soft_aces = 0 # As yang masih dihitung 11 dan bisa diturunkan jadi 1
+
+    def add(self, card: int):
+        self.cards.append(card)
+        value = CARD_VALUES[card]
+        self.total += value
+        if value == ACE_VALUE:
+            self.soft_aces += 1
+        while self.total > 21 and self.soft_aces:
+            self.total -= 10
+            self.soft_aces -= 1
+
+    def __str__(self):
+        return ' '.join([CARD_LABELS[card] for card in self.cards])
+
+class BlackjackShoe:
+    """Shoe berisi beberapa dek yang dipakai bersama banyak game, seperti di meja kasino.
+
+    Dikocok sekali lalu dibagikan sampai kartu potong (penetration) tercapai; setelah itu shoe
+    dikocok ulang di awal tangan berikutnya, memakai ulang list yang sama tanpa alokasi baru.
+    """
+    __slots__ = ('_base', 'cards', 'cut')
+
+    def __init__(self, decks: int, penetration: float):
+        self._base = list(range(CARD_COUNT)) * max(1, decks)
+        self.cards = []
+        penetration = min(max(penetration, 0.1), 1.0)
+        self.cut = int(len(self._base) * (1 - penetration)) # Sisa kartu saat kartu potong tercapai
+        self.shuffle()
+
+    def shuffle(self):
+        self.cards[:] = self._base
+        random.shuffle(self.cards)
+
+    def start_hand(self):
+        """Dipanggil sebelum tangan baru dibagikan: kocok ulang jika kartu potong sudah lewat."""
+        if len(self.cards) <= self.cut:
+            self.shuffle()
+
+    def pop(self) -> int:
+        if not self.cards: # Banyak tangan berjalan bersamaan dan shoe habis sebelum tangan baru dimulai
+            self.shuffle()
+        return self.cards.pop()
+
+class BlackjackGame:
+    __slots__ = ('player_id', 'bet_amount', 'shoe', 'deck', 'player_hand', 'dealer_hand', 'game_active')
+
+    def __init__(self, player_id: int, bet_amount: int, shoe: BlackjackShoe | None = None):
+        self.player_id = player_id
+        self.bet_amount = bet_amount
+        self.shoe = shoe
+        self.deck = shoe if shoe is not None else self._create_shuffled_deck() # Keduanya cukup punya pop()
+        self.player_hand = BlackjackHand()
+        self.dealer_hand = BlackjackHand()
+        self.game_active = False
+
+    def _create_shuffled_deck(self):
+        deck = list(range(CARD_COUNT))
+        random.shuffle(deck)
+        return deck
+
+    def _deal_card(self, hand: BlackjackHand):
+        card = self.deck.pop()
+        hand.add(card)
+        return card
+
+    def start_game(self):
+        self.game_active = True
+        if self.shoe is not None:
+            self.shoe.start_hand()
+        self.player_hand = BlackjackHand()
+        self.dealer_hand = BlackjackHand()
+        self._deal_card(self.player_hand)
+        self._deal_card(self.dealer_hand)
+        self._deal_card(self.player_hand)
+        self._deal_card(self.dealer_hand)
+
+        if self.player_hand.total == 21:
+            self.game_active = False
+            return "blackjack_player"
+        return "game_started"
+
+    def hit(self):
+        if not self.game_active: # Game sudah selesai
+            return None
+        self._deal_card(self.player_hand)
+        if self.player_hand.total > 21:
+            self.game_active = False
+            return "bust"
+        return "continue"
+
+    def stand(self):
+        if not self.game_active: # Game sudah selesai dan dibayar, jangan diselesaikan dua kali
+            return None
+        self.game_active = False
+        while self.dealer_hand.total < 17:
+            self._deal_card(self.dealer_hand)
+        
+        player_score = self.player_hand.total
+        dealer_score = self.dealer_hand.total
+
+        if dealer_score > 21:
+            return "dealer_bust"
+        elif player_score > dealer_score:
+            return "player_win"
+        elif dealer_score > player_score: # PERBAIKAN BUG: sebelumnya (dealer_score > dealer_score)
+            return "dealer_win"
+        else:
+            return "tie"
+            
+    def to_state(self) -> list:
+        """State ringkas yang bisa di-serialize: [pemain, taruhan, kartu pemain, kartu dealer, sisa dek atau None].
+
+        Game yang memakai shoe bersama tidak menyimpan deknya; shoe dipasang lagi saat from_state().
+        """
+        deck = None if self.shoe is not None else list(self.deck)
+        return [self.player_id, self.bet_amount, self.player_hand.cards, self.dealer_hand.cards, deck]
+
+    @classmethod
+    def from_state(cls, state: list, shoe: BlackjackShoe | None = None) -> 'BlackjackGame':
+        player_id, bet_amount, player_cards, dealer_cards, deck = state
+        game = cls(player_id, bet_amount, shoe if deck is None else None)
+        if deck is not None:
+            game.deck = deck
+        for card in player_cards:
+            game.player_hand.add(card)
+        for card in dealer_cards:
+            game.dealer_hand.add(card)
+        game.game_active = True
+        return game
+
+    def get_player_hand_str(self):
+        return str(self.player_hand)
+
+    def get_dealer_hand_str(self, hidden=False):
+        if hidden:
+            return f"{CARD_LABELS[self.dealer_hand.cards[0]]} [HIDDEN CARD]"
+        else:
+            return str(self.dealer_hand)
+
+# Total yang dibayarkan kembali ke pemain (kelipatan taruhan) untuk setiap hasil akhir Blackjack
+BLACKJACK_RETURN_MULTIPLIERS = {
+    "blackjack_player": 2,
+    "dealer_bust": 2,
+    "player_win": 2,
+    "tie": 1,
+    "dealer_win": 0,
+    "bust": 0
+}
+
+# --- Kelas untuk Logika Permainan Flip Coin ---
+FLIPCOIN_SIDES = ('kepala', 'ekor')
+FLIPCOIN_RETURN_MULTIPLIER = 2 # Jika menang, taruhan dibayar kembali dua kali lipat
+
+class FlipCoinGame:
+    def __init__(self, player_id: int, bet_amount: int):
+        self.player_id = player_id
+        self.bet_amount = bet_amount
+        self.game_active = True # Game aktif sampai pemain memilih
+        self.player_choice = None # Pilihan pemain akan disimpan di sini
+
+    def to_state(self) -> list:
+        return [self.player_id, self.bet_amount]
+
+    @classmethod
+    def from_state(cls, state: list) -> 'FlipCoinGame':
+        return cls(*state)
+
+    def flip(self, choice: str) -> tuple[str, int]:
+        """Melempar koin untuk pilihan pemain. Mengembalikan (sisi_koin, total_dibayar_ke_pemain)."""
+        self.player_choice = choice
+        self.game_active = False # Tandai game tidak lagi aktif menunggu pilihan
+        coin_result = random.choice(FLIPCOIN_SIDES)
+        if choice == coin_result:
+            return coin_result, self.bet_amount * FLIPCOIN_RETURN_MULTIPLIER
+        return coin_result, 0
+
+# --- Roulette Game Constants ---
+ROULETTE_NUMBERS = {
+    0: 'hijau',
+    1: 'merah', 2: 'hitam', 3: 'merah', 4: 'hitam', 5: 'merah', 6: 'hitam',
+    7: 'merah', 8: 'hitam', 9: 'merah', 10: 'hitam', 11: 'hitam', 12: 'merah',
+    13: 'hitam', 14: 'merah', 15: 'hitam', 16: 'merah', 17: 'hitam', 18: 'merah',
+    19: 'merah', 20: 'hitam', 21: 'merah', 22: 'hitam', 23: 'merah', 24: 'hitam',
+    25: 'merah', 26: 'hitam', 27: 'merah', 28: 'hitam', 29: 'hitam', 30: 'merah',
+    31: 'hitam', 32: 'merah', 33: 'hitam', 34: 'merah', 35: 'hitam', 36: 'merah'
+}
+
+# Mapping untuk taruhan Dozens dan Columns
+ROULETTE_DOZENS = {
+    '1st12': list(range(1, 13)),   # 1-12
+    '2nd12': list(range(13, 25)),  # 13-24
+    '3rd12': list(range(25, 37))   # 25-36
+}
+ROULETTE_COLUMNS = { # (1, 4, 7...34), (2, 5, 8...35), (3, 6, 9...36)
+    'col1': [n for n in range(1, 37) if n % 3 == 1],
+    'col2': [n for n in range(1, 37) if n % 3 == 2],
+    'col3': [n for n in range(1, 37) if n % 3 == 0]
+}
+
+# Pembayaran (Payouts)
+ROULETTE_PAYOUTS = {
+    'number': 35,  # 1 to 1 for a single number (35:1)
+    'color': 1,    # 1 to 1 (1:1)
+    'parity': 1,   # 1 to 1 (1:1) (odd/even)
+    'half': 1,     # 1 to 1 (1:1) (high/low)
+    'dozen': 2,    # 2 to 1 (2:1)
+    'column': 2    # 2 to 1 (2:1)
+}
+
+# --- Mesin Pembayaran Roulette (tabel pengali yang dihitung sekali) ---
+# Setiap pasangan (bet_type, bet_choice) mendapat kode bilangan bulat. ROULETTE_PAYOUT_TABLE[kode][angka]
+# berisi pengali total yang dibayar (taruhan kembali + keuntungan) jika `angka` keluar, atau 0 jika kalah.
+# Penyelesaian satu putaran cukup mengambil satu kolom tabel, tanpa perbandingan string per taruhan.
+def _roulette_bet_wins(bet_type: str, bet_choice: str, number: int) -> bool:
+    if bet_type == 'number':
+        return str(number) == bet_choice
+    if bet_type == 'color':
+        return ROULETTE_NUMBERS[number] == bet_choice
+    if bet_type == 'parity':
+        return number != 0 and bet_choice == ('genap' if number % 2 == 0 else 'ganjil')
+    if bet_type == 'half':
+        return number != 0 and bet_choice == ('tinggi' if number >= 19 else 'rendah')
+    if bet_type == 'dozen':
+        return number in ROULETTE_DOZENS.get(bet_choice, [])
+    if bet_type == 'column':
+        return number in ROULETTE_COLUMNS.get(bet_choice, [])
+    return False
+
+ROULETTE_BET_OPTIONS = (
+    [('number', str(n)) for n in ROULETTE_NUMBERS]
+    + [('color', 'merah'), ('color', 'hitam')]
+    + [('parity', 'genap'), ('parity', 'ganjil')]
+    + [('half', 'tinggi'), ('half', 'rendah')]
+    + [('dozen', choice) for choice in ROULETTE_DOZENS]
+    + [('column', choice) for choice in ROULETTE_COLUMNS]
+)
+ROULETTE_BET_CODES = {option: code for code, option in enumerate(ROULETTE_BET_OPTIONS)} # {(bet_type, bet_choice): kode}
+ROULETTE_LOSING_CODE = len(ROULETTE_BET_OPTIONS) # Kode untuk taruhan tidak dikenal: selalu kalah
+ROULETTE_PAYOUT_TABLE = [
+    [1 + ROULETTE_PAYOUTS[bet_type] if _roulette_bet_wins(bet_type, bet_choice, n) else 0 for n in range(len(ROULETTE_NUMBERS))]
+    for bet_type, bet_choice in ROULETTE_BET_OPTIONS
+] + [[0] * len(ROULETTE_NUMBERS)]
+ROULETTE_PAYOUT_ARRAY = np.array(ROULETTE_PAYOUT_TABLE, dtype=np.int64) if np is not None else None # Untuk simulate.py
+
+def roulette_bet_code(bet_type: str, bet_choice: str) -> int:
+    return ROULETTE_BET_CODES.get((bet_type, bet_choice), ROULETTE_LOSING_CODE)
+
+class RouletteBook:
+    """Buku eksposur satu putaran roulette.
+
+    `exposure[n]` adalah total yang harus dibayar rumah jika angka n keluar, diperbarui setiap ada
+    taruhan yang diterima (menambah satu baris ROULETTE_PAYOUT_TABLE). Hal yang sama disimpan per
+    pengguna, sehingga penyelesaian putaran cukup membaca satu indeks per pemenang tanpa membaca
+    ulang tabel `roulette_bets`. Batas eksposur diperiksa saat taruhan dipasang.
+    """
+
+    def __init__(self, max_number_exposure: int = 0, max_round_exposure: int = 0):
+        self.max_number_exposure = max_number_exposure # batas pembayaran jika satu angka keluar (0 = tanpa batas)
+        self.max_round_exposure = max_round_exposure # batas kerugian bersih terburuk rumah (0 = tanpa batas)
+        self.exposure = [0] * len(ROULETTE_NUMBERS)
+        self.winning_stakes = [0] * len(ROULETTE_NUMBERS) # total taruhan yang menang jika angka n keluar
+        self.user_exposure = {} # {user_id: [pembayaran jika angka n keluar]}
+        self.user_stakes = {} # {user_id: total taruhan}, untuk mengembalikan taruhan jika putaran dibatalkan
+        self.total_staked = 0
+
+    def reserve(self, user_id: int, code: int, amount: int) -> str | None:
+        """Mencatat taruhan jika masih di dalam batas. Mengembalikan alasan penolakan, atau None jika diterima."""
+        row = ROULETTE_PAYOUT_TABLE[code]
+        worst_payout = max(exposure + amount * multiplier for exposure, multiplier in zip(self.exposure, row))
+        if self.max_number_exposure and worst_payout > self.max_number_exposure:
+            return f"batas pembayaran per angka ({self.max_number_exposure} koin) akan terlampaui"
+        if self.max_round_exposure and worst_payout - (self.total_staked + amount) > self.max_round_exposure:
+            return f"batas risiko putaran ({self.max_round_exposure} koin) akan terlampaui"
+        self._apply(user_id, row, amount)
+        return None
+
+    def record(self, user_id: int, code: int, amount: int):
+        """Mencatat taruhan tanpa memeriksa batas, untuk membangun ulang buku dari taruhan yang sudah diterima."""
+        self._apply(user_id, ROULETTE_PAYOUT_TABLE[code], amount)
+
+    def _apply(self, user_id: int, row: list[int], amount: int):
+        user_exposure = self.user_exposure.get(user_id)
+        if user_exposure is None:
+            user_exposure = self.user_exposure[user_id] = [0] * len(ROULETTE_NUMBERS)
+        for n, multiplier in enumerate(row):
+            if multiplier:
+                payout = amount * multiplier
+                self.exposure[n] += payout
+                self.winning_stakes[n] += amount
+                user_exposure[n] += payout
+        self.user_stakes[user_id] = self.user_stakes.get(user_id, 0) + amount
+        self.total_staked += amount
+
+    def settle(self, winning_number: int) -> tuple[dict[int, int], int]:
+        """Mengembalikan ({user_id: total_kemenangan}, total_kalah_ke_rumah) untuk angka pemenang."""
+        total_winnings = {user_id: exposure[winning_number] for user_id, exposure in self.user_exposure.items() if exposure[winning_number] > 0}
+        return total_winnings, self.total_staked - self.winning_stakes[winning_number]
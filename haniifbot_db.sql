@@ -40,6 +40,32 @@ INSERT INTO `bot_admins` (`user_id`) VALUES
 
 -- --------------------------------------------------------
 
+--
+-- Struktur dari tabel `bot_admin_roles`
+--
+
+CREATE TABLE `bot_admin_roles` (
+  `role_id` bigint(20) NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- --------------------------------------------------------
+
+--
+-- Struktur dari tabel `cash_ledger`
+--
+
+CREATE TABLE `cash_ledger` (
+  `ledger_id` bigint(20) NOT NULL,
+  `user_id` bigint(20) NOT NULL,
+  `amount` int(11) NOT NULL,
+  `balance_after` int(11) NOT NULL,
+  `reason` varchar(32) NOT NULL,
+  `ref` varchar(64) DEFAULT NULL,
+  `created_at` datetime NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- --------------------------------------------------------
+
 --
 -- Struktur dari tabel `events`
 --
@@ -91,6 +117,36 @@ INSERT INTO `event_participants` (`participant_id`, `event_id`, `user_id`, `choi
 
 -- --------------------------------------------------------
 
+--
+-- Struktur dari tabel `game_state`
+--
+
+CREATE TABLE `game_state` (
+  `message_id` bigint(20) NOT NULL,
+  `kind` varchar(16) NOT NULL,
+  `owner_id` bigint(20) DEFAULT NULL,
+  `channel_id` bigint(20) NOT NULL,
+  `expires_at` double NOT NULL,
+  `state` mediumtext NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- --------------------------------------------------------
+
+--
+-- Struktur dari tabel `roulette_bets`
+--
+
+CREATE TABLE `roulette_bets` (
+  `bet_id` bigint(20) NOT NULL,
+  `round_id` varchar(32) NOT NULL,
+  `user_id` bigint(20) NOT NULL,
+  `bet_type` varchar(16) NOT NULL,
+  `bet_choice` varchar(16) NOT NULL,
+  `amount` int(11) NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- --------------------------------------------------------
+
 --
 -- Struktur dari tabel `users_cash`
 --
@@ -120,6 +176,19 @@ INSERT INTO `users_cash` (`user_id`, `cash`, `last_daily_claim`) VALUES
 ALTER TABLE `bot_admins`
   ADD PRIMARY KEY (`user_id`);
 
+--
+-- Indeks untuk tabel `bot_admin_roles`
+--
+ALTER TABLE `bot_admin_roles`
+  ADD PRIMARY KEY (`role_id`);
+
+--
+-- Indeks untuk tabel `cash_ledger`
+--
+ALTER TABLE `cash_ledger`
+  ADD PRIMARY KEY (`ledger_id`),
+  ADD KEY `user_id` (`user_id`,`created_at`);
+
 --
 -- Indeks untuk tabel `events`
 --
@@ -133,16 +202,39 @@ ALTER TABLE `event_participants`
   ADD PRIMARY KEY (`participant_id`),
   ADD UNIQUE KEY `event_id` (`event_id`,`user_id`);
 
+--
+-- Indeks untuk tabel `game_state`
+--
+ALTER TABLE `game_state`
+  ADD PRIMARY KEY (`message_id`),
+  ADD KEY `channel` (`kind`,`channel_id`),
+  ADD KEY `owner` (`kind`,`owner_id`),
+  ADD KEY `expires_at` (`expires_at`);
+
+--
+-- Indeks untuk tabel `roulette_bets`
+--
+ALTER TABLE `roulette_bets`
+  ADD PRIMARY KEY (`bet_id`),
+  ADD KEY `round_id` (`round_id`);
+
 --
 -- Indeks untuk tabel `users_cash`
 --
 ALTER TABLE `users_cash`
-  ADD PRIMARY KEY (`user_id`);
+  ADD PRIMARY KEY (`user_id`),
+  ADD KEY `cash` (`cash`);
 
 --
 -- AUTO_INCREMENT untuk tabel yang dibuang
 --
 
+--
+-- AUTO_INCREMENT untuk tabel `cash_ledger`
+--
+ALTER TABLE `cash_ledger`
+  MODIFY `ledger_id` bigint(20) NOT NULL AUTO_INCREMENT;
+
 --
 -- AUTO_INCREMENT untuk tabel `events`
 --
@@ -155,6 +247,12 @@ ALTER TABLE `events`
 ALTER TABLE `event_participants`
   MODIFY `participant_id` int(11) NOT NULL AUTO_INCREMENT, AUTO_INCREMENT=2;
 
+--
+-- AUTO_INCREMENT untuk tabel `roulette_bets`
+--
+ALTER TABLE `roulette_bets`
+  MODIFY `bet_id` bigint(20) NOT NULL AUTO_INCREMENT;
+
 --
 -- Ketidakleluasaan untuk tabel pelimpahan (Dumped Tables)
 --
@@ -0,0 +1,385 @@
+# Uji beban tanpa Discord: pesan dan reaksi sintetis dimasukkan langsung ke on_message/on_reaction_add
+# milik bot.py lewat channel, member dan client pengganti, sementara database tetap memakai helper asli
+# bot (DatabasePool, BalanceCache, ...). Melaporkan perintah per detik, latensi p50/p99 per perintah,
+# serta jumlah statement SQL (cursor.execute) dan panggilan API Discord per perintah.
+#
+# Gunakan database uji lokal yang terpisah dari produksi (misalnya DB_BACKEND=sqlite dengan SQLITE_PATH sementara),
+# karena saldo pengguna sintetis benar-benar ditulis ke database. Token Discord tidak diperlukan.
+#
+# Contoh:
+#   python loadtest.py --users 200 --channels 4 --rounds 5
+#   python loadtest.py --users 500 --concurrency 100 --api-latency 0.05 --mode reactions
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import itertools
+import os
+import random
+import time
+from collections import defaultdict
+
+os.environ.setdefault('DISCORD_TOKEN', 'loadtest') # bot.py tidak pernah login saat diimpor di sini
+import bot
+
+# Label perintah yang sedang dijalankan, dipakai untuk menghitung statement SQL dan panggilan API per perintah.
+# Task latar belakang (flush saldo, reaper, outbox) yang dibuat di luar perintah tercatat sebagai BACKGROUND.
+BACKGROUND = "(latar belakang)"
+current_label = contextvars.ContextVar('current_label', default=BACKGROUND)
+
+# --- Objek Discord pengganti ---
+# Hanya atribut dan method yang benar-benar dipakai handler bot.py yang disediakan.
+
+class FakeStats:
+    """Penghitung statement SQL dan panggilan API per label perintah."""
+
+    def __init__(self, api_latency: float):
+        self.api_latency = api_latency
+        self.db_calls = defaultdict(int)
+        self.api_calls = defaultdict(int)
+
+    async def api_call(self):
+        self.api_calls[current_label.get()] += 1
+        if self.api_latency:
+            await asyncio.sleep(self.api_latency)
+
+class FakeRole:
+    def __init__(self, role_id: int):
+        self.id = role_id
+
+class FakeGuild:
+    def __init__(self, guild_id: int):
+        self.id = guild_id
+        self.name = f"guild-{guild_id}"
+        self.members = {}
+
+    def get_member(self, user_id: int):
+        return self.members.get(user_id)
+
+class FakeMember:
+    def __init__(self, user_id: int, guild: FakeGuild, role_ids=()):
+        self.id = user_id
+        self.name = f"user{user_id}"
+        self.display_name = f"User {user_id}"
+        self.global_name = self.display_name
+        self.mention = f"<@{user_id}>"
+        self.bot = False
+        self.guild = guild
+        self._roles = {role_id: FakeRole(role_id) for role_id in role_ids}
+        self.roles = list(self._roles.values())
+        guild.members[user_id] = self
+
+    def get_role(self, role_id: int):
+        return self._roles.get(role_id)
+
+    def add_role(self, role_id: int):
+        if role_id not in self._roles:
+            self._roles[role_id] = FakeRole(role_id)
+            self.roles = list(self._roles.values())
+
+    def __eq__(self, other):
+        return getattr(other, 'id', None) == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+class FakeMessage:
+    _ids = itertools.count(1)
+
+    def __init__(self, channel, content: str, author=None, view=None):
+        self.id = next(FakeMessage._ids)
+        self.channel = channel
+        self.guild = channel.guild
+        self.content = content
+        self.author = author
+        self.mentions = []
+        self.view = view
+
+    async def add_reaction(self, emoji):
+        await self.channel.stats.api_call()
+
+    async def remove_reaction(self, emoji, user):
+        await self.channel.stats.api_call()
+
+    async def clear_reactions(self):
+        await self.channel.stats.api_call()
+
+    async def edit(self, content=None, view=None, **kwargs):
+        await self.channel.stats.api_call()
+        if content is not None:
+            self.content = content
+        self.view = view
+
+class FakeChannel:
+    def __init__(self, channel_id: int, guild: FakeGuild, stats: FakeStats):
+        self.id = channel_id
+        self.name = f"channel-{channel_id}"
+        self.guild = guild
+        self.stats = stats
+        self.messages = {}
+        self.sent = 0
+
+    async def send(self, content=None, view=None, **kwargs):
+        await self.stats.api_call()
+        self.sent += 1
+        message = FakeMessage(self, content or "", view=view)
+        self.messages[message.id] = message
+        return message
+
+    async def fetch_message(self, message_id: int):
+        await self.stats.api_call()
+        return self.messages[message_id]
+
+class FakeReaction:
+    def __init__(self, message: FakeMessage, emoji: str):
+        self.message = message
+        self.emoji = emoji
+
+class FakeResponse:
+    def __init__(self, interaction):
+        self.interaction = interaction
+
+    async def edit_message(self, content=None, view=None, **kwargs):
+        await self.interaction.message.channel.stats.api_call()
+        if content is not None:
+            self.interaction.message.content = content
+        self.interaction.message.view = view
+
+    async def send_message(self, content=None, **kwargs):
+        await self.interaction.message.channel.stats.api_call()
+
+class FakeInteraction:
+    def __init__(self, user: FakeMember, message: FakeMessage, custom_id: str | None = None):
+        self.user = user
+        self.message = message
+        self.data = {'custom_id': custom_id}
+        self.response = FakeResponse(self)
+
+async def click(view, button, user: FakeMember):
+    """Meniru klik tombol: interaction_check dulu, lalu callback tombol seperti yang dilakukan discord.py."""
+    interaction = FakeInteraction(user, view.message, button.custom_id)
+    if await view.interaction_check(interaction):
+        await button.callback(interaction)
+
+class CountingCursor:
+    """Cursor database yang menambah counter[0] setiap kali execute() dipanggil."""
+
+    def __init__(self, cursor, counter: list):
+        self._cursor = cursor
+        self._counter = counter
+
+    def __enter__(self):
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._cursor.__exit__(*exc_info)
+
+    def execute(self, *args, **kwargs):
+        self._counter[0] += 1
+        return self._cursor.execute(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+class CountingConnection:
+    """Koneksi database yang cursor-nya menghitung statement SQL yang benar-benar dikirim."""
+
+    def __init__(self, conn, counter: list):
+        self._conn = conn
+        self._counter = counter
+
+    def cursor(self, *args, **kwargs):
+        return CountingCursor(self._conn.cursor(*args, **kwargs), self._counter)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+def count_statements(fn, counter: list):
+    """Membungkus helper database fn(conn, ...) agar setiap cursor.execute di dalamnya menambah counter[0].
+
+    Penghitung ditambah di thread database dan baru dibaca setelah db_pool.run selesai, jadi tidak perlu lock.
+    """
+    def counted(conn, *args):
+        return fn(CountingConnection(conn, counter), *args)
+    return counted
+
+def install_fake_client(channels: dict, stats: FakeStats):
+    """Mengganti method client yang dipanggil bot di luar handler (get_channel, fetch_user, ...)."""
+    bot.client.get_channel = channels.get
+    bot.client.get_user = lambda user_id: None
+
+    async def fetch_user(user_id):
+        await stats.api_call()
+        raise bot.discord.NotFound(type('Response', (), {'status': 404, 'reason': 'Not Found'})(), "loadtest")
+    bot.client.fetch_user = fetch_user
+
+    real_run = bot.db_pool.run
+    async def counting_run(fn, *args):
+        label = current_label.get()
+        counter = [0]
+        try:
+            return await real_run(count_statements(fn, counter), *args)
+        finally:
+            stats.db_calls[label] += counter[0]
+    bot.db_pool.run = counting_run
+
+# --- Skenario ---
+
+class LoadTest:
+    def __init__(self, args, stats: FakeStats):
+        self.args = args
+        self.stats = stats
+        self.latencies = defaultdict(list) # {label: [detik]}
+        self.semaphore = asyncio.Semaphore(args.concurrency)
+        admin_role = next(iter(bot.permissions.admin_role_ids), 1)
+        self.guild = FakeGuild(1)
+        self.channels = {1000 + i: FakeChannel(1000 + i, self.guild, stats) for i in range(args.channels)}
+        self.admin = FakeMember(1, self.guild, role_ids=(admin_role,))
+        self.users = [FakeMember(10_000 + i, self.guild) for i in range(args.users)]
+
+    async def timed(self, label: str, coro):
+        """Menjalankan satu panggilan handler di bawah label dan mencatat latensinya."""
+        async with self.semaphore:
+            token = current_label.set(label)
+            started = time.perf_counter()
+            try:
+                await coro
+            finally:
+                self.latencies[label].append(time.perf_counter() - started)
+                current_label.reset(token)
+
+    async def play_blackjack(self, channel: FakeChannel, user: FakeMember):
+        await self.timed('!bj', bot.on_message(FakeMessage(channel, f"!bj {self.args.bet}", user)))
+        while True:
+            entry = bot.interactive_messages.find('blackjack', user.id)
+            if entry is None:
+                return
+            hit = entry.state.player_hand.total < self.args.stand_on
+            if entry.view is not None:
+                button = entry.view.hit_button if hit else entry.view.stand_button
+                await self.timed('tombol blackjack', click(entry.view, button, user))
+            else:
+                message = channel.messages[entry.message_id]
+                reaction = FakeReaction(message, '✅' if hit else '🟥')
+                await self.timed('reaksi blackjack', bot.on_reaction_add(reaction, user))
+
+    async def play_flipcoin(self, channel: FakeChannel, user: FakeMember):
+        await self.timed('!fc', bot.on_message(FakeMessage(channel, f"!fc {self.args.bet}", user)))
+        entry = bot.interactive_messages.find('flipcoin', user.id)
+        if entry is None:
+            return
+        if entry.view is not None:
+            button = random.choice((entry.view.head_button, entry.view.tail_button))
+            await self.timed('tombol flip coin', click(entry.view, button, user))
+        else:
+            reaction = FakeReaction(channel.messages[entry.message_id], random.choice((bot.FLIPCOIN_HEAD_EMOJI, bot.FLIPCOIN_TAIL_EMOJI)))
+            await self.timed('reaksi flip coin', bot.on_reaction_add(reaction, user))
+
+    async def play_roulette(self, channel: FakeChannel, players: list[FakeMember]):
+        await self.timed('!roulette start', bot.on_message(FakeMessage(channel, "!roulette start", self.admin)))
+        round_message = channel.messages[bot.current_roulette_rounds[channel.id]["message_id"]]
+
+        async def place(user):
+            if random.random() < self.args.emoji_bet_ratio:
+                reaction = FakeReaction(round_message, random.choice((bot.ROULETTE_RED_EMOJI, bot.ROULETTE_BLACK_EMOJI)))
+                await self.timed('reaksi roulette', bot.on_reaction_add(reaction, user))
+            else:
+                bet_type, bet_choice = random.choice(self.args.roulette_bets)
+                content = f"!bet {self.args.bet} {bet_type} {bet_choice}".rstrip()
+                await self.timed('!bet', bot.on_message(FakeMessage(channel, content, user)))
+        await asyncio.gather(*(place(user) for user in players))
+        await self.timed('!roulette spin', bot.on_message(FakeMessage(channel, "!roulette spin", self.admin)))
+
+    async def seed(self):
+        """Memberi saldo awal ke semua pengguna sintetis (tidak ikut diukur)."""
+        for user in self.users:
+            await bot.credit_cash(user.id, self.args.starting_cash, 'loadtest')
+        await bot.balance_cache.flush()
+
+    async def run_round(self):
+        channels = list(self.channels.values())
+        by_channel = defaultdict(list)
+        for i, user in enumerate(self.users):
+            by_channel[channels[i % len(channels)].id].append(user)
+
+        await asyncio.gather(*(self.timed('!daily', bot.on_message(FakeMessage(self.channels[cid], "!daily", user)))
+                               for cid, users in by_channel.items() for user in users))
+        await asyncio.gather(*(self.play_blackjack(self.channels[cid], user) for cid, users in by_channel.items() for user in users))
+        await asyncio.gather(*(self.play_flipcoin(self.channels[cid], user) for cid, users in by_channel.items() for user in users))
+        await asyncio.gather(*(self.play_roulette(self.channels[cid], users) for cid, users in by_channel.items()))
+
+# --- Laporan ---
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def report(test: LoadTest, stats: FakeStats, elapsed: float):
+    total = sum(len(values) for values in test.latencies.values())
+    print(f"Total {total:,} panggilan handler dalam {elapsed:.2f} detik: {total / elapsed:,.0f} perintah/detik")
+    print(f"{'perintah':<20}{'jumlah':>9}{'p50 ms':>10}{'p99 ms':>10}{'maks ms':>10}{'DB/perintah':>13}{'API/perintah':>14}")
+    for label in sorted(test.latencies):
+        values = sorted(test.latencies[label])
+        count = len(values)
+        print(f"{label:<20}{count:>9,}{percentile(values, 0.5) * 1000:>10.2f}{percentile(values, 0.99) * 1000:>10.2f}"
+              f"{values[-1] * 1000:>10.2f}{stats.db_calls[label] / count:>13.2f}{stats.api_calls[label] / count:>14.2f}")
+    print(f"{BACKGROUND:<20}{'':>9}{'':>10}{'':>10}{'':>10}{stats.db_calls[BACKGROUND]:>13,}{stats.api_calls[BACKGROUND]:>14,}  (total)")
+
+def parse_roulette_bet(text: str) -> tuple[str, str]:
+    parts = text.split(maxsplit=1)
+    return parts[0], parts[1] if len(parts) > 1 else ""
+
+async def run(args):
+    stats = FakeStats(args.api_latency)
+    await bot.setup_hook()
+    test = LoadTest(args, stats)
+    install_fake_client(test.channels, stats)
+    bot.GAME_INTERACTION_MODE = args.mode
+    bot.rate_limiter.enabled = False # Skenario mengirim perintah secepat mungkin dan butuh setiap balasannya
+    try:
+        await test.seed()
+        stats.db_calls.clear()
+        stats.api_calls.clear()
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            await test.run_round()
+        await bot.balance_cache.flush() # Tulis saldo yang tersisa supaya biaya flush ikut terukur
+        elapsed = time.perf_counter() - started
+    finally:
+        bot.permissions.close()
+        await bot.interactive_messages.close()
+        await bot.balance_cache.close()
+        await bot.pending_credits.close()
+        bot.db_pool.close()
+    return test, stats, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Uji beban handler HANIIF BOT dengan client Discord pengganti.")
+    parser.add_argument('--users', type=int, default=100, help="jumlah pengguna sintetis")
+    parser.add_argument('--channels', type=int, default=2, help="jumlah channel (satu meja roulette per channel)")
+    parser.add_argument('--rounds', type=int, default=3, help="berapa kali skenario (!daily, !bj, !fc, roulette) diulang")
+    parser.add_argument('--concurrency', type=int, default=50, help="panggilan handler maksimum yang berjalan bersamaan")
+    parser.add_argument('--api-latency', type=float, default=0.0, help="detik tunda untuk setiap panggilan API Discord tiruan")
+    parser.add_argument('--mode', choices=['buttons', 'reactions'], default=bot.GAME_INTERACTION_MODE, help="cara memainkan Blackjack dan Flip Coin")
+    parser.add_argument('--bet', type=int, default=10, help="jumlah taruhan per game")
+    parser.add_argument('--stand-on', type=int, default=17, help="blackjack: pengguna berhenti HIT pada total ini")
+    parser.add_argument('--emoji-bet-ratio', type=float, default=0.25, help="bagian taruhan roulette yang dipasang lewat reaksi")
+    parser.add_argument('--roulette-bet', dest='roulette_bets', type=parse_roulette_bet, action='append',
+                        help="taruhan !bet yang dipakai, mis. 'merah' atau 'angka 7' (boleh diulang)")
+    parser.add_argument('--starting-cash', type=int, default=1_000_000, help="saldo awal setiap pengguna sintetis")
+    parser.add_argument('--seed', type=int, default=None, help="seed acak agar skenario bisa diulang")
+    parser.add_argument('--verbose', action='store_true', help="tampilkan print dari bot (bisa memperlambat hasil)")
+    args = parser.parse_args()
+    args.roulette_bets = args.roulette_bets or [('merah', ''), ('genap', ''), ('1st12', ''), ('angka', '17')]
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    with contextlib.ExitStack() as stack:
+        if not args.verbose:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+        test, stats, elapsed = asyncio.run(run(args))
+    report(test, stats, elapsed)
+
+if __name__ == '__main__':
+    main()
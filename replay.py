@@ -0,0 +1,270 @@
+# Memutar ulang rekaman lalu lintas (TRAFFIC_RECORD_PATH di bot.py) ke handler bot lewat client Discord
+# pengganti dari loadtest.py, dengan kecepatan 1x, 10x, ... atau secepat mungkin ('max'). Melaporkan
+# latensi per perintah, keterlambatan terhadap jadwal rekaman, kedalaman antrean handler dan beban
+# database dari waktu ke waktu, supaya kebutuhan hardware bisa diukur dari lalu lintas asli.
+#
+# Seperti loadtest.py, pakai database uji lokal (misalnya DB_BACKEND=sqlite), bukan database produksi.
+#
+# Contoh:
+#   TRAFFIC_RECORD_PATH=traffic.jsonl python bot.py      (merekam)
+#   python replay.py traffic.jsonl --speed 10
+#   python replay.py traffic.jsonl --speed max
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import time
+from collections import defaultdict
+
+from loadtest import (
+    BACKGROUND, FakeChannel, FakeGuild, FakeMember, FakeMessage, FakeReaction, FakeStats,
+    bot, click, count_statements, current_label, install_fake_client, percentile
+)
+
+KIND_LABELS = {'blackjack': 'blackjack', 'flipcoin': 'flip coin', 'roulette': 'roulette'}
+
+class Replayer:
+    def __init__(self, args, stats: FakeStats, events: list[dict]):
+        self.args = args
+        self.stats = stats
+        self.events = events
+        self.speed = None if args.speed == 'max' else float(args.speed)
+        self.guild = FakeGuild(1)
+        self.admin_role = next(iter(bot.permissions.admin_role_ids), 1)
+        self.channels = {} # {id_anonim: FakeChannel}, juga dipakai client.get_channel
+        self.members = {} # {id_anonim: FakeMember}
+        self.latencies = defaultdict(list) # {label: [detik]}
+        self.lag = [] # detik terlambat dari jadwal rekaman saat handler mulai
+        self.skipped = defaultdict(int) # aksi yang targetnya tidak ada lagi (hasil acak berbeda dari rekaman)
+        self.errors = 0
+        self.in_flight = 0
+        self.db_in_flight = 0
+        self.db_calls = 0
+        self.timeline = defaultdict(lambda: [0, 0, 0, 0]) # {detik_ke: [kejadian, antrean_maks, db_maks, db_total]}
+        self._last_task = {} # {id_anonim_pengguna: task terakhir}, kejadian satu pengguna dijalankan berurutan
+        self._channel_tasks = defaultdict(set) # {id_anonim_channel: task yang sedang berjalan}
+        self._started = 0.0
+
+    def channel(self, channel_id: int) -> FakeChannel:
+        if channel_id not in self.channels:
+            self.channels[channel_id] = FakeChannel(channel_id, self.guild, self.stats)
+        return self.channels[channel_id]
+
+    def member(self, user_id: int, admin: bool = False) -> FakeMember:
+        member = self.members.get(user_id)
+        if member is None:
+            member = self.members[user_id] = FakeMember(user_id, self.guild)
+        if admin:
+            member.add_role(self.admin_role)
+        return member
+
+    def _bucket(self) -> list:
+        return self.timeline[int(time.perf_counter() - self._started)]
+
+    def track_db(self):
+        real_run = bot.db_pool.run
+        async def tracked_run(fn, *args):
+            self.db_in_flight += 1
+            bucket = self._bucket()
+            bucket[2] = max(bucket[2], self.db_in_flight)
+            counter = [0]
+            try:
+                return await real_run(count_statements(fn, counter), *args)
+            finally:
+                self.db_in_flight -= 1
+                self.db_calls += counter[0]
+                bucket[3] += counter[0]
+        bot.db_pool.run = tracked_run
+
+    async def seed(self):
+        """Memberi saldo awal ke semua pengguna di rekaman (tidak ikut diukur)."""
+        user_ids = set()
+        for event in self.events:
+            user_ids.add(event["u"])
+            user_ids.update(event.get("mentions", ()))
+        for user_id in user_ids:
+            await bot.credit_cash(user_id, self.args.starting_cash, 'loadtest')
+        await bot.balance_cache.flush()
+
+    # --- Menjalankan satu kejadian ---
+
+    async def dispatch(self, event: dict):
+        if event["e"] == "message":
+            channel = self.channel(event["c"])
+            message = FakeMessage(channel, event["text"], self.member(event["u"], event.get("admin", False)))
+            message.mentions = [self.member(user_id) for user_id in event.get("mentions", ())]
+            label = event["text"].split(maxsplit=1)[0].lower() if event["text"] else "(kosong)"
+            if label in ('!roulette', '!rou'):
+                label = " ".join(event["text"].lower().split()[:2])
+                if label.endswith('spin'): # Semua taruhan yang sudah dikirim di channel ini diproses dulu
+                    pending = self._channel_tasks[event["c"]] - {asyncio.current_task()}
+                    if pending:
+                        await asyncio.wait(pending)
+            return label, bot.on_message(message)
+        return self.action(event)
+
+    def action(self, event: dict):
+        """Reaksi dan klik tombol dimainkan dengan cara yang sedang dipakai bot (GAME_INTERACTION_MODE)."""
+        kind = event["kind"]
+        name = KIND_LABELS.get(kind, kind)
+        channel = self.channel(event["c"])
+        user = self.member(event["u"])
+        if kind == 'roulette':
+            message_id = bot.current_roulette_rounds.get(event["c"], {}).get("message_id")
+            entry = bot.interactive_messages.get(message_id) if message_id else None
+        else:
+            entry = bot.interactive_messages.find(kind, event["owner"])
+        if entry is None:
+            return f"{'reaksi' if event['e'] == 'reaction' else 'tombol'} {name}", None
+        if entry.view is not None:
+            buttons = [item for item in entry.view.children if str(item.emoji) == event["emoji"]]
+            if not buttons:
+                return f"tombol {name}", None
+            return f"tombol {name}", click(entry.view, buttons[0], user)
+        message = channel.messages.get(entry.message_id)
+        if message is None:
+            return f"reaksi {name}", None
+        return f"reaksi {name}", bot.on_reaction_add(FakeReaction(message, event["emoji"]), user)
+
+    async def run_event(self, event: dict, scheduled: float, previous: asyncio.Task | None):
+        if previous is not None:
+            await asyncio.wait([previous]) # Pengguna asli menunggu balasan sebelum aksi berikutnya
+        self.in_flight += 1
+        bucket = self._bucket()
+        bucket[0] += 1
+        bucket[1] = max(bucket[1], self.in_flight)
+        try:
+            label, coro = await self.dispatch(event)
+            if coro is None:
+                self.skipped[label] += 1
+                return
+            token = current_label.set(label)
+            started = time.perf_counter()
+            self.lag.append(max(0.0, started - scheduled))
+            try:
+                await coro
+            except Exception as e:
+                self.errors += 1
+                print(f"ERROR REPLAY ({label}): {e}")
+            finally:
+                self.latencies[label].append(time.perf_counter() - started)
+                current_label.reset(token)
+        finally:
+            self.in_flight -= 1
+
+    async def run(self):
+        self._started = time.perf_counter()
+        tasks = []
+        for event in self.events:
+            scheduled = self._started + (event["t"] / self.speed if self.speed else 0.0)
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif not self.speed:
+                await asyncio.sleep(0) # Mode max: beri kesempatan handler berjalan di sela pengiriman
+            task = asyncio.create_task(self.run_event(event, scheduled, self._last_task.get(event["u"])))
+            self._last_task[event["u"]] = task
+            channel_tasks = self._channel_tasks[event["c"]]
+            channel_tasks.add(task)
+            task.add_done_callback(channel_tasks.discard)
+            tasks.append(task)
+        await asyncio.gather(*tasks)
+        await bot.balance_cache.flush()
+        return time.perf_counter() - self._started
+
+# --- Laporan ---
+
+def report(replayer: Replayer, stats: FakeStats, elapsed: float):
+    events = len(replayer.events)
+    trace_length = replayer.events[-1]["t"] if replayer.events else 0.0
+    print(f"{events:,} kejadian ({trace_length:.1f} detik rekaman) diputar dalam {elapsed:.2f} detik "
+          f"({events / elapsed:,.0f} kejadian/detik, kecepatan {replayer.args.speed})")
+    if replayer.lag:
+        lag = sorted(replayer.lag)
+        print(f"Keterlambatan dari jadwal: p50 {percentile(lag, 0.5) * 1000:.1f} ms, p99 {percentile(lag, 0.99) * 1000:.1f} ms, "
+              f"maks {lag[-1] * 1000:.1f} ms")
+    print(f"Statement SQL: {replayer.db_calls:,} total, handler gagal: {replayer.errors:,}")
+    print()
+    print(f"{'perintah':<20}{'jumlah':>9}{'p50 ms':>10}{'p99 ms':>10}{'maks ms':>10}{'DB/perintah':>13}{'API/perintah':>14}{'dilewati':>10}")
+    for label in sorted(set(replayer.latencies) | set(replayer.skipped)):
+        values = sorted(replayer.latencies[label])
+        count = len(values)
+        if count:
+            print(f"{label:<20}{count:>9,}{percentile(values, 0.5) * 1000:>10.2f}{percentile(values, 0.99) * 1000:>10.2f}"
+                  f"{values[-1] * 1000:>10.2f}{stats.db_calls[label] / count:>13.2f}{stats.api_calls[label] / count:>14.2f}"
+                  f"{replayer.skipped[label]:>10,}")
+        else:
+            print(f"{label:<20}{0:>9}{'':>10}{'':>10}{'':>10}{'':>13}{'':>14}{replayer.skipped[label]:>10,}")
+    print(f"{BACKGROUND:<20}{'':>9}{'':>10}{'':>10}{'':>10}{stats.db_calls[BACKGROUND]:>13,}{stats.api_calls[BACKGROUND]:>14,}  (total)")
+    print()
+    print(f"{'detik':>6}{'kejadian':>10}{'antrean maks':>14}{'DB berjalan maks':>18}{'query DB':>10}")
+    for second in sorted(replayer.timeline):
+        count, depth, db_depth, db_calls = replayer.timeline[second]
+        print(f"{second:>6}{count:>10,}{depth:>14,}{db_depth:>18,}{db_calls:>10,}")
+
+def load_trace(path: str, limit: int | None) -> list[dict]:
+    events = []
+    with open(path, encoding='utf-8') as trace:
+        for line in trace:
+            if line.strip():
+                events.append(json.loads(line))
+    # File rekaman bisa berisi beberapa sesi bot (mode append); setiap sesi mulai lagi dari t=0
+    offset = 0.0
+    previous = 0.0
+    for event in events:
+        if event["t"] < previous:
+            offset += previous
+        previous = event["t"]
+        event["t"] += offset
+    return events[:limit] if limit else events
+
+async def run(args, events: list[dict]):
+    stats = FakeStats(args.api_latency)
+    await bot.setup_hook()
+    replayer = Replayer(args, stats, events)
+    install_fake_client(replayer.channels, stats)
+    replayer.track_db()
+    bot.rate_limiter.enabled = False # Rekaman hanya berisi perintah yang sudah lolos pembatas laju
+    if args.mode:
+        bot.GAME_INTERACTION_MODE = args.mode
+    try:
+        if args.starting_cash:
+            await replayer.seed()
+        stats.db_calls.clear()
+        stats.api_calls.clear()
+        replayer.db_calls = 0
+        replayer.timeline.clear()
+        elapsed = await replayer.run()
+    finally:
+        bot.permissions.close()
+        await bot.interactive_messages.close()
+        await bot.balance_cache.close()
+        await bot.pending_credits.close()
+        bot.db_pool.close()
+    return replayer, stats, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Memutar ulang rekaman lalu lintas HANIIF BOT dengan client Discord pengganti.")
+    parser.add_argument('trace', help="file JSONL hasil TRAFFIC_RECORD_PATH")
+    parser.add_argument('--speed', default='1', help="kelipatan kecepatan (1, 10, ...) atau 'max'")
+    parser.add_argument('--limit', type=int, default=None, help="hanya putar N kejadian pertama")
+    parser.add_argument('--api-latency', type=float, default=0.0, help="detik tunda untuk setiap panggilan API Discord tiruan")
+    parser.add_argument('--mode', choices=['buttons', 'reactions'], default=None, help="cara memainkan Blackjack dan Flip Coin (default: dari .env)")
+    parser.add_argument('--starting-cash', type=int, default=1_000_000, help="saldo awal setiap pengguna di rekaman (0 = tidak diisi)")
+    parser.add_argument('--verbose', action='store_true', help="tampilkan print dari bot (bisa memperlambat hasil)")
+    args = parser.parse_args()
+    if args.speed != 'max' and float(args.speed) <= 0:
+        parser.error("--speed harus lebih dari 0 atau 'max'")
+
+    events = load_trace(args.trace, args.limit)
+    if not events:
+        parser.error("rekaman kosong")
+    with contextlib.ExitStack() as stack:
+        if not args.verbose:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+        replayer, stats, elapsed = asyncio.run(run(args, events))
+    report(replayer, stats, elapsed)
+
+if __name__ == '__main__':
+    main()
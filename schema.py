@@ -0,0 +1,282 @@
+# Manajer skema database HANIIF BOT. Semua tabel dan indeks dibuat lewat migrasi berversi yang dicatat di
+# tabel `schema_version`, sehingga database baru langsung punya indeks yang dibutuhkan query bot dan database
+# lama (misalnya hasil impor haniifbot_db.sql) cukup menjalankan migrasi yang belum pernah diterapkan.
+# bot.py menjalankan migrate() saat start (kecuali DB_AUTO_MIGRATE=0); file ini juga bisa dijalankan langsung.
+#
+# Contoh:
+#   python schema.py            # terapkan migrasi yang belum dijalankan lalu periksa skema
+#   python schema.py --check    # hanya periksa versi, tabel dan indeks (tanpa mengubah apa pun)
+import argparse
+import os
+import sys
+from datetime import datetime
+
+MYSQL_TABLE_OPTIONS = "ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci"
+
+class Table:
+    """CREATE TABLE IF NOT EXISTS dengan DDL terpisah untuk MySQL/MariaDB dan SQLite."""
+
+    def __init__(self, name: str, mysql: str, sqlite: str):
+        self.name = name
+        self.ddl = {
+            'mysql': f"CREATE TABLE IF NOT EXISTS `{name}` (\n{mysql}\n) {MYSQL_TABLE_OPTIONS}",
+            'sqlite': f"CREATE TABLE IF NOT EXISTS {name} (\n{sqlite}\n)"
+        }
+
+    def apply(self, cursor, dialect: str):
+        cursor.execute(self.ddl[dialect])
+
+    def missing(self, cursor, dialect: str) -> list[str]:
+        return [] if _table_exists(cursor, dialect, self.name) else [f"tabel {self.name} tidak ada"]
+
+class Index:
+    """Indeks pada kolom-kolom tabel. Dilewati jika sudah ada indeks lain yang diawali kolom yang sama.
+
+    Nama indeks di SQLite berlaku untuk seluruh database, jadi di sana diberi awalan nama tabel.
+    """
+
+    def __init__(self, table: str, name: str, columns: tuple[str, ...], unique: bool = False):
+        self.table = table
+        self.name = name
+        self.columns = columns
+        self.unique = unique
+
+    def _covered(self, cursor, dialect: str) -> bool:
+        return any(existing[:len(self.columns)] == self.columns for existing in _index_columns(cursor, dialect, self.table))
+
+    def apply(self, cursor, dialect: str):
+        if self._covered(cursor, dialect):
+            return
+        name = self.name if dialect == 'mysql' else f"{self.table}_{self.name}"
+        unique = "UNIQUE " if self.unique else ""
+        cursor.execute(f"CREATE {unique}INDEX {name} ON {self.table} ({', '.join(self.columns)})")
+
+    def missing(self, cursor, dialect: str) -> list[str]:
+        if self._covered(cursor, dialect):
+            return []
+        return [f"indeks {self.table} ({', '.join(self.columns)}) tidak ada"]
+
+def _table_exists(cursor, dialect: str, table: str) -> bool:
+    if dialect == 'mysql':
+        cursor.execute("SELECT COUNT(*) FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (table,))
+    else:
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = %s", (table,))
+    return cursor.fetchone()[0] > 0
+
+def _index_columns(cursor, dialect: str, table: str) -> list[tuple[str, ...]]:
+    """Kolom setiap indeks sebuah tabel (termasuk primary key dan unique key), sesuai urutan di indeks."""
+    if dialect == 'mysql':
+        cursor.execute(
+            "SELECT INDEX_NAME, COLUMN_NAME FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s ORDER BY INDEX_NAME, SEQ_IN_INDEX",
+            (table,)
+        )
+        indexes = {}
+        for index_name, column in cursor.fetchall():
+            indexes.setdefault(index_name, []).append(column)
+        return [tuple(columns) for columns in indexes.values()]
+    cursor.execute(f"PRAGMA index_list({table})")
+    names = [row[1] for row in cursor.fetchall()]
+    result = []
+    for name in names:
+        cursor.execute(f"PRAGMA index_info({name})")
+        result.append(tuple(row[2] for row in sorted(cursor.fetchall())))
+    return result
+
+# --- Daftar Migrasi ---
+# (versi, keterangan, langkah). Versi yang sudah dicatat di schema_version tidak dijalankan lagi. Setiap langkah
+# aman diulang (IF NOT EXISTS / cek indeks), jadi database yang tabelnya dibuat manual tetap bisa dimigrasi.
+# Indeks mengikuti query bot: roulette_bets per round_id (penyimpanan dan penghapusan taruhan saat spin),
+# users_cash per cash (urutan papan peringkat), cash_ledger per pengguna dan waktu, game_state per channel,
+# pemilik dan waktu kedaluwarsa.
+
+MIGRATIONS = [
+    (1, "tabel awal", [
+        Table('users_cash', """
+  `user_id` bigint(20) NOT NULL,
+  `cash` int(11) NOT NULL DEFAULT 0,
+  `last_daily_claim` datetime DEFAULT NULL,
+  PRIMARY KEY (`user_id`)""", """
+    user_id INTEGER PRIMARY KEY,
+    cash INTEGER NOT NULL DEFAULT 0,
+    last_daily_claim DATETIME DEFAULT NULL"""),
+        Table('bot_admins', """
+  `user_id` bigint(20) NOT NULL,
+  PRIMARY KEY (`user_id`)""", """
+    user_id INTEGER PRIMARY KEY"""),
+        Table('bot_admin_roles', """
+  `role_id` bigint(20) NOT NULL,
+  PRIMARY KEY (`role_id`)""", """
+    role_id INTEGER PRIMARY KEY"""),
+        Table('roulette_bets', """
+  `bet_id` bigint(20) NOT NULL AUTO_INCREMENT,
+  `round_id` varchar(32) NOT NULL,
+  `user_id` bigint(20) NOT NULL,
+  `bet_type` varchar(16) NOT NULL,
+  `bet_choice` varchar(16) NOT NULL,
+  `amount` int(11) NOT NULL,
+  PRIMARY KEY (`bet_id`)""", """
+    bet_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    round_id TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    bet_type TEXT NOT NULL,
+    bet_choice TEXT NOT NULL,
+    amount INTEGER NOT NULL"""),
+        Table('events', """
+  `event_id` int(11) NOT NULL AUTO_INCREMENT,
+  `event_type` varchar(50) NOT NULL,
+  `description` varchar(255) NOT NULL,
+  `bet_cost` int(11) NOT NULL,
+  `status` varchar(20) NOT NULL DEFAULT 'open',
+  `winning_choice` varchar(20) DEFAULT NULL,
+  `message_id` bigint(20) DEFAULT NULL,
+  `channel_id` bigint(20) DEFAULT NULL,
+  `created_by` bigint(20) NOT NULL,
+  `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`event_id`)""", """
+    event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_type TEXT NOT NULL,
+    description TEXT NOT NULL,
+    bet_cost INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'open',
+    winning_choice TEXT DEFAULT NULL,
+    message_id INTEGER DEFAULT NULL,
+    channel_id INTEGER DEFAULT NULL,
+    created_by INTEGER NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP"""),
+        Table('event_participants', """
+  `participant_id` int(11) NOT NULL AUTO_INCREMENT,
+  `event_id` int(11) NOT NULL,
+  `user_id` bigint(20) NOT NULL,
+  `choice` varchar(20) NOT NULL,
+  `joined_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `paid_amount` int(11) NOT NULL,
+  PRIMARY KEY (`participant_id`),
+  UNIQUE KEY `event_id` (`event_id`,`user_id`),
+  CONSTRAINT `event_participants_ibfk_1` FOREIGN KEY (`event_id`) REFERENCES `events` (`event_id`) ON DELETE CASCADE""", """
+    participant_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id INTEGER NOT NULL REFERENCES events (event_id) ON DELETE CASCADE,
+    user_id INTEGER NOT NULL,
+    choice TEXT NOT NULL,
+    joined_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    paid_amount INTEGER NOT NULL,
+    UNIQUE (event_id, user_id)""")
+    ]),
+    (2, "indeks taruhan roulette dan papan peringkat", [
+        Index('roulette_bets', 'round_id', ('round_id',)),
+        Index('users_cash', 'cash', ('cash',))
+    ]),
+    (3, "buku besar saldo", [
+        Table('cash_ledger', """
+  `ledger_id` bigint(20) NOT NULL AUTO_INCREMENT,
+  `user_id` bigint(20) NOT NULL,
+  `amount` int(11) NOT NULL,
+  `balance_after` int(11) NOT NULL,
+  `reason` varchar(32) NOT NULL,
+  `ref` varchar(64) DEFAULT NULL,
+  `created_at` datetime NOT NULL,
+  PRIMARY KEY (`ledger_id`)""", """
+    ledger_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    amount INTEGER NOT NULL,
+    balance_after INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    ref TEXT DEFAULT NULL,
+    created_at DATETIME NOT NULL"""),
+        Index('cash_ledger', 'user_id', ('user_id', 'created_at'))
+    ]),
+    (4, "state game bersama", [
+        Table('game_state', """
+  `message_id` bigint(20) NOT NULL,
+  `kind` varchar(16) NOT NULL,
+  `owner_id` bigint(20) DEFAULT NULL,
+  `channel_id` bigint(20) NOT NULL,
+  `expires_at` double NOT NULL,
+  `state` mediumtext NOT NULL,
+  PRIMARY KEY (`message_id`)""", """
+    message_id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    owner_id INTEGER DEFAULT NULL,
+    channel_id INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    state TEXT NOT NULL"""),
+        Index('game_state', 'channel', ('kind', 'channel_id')),
+        Index('game_state', 'owner', ('kind', 'owner_id')),
+        Index('game_state', 'expires_at', ('expires_at',))
+    ])
+]
+
+SCHEMA_VERSION_TABLE = Table('schema_version', """
+  `version` int(11) NOT NULL,
+  `description` varchar(255) NOT NULL,
+  `applied_at` datetime NOT NULL,
+  PRIMARY KEY (`version`)""", """
+    version INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    applied_at DATETIME NOT NULL""")
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def current_version(cursor, dialect: str) -> int:
+    if not _table_exists(cursor, dialect, SCHEMA_VERSION_TABLE.name):
+        return 0
+    cursor.execute("SELECT MAX(version) FROM schema_version")
+    return cursor.fetchone()[0] or 0
+
+def migrate(conn, dialect: str) -> list[tuple[int, str]]:
+    """Menerapkan semua migrasi yang belum tercatat. Mengembalikan [(versi, keterangan)] yang baru diterapkan.
+
+    `conn` adalah koneksi mysql.connector atau SQLiteConnection dari bot.py (keduanya autocommit).
+    DDL MySQL tidak bisa di-rollback, jadi setiap langkah dibuat aman untuk diulang jika migrasi terputus.
+    """
+    applied = []
+    with conn.cursor() as cursor:
+        SCHEMA_VERSION_TABLE.apply(cursor, dialect)
+        version = current_version(cursor, dialect)
+        for migration_version, description, steps in MIGRATIONS:
+            if migration_version <= version:
+                continue
+            for step in steps:
+                step.apply(cursor, dialect)
+            # INSERT IGNORE: proses lain yang bermigrasi bersamaan mungkin sudah mencatat versi yang sama
+            cursor.execute(
+                "INSERT IGNORE INTO schema_version (version, description, applied_at) VALUES (%s, %s, %s)",
+                (migration_version, description, datetime.now())
+            )
+            applied.append((migration_version, description))
+    return applied
+
+def verify(conn, dialect: str) -> list[str]:
+    """Memeriksa versi skema serta keberadaan semua tabel dan indeks. Mengembalikan daftar masalah (kosong jika beres)."""
+    with conn.cursor() as cursor:
+        version = current_version(cursor, dialect)
+        problems = [] if version >= LATEST_VERSION else [f"versi skema {version}, terbaru {LATEST_VERSION}"]
+        for _, _, steps in MIGRATIONS:
+            for step in steps:
+                problems.extend(step.missing(cursor, dialect))
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Membuat, memigrasi dan memeriksa skema database HANIIF BOT.")
+    parser.add_argument('--check', action='store_true', help="hanya periksa versi skema, tabel dan indeks tanpa mengubah apa pun")
+    args = parser.parse_args()
+
+    os.environ.setdefault('DISCORD_TOKEN', 'schema') # bot.py hanya diimpor untuk pengaturan dan koneksi database
+    import bot
+    conn = bot.connect_sqlite() if bot.DB_BACKEND == 'sqlite' else bot.connect_mysql()
+    try:
+        if not args.check:
+            for version, description in migrate(conn, bot.DB_BACKEND):
+                print(f"Migrasi {version} diterapkan: {description}")
+        problems = verify(conn, bot.DB_BACKEND)
+    finally:
+        conn.close()
+
+    if problems:
+        for problem in problems:
+            print(f"MASALAH: {problem}")
+        sys.exit(1)
+    print(f"Skema database versi {LATEST_VERSION}: semua tabel dan indeks ada.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+# Simulasi Monte Carlo offline untuk mesin permainan di games.py. Mengukur keuntungan rumah (house edge),
+# varians dan kecepatan tanpa Discord maupun database, supaya perubahan mesin atau tabel pembayaran bisa
+# diukur sebelum dipakai bot.
+#
+# Contoh:
+#   python simulate.py blackjack --rounds 1000000 --decks 6
+#   python simulate.py flipcoin --rounds 50000000
+#   python simulate.py roulette --rounds 50000000 --bet all
+import argparse
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import games
+from games import (
+    BLACKJACK_RETURN_MULTIPLIERS, BlackjackGame, BlackjackShoe,
+    FLIPCOIN_RETURN_MULTIPLIER, FLIPCOIN_SIDES, FlipCoinGame,
+    ROULETTE_BET_OPTIONS, ROULETTE_NUMBERS, ROULETTE_PAYOUT_TABLE, roulette_bet_code
+)
+
+# Satu taruhan contoh per jenis untuk --bet all (semua pilihan dalam satu jenis punya peluang yang sama)
+ROULETTE_SAMPLE_BETS = [('number', '17'), ('color', 'merah'), ('parity', 'genap'), ('half', 'tinggi'), ('dozen', '1st12'), ('column', 'col1')]
+
+# --- Satu batch simulasi (dijalankan di proses pekerja) ---
+# Setiap batch mengembalikan (jumlah_putaran, total_hasil_bersih, total_kuadrat_hasil_bersih) dengan
+# hasil bersih diukur dalam satuan taruhan: +1 berarti pemain untung sebesar taruhannya.
+
+def simulate_blackjack_batch(rounds: int, seed: int, stand_on: int, decks: int, penetration: float) -> tuple[int, int, int]:
+    """Memainkan tangan Blackjack lewat BlackjackGame: pemain HIT sampai totalnya mencapai stand_on."""
+    random.seed(seed)
+    shoe = BlackjackShoe(decks, penetration) if decks > 0 else None
+    total = total_sq = 0
+    for _ in range(rounds):
+        game = BlackjackGame(0, 1, shoe)
+        result = game.start_game()
+        if result != "blackjack_player":
+            result = None
+            while game.player_hand.total < stand_on:
+                if game.hit() == "bust":
+                    result = "bust"
+                    break
+            if result is None:
+                result = game.stand()
+        net = BLACKJACK_RETURN_MULTIPLIERS[result] - 1
+        total += net
+        total_sq += net * net
+    return rounds, total, total_sq
+
+def simulate_flipcoin_batch(rounds: int, seed: int, vectorized: bool) -> tuple[int, int, int]:
+    if vectorized:
+        rng = games.np.random.default_rng(seed)
+        wins = rng.integers(0, len(FLIPCOIN_SIDES), rounds) == 0
+        net = games.np.where(wins, FLIPCOIN_RETURN_MULTIPLIER - 1, -1)
+        return rounds, int(net.sum()), int((net * net).sum())
+
+    random.seed(seed)
+    total = total_sq = 0
+    for _ in range(rounds):
+        _, paid = FlipCoinGame(0, 1).flip(random.choice(FLIPCOIN_SIDES))
+        net = paid - 1
+        total += net
+        total_sq += net * net
+    return rounds, total, total_sq
+
+def simulate_roulette_batch(rounds: int, seed: int, bet_code: int, vectorized: bool) -> tuple[int, int, int]:
+    """Memutar roda dan membayar satu taruhan per putaran memakai tabel pembayaran mesin roulette."""
+    if vectorized:
+        rng = games.np.random.default_rng(seed)
+        numbers = rng.integers(0, len(ROULETTE_NUMBERS), rounds)
+        net = games.ROULETTE_PAYOUT_ARRAY[bet_code][numbers] - 1
+        return rounds, int(net.sum()), int((net * net).sum())
+
+    random.seed(seed)
+    row = ROULETTE_PAYOUT_TABLE[bet_code]
+    total = total_sq = 0
+    for _ in range(rounds):
+        net = row[random.randrange(len(ROULETTE_NUMBERS))] - 1
+        total += net
+        total_sq += net * net
+    return rounds, total, total_sq
+
+# --- Menjalankan banyak batch dan melaporkan hasil ---
+
+def run_batches(executor: ProcessPoolExecutor | None, fn, rounds: int, batch_size: int, seed: int, *args) -> tuple[tuple[int, int, int], float]:
+    """Membagi `rounds` menjadi batch, menjalankannya (paralel jika ada executor) dan menjumlahkan hasilnya."""
+    batches = [min(batch_size, rounds - start) for start in range(0, rounds, batch_size)]
+    started = time.perf_counter()
+    if executor is None:
+        results = [fn(size, seed + i, *args) for i, size in enumerate(batches)]
+    else:
+        futures = [executor.submit(fn, size, seed + i, *args) for i, size in enumerate(batches)]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+    return tuple(sum(values) for values in zip(*results)), elapsed
+
+def report(title: str, stats: tuple[int, int, int], elapsed: float, theoretical_edge: float | None = None):
+    rounds, total, total_sq = stats
+    mean = total / rounds
+    variance = total_sq / rounds - mean * mean
+    margin = 1.96 * math.sqrt(variance / rounds) # Interval kepercayaan 95%
+    print(title)
+    print(f"  Keuntungan rumah : {-mean * 100:.3f}% ± {margin * 100:.3f}%")
+    if theoretical_edge is not None:
+        print(f"  Nilai teoretis   : {theoretical_edge * 100:.3f}%")
+    print(f"  Varians          : {variance:.4f} per putaran (deviasi standar {math.sqrt(variance):.4f} taruhan)")
+    print(f"  Kecepatan        : {rounds / elapsed:,.0f} putaran/detik ({rounds:,} putaran dalam {elapsed:.2f} detik)")
+
+def parse_roulette_bet(text: str) -> list[tuple[str, str]]:
+    if text == 'all':
+        return ROULETTE_SAMPLE_BETS
+    if text.isdigit():
+        return [('number', str(int(text)))]
+    for bet_type, bet_choice in ROULETTE_BET_OPTIONS:
+        if bet_choice == text:
+            return [(bet_type, bet_choice)]
+    raise argparse.ArgumentTypeError(f"taruhan roulette tidak dikenal: {text}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulasi Monte Carlo untuk mesin permainan HANIIF BOT.")
+    parser.add_argument('game', choices=['blackjack', 'flipcoin', 'roulette'])
+    parser.add_argument('--rounds', type=int, default=1_000_000, help="jumlah putaran/tangan yang disimulasikan")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="jumlah proses paralel (1 = tanpa process pool)")
+    parser.add_argument('--batch-size', type=int, default=None, help="putaran per batch (default: 100.000, atau 5.000.000 untuk jalur NumPy)")
+    parser.add_argument('--seed', type=int, default=None, help="seed acak agar hasil bisa diulang")
+    parser.add_argument('--no-numpy', action='store_true', help="paksa jalur Python biasa meskipun NumPy terpasang")
+    parser.add_argument('--stand-on', type=int, default=17, help="blackjack: pemain berhenti HIT pada total ini")
+    parser.add_argument('--decks', type=int, default=0, help="blackjack: jumlah dek di shoe (0 = dek baru per game, seperti bawaan bot)")
+    parser.add_argument('--penetration', type=float, default=0.75, help="blackjack: bagian shoe yang dibagikan sebelum dikocok ulang")
+    parser.add_argument('--bet', type=parse_roulette_bet, default='merah', help="roulette: pilihan taruhan (mis. merah, genap, 1st12, col2, 17) atau 'all'")
+    args = parser.parse_args()
+
+    vectorized = games.np is not None and not args.no_numpy and args.game != 'blackjack'
+    batch_size = args.batch_size or (5_000_000 if vectorized else 100_000)
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    mode = "NumPy" if vectorized else "Python"
+    executor = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    try:
+        if args.game == 'blackjack':
+            stats, elapsed = run_batches(executor, simulate_blackjack_batch, args.rounds, batch_size, seed,
+                                         args.stand_on, args.decks, args.penetration)
+            shoe = f"shoe {args.decks} dek" if args.decks > 0 else "dek baru per game"
+            report(f"Blackjack (berhenti di {args.stand_on}, {shoe}, {args.workers} proses, {mode})", stats, elapsed)
+        elif args.game == 'flipcoin':
+            stats, elapsed = run_batches(executor, simulate_flipcoin_batch, args.rounds, batch_size, seed, vectorized)
+            report(f"Flip Coin (bayar {FLIPCOIN_RETURN_MULTIPLIER}x, {args.workers} proses, {mode})", stats, elapsed,
+                   1 - FLIPCOIN_RETURN_MULTIPLIER / len(FLIPCOIN_SIDES))
+        else:
+            for bet_type, bet_choice in args.bet:
+                code = roulette_bet_code(bet_type, bet_choice)
+                stats, elapsed = run_batches(executor, simulate_roulette_batch, args.rounds, batch_size, seed, code, vectorized)
+                row = ROULETTE_PAYOUT_TABLE[code]
+                report(f"Roulette {bet_type}/{bet_choice} ({args.workers} proses, {mode})", stats, elapsed,
+                       1 - sum(row) / len(row))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+if __name__ == '__main__':
+    main()